@@ -0,0 +1,497 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+
+logger = logging.getLogger("book_api.admission")
+
+# Never rate limited or shed: health/info, metrics and the docs stay reachable under overload.
+# A 429/503 on the readiness probe would read as "not ready" and pull every instance at once.
+EXEMPT_PATHS: Tuple[str, ...] = (
+    "/", "/healthz/ready", "/metrics", "/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json",
+)
+
+# Rate limited but never queued: these requests mostly wait for new changes, not for the
+# database, and holding a concurrency slot for a whole long poll or stream would starve the rest
+LONG_LIVED_PATHS: Tuple[str, ...] = ("/books/changes", "/books/changes/stream")
+
+# Rule key used for routes without a rule of their own
+DEFAULT_RULE: str = "*"
+
+# Atomic token bucket for the Redis-protocol store. Every worker shares the
+# bucket; the caller's clock is passed in so stand-ins without TIME work too.
+TOKEN_BUCKET_SCRIPT: str = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+def parse_rules(spec: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Parse per-route rules of the form ``route=first:second,...``.
+
+    ``route`` is a path template as declared in main.py (``/books/search/``)
+    or ``*`` for every other route. Rate limits use ``rate:burst`` (tokens
+    per second, bucket size); route concurrency limits use
+    ``concurrent:queue``. A missing second value repeats the first.
+
+    Args:
+        spec (str): Rules, e.g. ``"*=50:100,/books/search/=5:10"``
+
+    Returns:
+        Dict[str, Tuple[float, float]]: Route -> (first, second)
+
+    Raises:
+        ValueError: If a rule is malformed or not positive
+    """
+    rules: Dict[str, Tuple[float, float]] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        route, _, values = part.rpartition("=")
+        first, _, second = values.partition(":")
+        try:
+            parsed: Tuple[float, float] = (float(first), float(second or first))
+        except ValueError:
+            raise ValueError(f"Invalid rule '{part}', expected route=number:number") from None
+        if not route or min(parsed) <= 0:
+            raise ValueError(f"Invalid rule '{part}', expected route=number:number")
+        rules[route.strip()] = parsed
+    return rules
+
+
+class RateLimitStore:
+    """
+    Base class of token-bucket stores.
+
+    Subclasses implement ``take``: refill the bucket for the elapsed time,
+    then remove one token if there is one.
+    """
+
+    name: str = "base"
+
+    async def take(self, key: str, rate: float, burst: float) -> Tuple[bool, float]:
+        """
+        Try to take one token from a bucket.
+
+        Args:
+            key (str): Bucket key (client and route)
+            rate (float): Tokens added per second
+            burst (float): Bucket size; a new bucket starts full
+
+        Returns:
+            Tuple[bool, float]: Whether a token was taken, tokens left
+        """
+        raise NotImplementedError
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    Per-process buckets with an LRU bound on the number of clients tracked.
+
+    Only touched from the event loop, so no lock is needed. With several
+    workers each one would enforce the limit separately, so serve.py
+    refuses this store then; use the redis store to share it.
+
+    Attributes:
+        maxsize (int): Maximum number of buckets kept
+    """
+
+    name: str = "memory"
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize: int = maxsize
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: float) -> Tuple[bool, float]:
+        now: float = time.monotonic()
+        tokens, updated = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        allowed: bool = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)  # an evicted client simply starts with a full bucket
+        return allowed, tokens
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Buckets in any server speaking the Redis protocol, shared by all workers.
+
+    Works with Redis itself or a local stand-in (Valkey, KeyDB, ...) that
+    supports EVAL. Requires the optional ``redis`` package.
+
+    Attributes:
+        prefix (str): Prefix added to every key
+    """
+
+    name: str = "redis"
+
+    def __init__(self, url: str, prefix: str = "book_api:ratelimit:") -> None:
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:
+            raise RuntimeError("BOOK_API_RATE_LIMIT_BACKEND=redis requires the 'redis' package") from exc
+        self.prefix: str = prefix
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: float) -> Tuple[bool, float]:
+        allowed, tokens = await self._script(keys=[self.prefix + key], args=[rate, burst, time.time()])
+        return bool(allowed), float(tokens)
+
+
+def create_rate_limit_store(backend: str, maxsize: int, url: str) -> RateLimitStore:
+    """
+    Build a token-bucket store from configuration values.
+
+    Args:
+        backend (str): "memory" or "redis"
+        maxsize (int): Bucket bound for the memory backend
+        url (str): Server URL for the redis backend
+
+    Returns:
+        RateLimitStore: Configured store
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if backend == "memory":
+        return MemoryRateLimitStore(maxsize=maxsize)
+    if backend == "redis":
+        return RedisRateLimitStore(url=url)
+    raise ValueError(f"Unknown rate limit backend '{backend}'")
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiting per client and route.
+
+    Every (client, route template) pair has its own bucket, so a client
+    flooding /books/search/ exhausts only its search bucket.
+
+    Attributes:
+        store (RateLimitStore): Bucket storage
+        rules (Dict[str, Tuple[float, float]]): Route -> (rate, burst), see parse_rules
+        allowed (int): Requests let through
+        limited (int): Requests answered with 429
+        store_errors (int): Store failures (the request is let through)
+    """
+
+    def __init__(self, store: RateLimitStore, rules: Dict[str, Tuple[float, float]]) -> None:
+        self.store: RateLimitStore = store
+        self.rules: Dict[str, Tuple[float, float]] = rules
+        self.allowed: int = 0
+        self.limited: int = 0
+        self.store_errors: int = 0
+
+    async def check(self, client: str, route: str) -> Optional[float]:
+        """
+        Take a token for one request.
+
+        Args:
+            client (str): Client identifier
+            route (str): Route template of the request
+
+        Returns:
+            Optional[float]: None if allowed, else seconds until a token is available
+        """
+        rule: Optional[Tuple[float, float]] = self.rules.get(route, self.rules.get(DEFAULT_RULE))
+        if rule is None:
+            return None
+        rate, burst = rule
+        try:
+            allowed, tokens = await self.store.take(f"{client}:{route}", rate, burst)
+        except Exception:  # a broken store must not take the API down with it
+            self.store_errors += 1
+            logger.warning("Rate limit store failed; letting the request through", exc_info=True)
+            return None
+        if allowed:
+            self.allowed += 1
+            return None
+        self.limited += 1
+        return (1 - tokens) / rate
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get rate limiting counters.
+
+        Returns:
+            Dict[str, Any]: Backend, allowed, limited and store error counts
+        """
+        return {
+            "backend": self.store.name,
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "store_errors": self.store_errors,
+        }
+
+
+class Overloaded(Exception):
+    """Raised by ConcurrencyLimiter.acquire when a request is shed."""
+
+
+class ConcurrencyLimiter:
+    """
+    Bound the requests in flight and shed the excess instead of queueing it.
+
+    At most ``max_concurrent`` requests run; up to ``max_queue`` more wait
+    in FIFO order for at most ``queue_timeout`` seconds. Anything beyond
+    that is rejected immediately, as is every request while the database
+    pool is saturated (it would only wait DB_POOL_TIMEOUT for a
+    connection). Admitted requests therefore never wait longer than
+    ``queue_timeout`` before being served, however large the overload.
+
+    Attributes:
+        max_concurrent (int): Requests allowed to run at once
+        max_queue (int): Requests allowed to wait
+        queue_timeout (float): Seconds a request may wait for a slot
+        pool_limit (float): Pool saturation at which requests are shed
+        active (int): Requests running
+        admitted (int): Requests let through
+        shed (Dict[str, int]): Rejections by reason
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        pool_saturation: Optional[Callable[[], float]] = None,
+        pool_limit: float = 1.0,
+    ) -> None:
+        self.max_concurrent: int = max_concurrent
+        self.max_queue: int = max_queue
+        self.queue_timeout: float = queue_timeout
+        self.pool_saturation: Optional[Callable[[], float]] = pool_saturation
+        self.pool_limit: float = pool_limit
+        self.active: int = 0
+        self.admitted: int = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "queue_timeout": 0, "pool": 0}
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        """
+        Wait for a slot.
+
+        Raises:
+            Overloaded: If the request is shed; the message names the reason
+        """
+        if self.pool_saturation is not None and self.pool_saturation() >= self.pool_limit:
+            self._reject("pool")
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._reject("queue_full")
+        waiter: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except BaseException as exc:  # timeout, or the client went away
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # the slot arrived just as we gave up; pass it on
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                self._reject("queue_timeout")
+            raise
+        self.admitted += 1  # release() handed its slot over, active is unchanged
+
+    def release(self) -> None:
+        """Give the slot to the oldest waiter still waiting, or free it."""
+        while self._waiters:
+            waiter: asyncio.Future = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get admission counters.
+
+        Returns:
+            Dict[str, Any]: Limits, running and queued requests, admitted and shed counts
+        """
+        stats: Dict[str, Any] = {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+        }
+        stats.update({f"shed_{reason}": count for reason, count in self.shed.items()})
+        return stats
+
+    def _reject(self, reason: str) -> None:
+        """
+        Count a rejection and raise.
+
+        Args:
+            reason (str): Key of ``shed``
+
+        Raises:
+            Overloaded: Always
+        """
+        self.shed[reason] += 1
+        raise Overloaded(reason)
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying the rate limiter and the concurrency limiters.
+
+    Requests over their client's rate get 429, requests shed for overload
+    get 503; both carry Retry-After. A route with its own concurrency
+    limiter (e.g. /books/search/) is admitted by that one first, so a flood
+    of expensive requests queues and sheds there while the global limiter
+    keeps room for everything else. The route template is resolved here,
+    before routing, so limits follow ``/books/{book_id}`` rather than every
+    distinct URL. ``long_lived`` routes (long polls, event streams) are
+    rate limited but skip the concurrency limiters.
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency: Optional[ConcurrencyLimiter] = None,
+        route_concurrency: Optional[Dict[str, ConcurrencyLimiter]] = None,
+        trust_forwarded: bool = False,
+        exempt: Sequence[str] = EXEMPT_PATHS,
+        long_lived: Sequence[str] = LONG_LIVED_PATHS,
+    ) -> None:
+        self.app = app
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
+        self.concurrency: Optional[ConcurrencyLimiter] = concurrency
+        self.route_concurrency: Dict[str, ConcurrencyLimiter] = route_concurrency or {}
+        self.trust_forwarded: bool = trust_forwarded
+        self.exempt: frozenset = frozenset(exempt)
+        self.long_lived: frozenset = frozenset(long_lived)
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route = _match_route(scope)
+        route_path: str = getattr(route, "path", "<unmatched>")
+        if route_path in self.exempt:
+            await self.app(scope, receive, send)
+            return
+
+        if self.rate_limiter is not None:
+            retry_after: Optional[float] = await self.rate_limiter.check(self._client(scope), route_path)
+            if retry_after is not None:
+                await _reject(scope, route, send, 429, "Rate limit exceeded", retry_after)
+                return
+
+        if route_path in self.long_lived:
+            await self.app(scope, receive, send)
+            return
+
+        limiters: List[ConcurrencyLimiter] = [
+            limiter for limiter in (self.route_concurrency.get(route_path), self.concurrency) if limiter is not None
+        ]
+        acquired: List[ConcurrencyLimiter] = []
+        try:
+            for limiter in limiters:
+                try:
+                    await limiter.acquire()
+                except Overloaded as exc:
+                    await _reject(scope, route, send, 503, f"Server overloaded ({exc})", limiter.queue_timeout)
+                    return
+                acquired.append(limiter)
+            await self.app(scope, receive, send)
+        finally:
+            for limiter in reversed(acquired):
+                limiter.release()
+
+    def _client(self, scope: dict) -> str:
+        """
+        Identify the client of a request.
+
+        Args:
+            scope (dict): ASGI scope
+
+        Returns:
+            str: First X-Forwarded-For address when trusted, else the peer address
+        """
+        if self.trust_forwarded:
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+
+def _match_route(scope: dict) -> Optional[Any]:
+    """
+    Find the route a request will be dispatched to.
+
+    Args:
+        scope (dict): ASGI scope (``scope["app"]`` is set by Starlette)
+
+    Returns:
+        Optional[Any]: Matching route, a path-only match (wrong method), or None
+    """
+    partial = None
+    for route in getattr(getattr(scope.get("app"), "router", None), "routes", ()):
+        match, _ = route.matches(scope)
+        if match is Match.FULL:
+            return route
+        if match is Match.PARTIAL and partial is None:
+            partial = route
+    return partial
+
+
+async def _reject(
+    scope: dict, route: Optional[Any], send: Callable, status_code: int, detail: str, retry_after: float
+) -> None:
+    """
+    Answer a request without running it.
+
+    Args:
+        scope (dict): ASGI scope; the route is recorded so metrics label the rejection
+        route (Optional[Any]): Matched route, if any
+        send (Callable): ASGI send
+        status_code (int): 429 or 503
+        detail (str): Error message, in FastAPI's ``{"detail": ...}`` shape
+        retry_after (float): Seconds the client should wait
+    """
+    if route is not None:
+        scope["route"] = route
+    body: bytes = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,235 @@
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, List, Optional, Sequence, Union
+
+from cache import STATS_NAMESPACE, book_cache, book_namespace, stats_cache, stats_key, versioned_key
+from changes import change_notifier, change_sequencer
+from coalesce import read_flights
+from id_filter import book_id_filter
+from models import Book
+from schemas import BookBulkUpdate, BookCreate, BookResponse, BookUpdate
+import crud
+
+if TYPE_CHECKING:  # only loaded in async mode, see database
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Either session kind can be passed; see database.get_session
+AnySession = Union[Session, "AsyncSession"]
+
+
+async def run(db: AnySession, func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a synchronous CRUD function without blocking the event loop.
+    
+    With an AsyncSession the function runs through ``run_sync`` on the
+    aiosqlite connection; with a plain Session it runs in the threadpool.
+    
+    Args:
+        db (AnySession): Database session
+        func (Callable): Function from ``crud`` taking a Session first
+        
+    Returns:
+        Any: Whatever ``func`` returns
+    """
+    if isinstance(db, Session):
+        return await run_in_threadpool(func, db, *args, **kwargs)
+    return await db.run_sync(func, *args, **kwargs)
+
+
+async def after_write() -> None:
+    """After a committed write: drop cached stats and shared reads, request a change-log step, wake waiters."""
+    await stats_cache.bump_version(STATS_NAMESPACE)
+    read_flights.forget()
+    change_sequencer.request()
+    change_notifier.notify()
+
+
+async def create_book(db: AnySession, book: BookCreate) -> Book:
+    """Async version of crud.create_book; invalidates cached stats."""
+    db_book: Book = await run(db, crud.create_book, book)
+    book_id_filter.add(db_book.id)
+    await after_write()
+    return db_book
+
+
+async def create_books_bulk(db: AnySession, books: List[BookCreate]) -> int:
+    """Async version of crud.create_books_bulk; invalidates cached stats."""
+    inserted: int = await run(db, crud.create_books_bulk, books)
+    if inserted:
+        await after_write()
+    return inserted
+
+
+async def get_book(db: AnySession, book_id: int) -> Optional[Book]:
+    """Async version of crud.get_book."""
+    return await run(db, crud.get_book, book_id)
+
+
+async def get_all_books(
+    db: AnySession,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[List[Any]] = None,
+    as_rows: bool = False,
+    sort: str = "id",
+    order: str = "asc"
+) -> List[Book]:
+    """Async version of crud.get_all_books."""
+    return await run(
+        db, crud.get_all_books, skip=skip, limit=limit, after=after, as_rows=as_rows, sort=sort, order=order
+    )
+
+
+async def get_book_cached(db: AnySession, book_id: int, refresh: bool = False) -> Optional[dict]:
+    """
+    Get a book through the read-through cache.
+    
+    With read replicas, a miss can be filled from a replica that has not
+    caught up with the latest write yet; ``refresh`` skips the lookup and
+    stores what the session reads, so a client inside its read-your-writes
+    window (reading from the primary) never gets that older entry. IDs the
+    book_id_filter knows to be missing are answered before either.
+    
+    Entries are keyed by the book's namespace version, which its writes
+    bump, so a miss that read the row before a concurrent write stores it
+    under a key that is no longer read.
+    
+    Args:
+        db (AnySession): Database session, used only on a cache miss
+        book_id (int): ID of the book to retrieve
+        refresh (bool): Read from the database even if the book is cached
+        
+    Returns:
+        Optional[dict]: ``{"book": BookResponse dict, "version": int,
+        "updated_at": ISO string}``, or None if not found
+    """
+    if book_id_filter.known_missing(book_id):
+        return None
+    namespace: str = book_namespace(book_id)
+    if refresh:
+        key: str = versioned_key(namespace, await book_cache.version(namespace))
+    else:
+        key, cached = await book_cache.lookup(namespace)
+        if cached is not None:
+            return cached
+    
+    db_book: Optional[Book] = await get_book(db, book_id)
+    if db_book is None:
+        book_id_filter.missed(book_id)
+        return None
+    entry: dict = {
+        "book": BookResponse.model_validate(db_book).model_dump(),
+        "version": db_book.version,
+        "updated_at": db_book.updated_at.isoformat(),
+    }
+    await book_cache.set(key, entry)
+    return entry
+
+
+async def iter_book_batches(db: "AsyncSession", batch_size: int = 1000) -> AsyncIterator[Sequence[Any]]:
+    """
+    Async version of crud.iter_book_batches (AsyncSession only).
+    
+    Rows are pulled through the aiosqlite cursor batch by batch.
+    """
+    result = await db.stream(crud.export_books_query(batch_size))
+    async for batch in result.partitions():
+        yield batch
+
+
+async def update_book(db: AnySession, book_id: int, book_update: BookUpdate) -> Optional[Row]:
+    """Async version of crud.update_book; invalidates the cached book and stats."""
+    if book_id_filter.known_missing(book_id):
+        return None
+    row: Optional[Row] = await run(db, crud.update_book, book_id, book_update)
+    if row is None:
+        book_id_filter.missed(book_id)
+    else:
+        await book_cache.bump_version(book_namespace(book_id))
+        await after_write()
+    return row
+
+
+async def update_books_bulk(db: AnySession, updates: List[BookBulkUpdate]) -> List[Row]:
+    """Async version of crud.update_books_bulk; invalidates the cached books and stats."""
+    rows: List[Row] = await run(db, crud.update_books_bulk, updates)
+    for row in rows:
+        await book_cache.bump_version(book_namespace(row.id))
+    if rows:
+        await after_write()
+    return rows
+
+
+async def delete_book(db: AnySession, book_id: int) -> bool:
+    """Async version of crud.delete_book; invalidates the cached book and stats."""
+    if book_id_filter.known_missing(book_id):
+        return False
+    deleted: bool = await run(db, crud.delete_book, book_id)
+    if deleted:
+        book_id_filter.discard(book_id)
+        await book_cache.bump_version(book_namespace(book_id))
+        await after_write()
+    else:
+        book_id_filter.missed(book_id)
+    return deleted
+
+
+async def delete_books(db: AnySession, book_ids: List[int]) -> List[int]:
+    """Async version of crud.delete_books; invalidates the cached books and stats."""
+    deleted: List[int] = await run(db, crud.delete_books, book_ids)
+    for book_id in deleted:
+        book_id_filter.discard(book_id)
+        await book_cache.bump_version(book_namespace(book_id))
+    if deleted:
+        await after_write()
+    return deleted
+
+
+async def search_books(
+    db: AnySession,
+    title: Optional[str] = None,
+    author: Optional[str] = None,
+    year: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    mode: str = "like",
+    after: Optional[List[Any]] = None,
+    as_rows: bool = False,
+    sort: Optional[str] = None,
+    order: str = "asc"
+) -> List[Book]:
+    """Async version of crud.search_books."""
+    return await run(
+        db, crud.search_books,
+        title=title, author=author, year=year, skip=skip, limit=limit, mode=mode, after=after,
+        as_rows=as_rows, sort=sort, order=order
+    )
+
+
+async def book_stats_cached(db: AnySession, refresh: bool = False, **params: Any) -> dict:
+    """
+    Get catalog aggregates through the stats cache.
+    
+    Entries are keyed by the current STATS_NAMESPACE version, which every
+    write bumps, so no filter combination is served stale after a write
+    (up to replica lag when reads go to replicas; see get_book_cached).
+    The memory backend keeps that version per process, which is why
+    serve.py never runs it with more than one worker.
+    
+    Args:
+        db (AnySession): Database session, used only on a cache miss
+        refresh (bool): Compute the aggregates even if they are cached
+        **params (Any): Keyword arguments of crud.book_stats
+        
+    Returns:
+        dict: Fields of schemas.BookStatsResponse
+    """
+    key: str = stats_key(await stats_cache.version(STATS_NAMESPACE), params)
+    cached = None if refresh else await stats_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    stats: dict = await run(db, crud.book_stats, **params)
+    await stats_cache.set(key, stats)
+    return stats
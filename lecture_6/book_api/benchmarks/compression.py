@@ -0,0 +1,130 @@
+"""
+Compare response encodings: bytes on the wire and latency per encoding.
+
+Seeds a database, starts uvicorn and fetches large responses (a 1000-row
+list page and the full export) with each Accept-Encoding. Reports the
+compressed size, time to first byte and total time, plus the transfer time
+the body would need on a link of ``--link-mbps``, which is where
+compression pays off. Requires ``httpx``.
+
+Usage:
+    python benchmarks/compression.py --workdir /tmp/bench --seed-rows 20000 --link-mbps 20
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load import _free_port, _wait_ready, percentile  # noqa: E402
+from seed import prepare_app, seed  # noqa: E402
+
+APP_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGETS: Tuple[Tuple[str, str], ...] = (
+    ("list_1000", "/books/?limit=1000"),
+    ("export_ndjson", "/books/export?format=ndjson"),
+)
+ENCODINGS: Tuple[str, ...] = ("identity", "gzip", "br", "zstd")
+
+
+async def measure(client: httpx.AsyncClient, path: str, encoding: str, requests: int) -> Dict[str, float]:
+    """
+    Fetch ``path`` repeatedly with one Accept-Encoding.
+
+    Args:
+        client (httpx.AsyncClient): Client bound to the server
+        path (str): Request path
+        encoding (str): Accept-Encoding value
+        requests (int): Number of sequential requests
+
+    Returns:
+        Dict[str, float]: Wire bytes, served encoding and latency percentiles
+    """
+    ttfb: List[float] = []
+    total: List[float] = []
+    wire_bytes: int = 0
+    served: str = "identity"
+    for _ in range(requests):
+        start: float = time.perf_counter()
+        async with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+            ttfb.append(time.perf_counter() - start)
+            wire_bytes = 0
+            async for chunk in response.aiter_raw():
+                wire_bytes += len(chunk)
+            served = response.headers.get("content-encoding", "identity")
+        total.append(time.perf_counter() - start)
+    ttfb.sort()
+    total.sort()
+    return {
+        "served": served,
+        "bytes": wire_bytes,
+        "ttfb_ms": percentile(ttfb, 50) * 1000,
+        "p50_ms": percentile(total, 50) * 1000,
+        "p95_ms": percentile(total, 95) * 1000,
+    }
+
+
+async def run(requests: int, link_mbps: float) -> None:
+    """
+    Start the server, measure every target/encoding pair and print a table.
+
+    Args:
+        requests (int): Requests per target and encoding
+        link_mbps (float): Link speed used for the transfer-time estimate
+    """
+    port: int = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", APP_DIR,
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=os.getcwd(), env=os.environ.copy(),
+    )
+    base_url: str = f"http://127.0.0.1:{port}"
+    try:
+        await _wait_ready(base_url)
+        async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+            print(f"{'target':<15}{'encoding':<10}{'bytes':>11}{'ratio':>8}{'ttfb ms':>9}"
+                  f"{'p50 ms':>9}{'p95 ms':>9}{'link ms':>10}")
+            for name, path in TARGETS:
+                identity_bytes: int = 0
+                for encoding in ENCODINGS:
+                    row = await measure(client, path, encoding, requests)
+                    if encoding == "identity":
+                        identity_bytes = row["bytes"]
+                    elif row["served"] != encoding:
+                        print(f"{name:<15}{encoding:<10} not available (served {row['served']})")
+                        continue
+                    ratio: float = identity_bytes / row["bytes"] if row["bytes"] else 0.0
+                    link_ms: float = row["bytes"] * 8 / (link_mbps * 1000)
+                    print(f"{name:<15}{encoding:<10}{row['bytes']:>11,}{ratio:>8.1f}{row['ttfb_ms']:>9.2f}"
+                          f"{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p50_ms'] + link_ms:>10.1f}")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main() -> None:
+    """Parse arguments, optionally seed and run the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workdir", required=True, help="Directory for the benchmark books.db")
+    parser.add_argument("--seed-rows", type=int, default=0, help="Seed this many synthetic rows first")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per target and encoding")
+    parser.add_argument("--link-mbps", type=float, default=20.0,
+                        help="Link speed for the 'link ms' column (server p50 + transfer time)")
+    args = parser.parse_args()
+
+    workdir: str = os.path.abspath(args.workdir)
+    prepare_app(APP_DIR, workdir)
+    if args.seed_rows:
+        seed(os.path.join(workdir, "books.db"), args.seed_rows)
+    asyncio.run(run(args.requests, args.link_mbps))
+
+
+if __name__ == "__main__":
+    main()
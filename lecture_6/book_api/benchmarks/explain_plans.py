@@ -0,0 +1,116 @@
+"""
+Check that every sorted listing/search shape is served by an index.
+
+Runs the real crud queries against a seeded temporary SQLite database,
+captures the SQL they emit and prints its EXPLAIN QUERY PLAN. A shape
+whose plan contains "USE TEMP B-TREE FOR ORDER BY" (a full sort of the
+matching rows) is reported and makes the script exit with status 1, so it
+can run in CI; the compose ``checks`` profile runs it in the app image.
+
+Usage:
+    docker compose --profile checks run --rm explain-plans
+    python benchmarks/explain_plans.py --rows 20000 --verbose
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, insert, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import crud  # noqa: E402
+from benchmarks.seed import synthetic_rows  # noqa: E402
+from database import create_db_engine  # noqa: E402
+from migrations import init_db  # noqa: E402
+from models import Book  # noqa: E402
+
+ALL_SORTS: Tuple[str, ...] = tuple(crud.SORT_KEYS)
+
+# (label, crud function, keyword arguments, sort options) of every supported shape.
+# With an exact year filter the year index narrows the rows first; sorting that
+# small set by title or author in memory is cheaper than walking a sort index,
+# so those combinations are not index-ordered by design and are not checked.
+SHAPES: Tuple[Tuple[str, str, Dict[str, Any], Tuple[str, ...]], ...] = (
+    ("list", "get_all_books", {}, ALL_SORTS),
+    ("search year", "search_books", {"year": 1990}, ("id", "year")),
+    ("search author", "search_books", {"author": "Tolstoy"}, ALL_SORTS),
+    ("search title", "search_books", {"title": "War"}, ALL_SORTS),
+)
+
+
+def query_plans(rows: int) -> List[Tuple[str, str, List[str]]]:
+    """
+    Run every shape and collect its query plan.
+
+    Args:
+        rows (int): Rows seeded before planning (planner statistics depend on them)
+
+    Returns:
+        List[Tuple[str, str, List[str]]]: (shape, SQL, plan detail lines)
+    """
+    results: List[Tuple[str, str, List[str]]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'plans.db')}")
+        init_db(engine)
+        with engine.begin() as conn:
+            conn.execute(insert(Book.__table__), [
+                {"title": title, "author": author, "year": year} for title, author, year in synthetic_rows(rows)
+            ])
+            conn.execute(text("ANALYZE"))
+
+        captured: List[Tuple[str, Any]] = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def capture(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+            captured.append((statement, parameters))
+
+        session = sessionmaker(bind=engine)()
+        shapes = (
+            (label, func, filters, sort, order)
+            for label, func, filters, sorts in SHAPES
+            for sort, order in itertools.product(sorts, ("asc", "desc"))
+        )
+        for label, func, filters, sort, order in shapes:
+            first_page = getattr(crud, func)(session, limit=50, as_rows=True, sort=sort, order=order, **filters)
+            pages: List[Tuple[str, Optional[list]]] = [("first page", None)]
+            if first_page:
+                last = first_page[-1]
+                pages.append(("after cursor", [getattr(last, field) for field in crud.cursor_fields(sort)]))
+            for page, after in pages:
+                captured.clear()
+                getattr(crud, func)(session, limit=50, as_rows=True, sort=sort, order=order, after=after, **filters)
+                statement, parameters = captured[-1]
+                with engine.connect() as conn:
+                    plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                results.append((f"{label:<14} sort={sort:<6} {order:<4} {page}", statement, [r[-1] for r in plan]))
+        session.close()
+        engine.dispose()
+    return results
+
+
+def main() -> None:
+    """Parse arguments, print the plans and fail on temporary B-tree sorts."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Rows seeded before planning")
+    parser.add_argument("--verbose", action="store_true", help="Print the SQL of every shape")
+    args = parser.parse_args()
+
+    failures: int = 0
+    for shape, statement, plan in query_plans(args.rows):
+        sorted_in_temp: bool = any("TEMP B-TREE" in line for line in plan)
+        failures += sorted_in_temp
+        print(f"{'FAIL' if sorted_in_temp else 'ok  '} {shape}: {' | '.join(plan)}")
+        if args.verbose:
+            print("     " + " ".join(statement.split()))
+    print(f"\n{failures} shape(s) sorted in a temporary B-tree")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
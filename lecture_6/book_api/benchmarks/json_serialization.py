@@ -0,0 +1,97 @@
+"""
+Compare the default list serialization path with the BOOK_API_FAST_JSON path.
+
+Default: ORM objects -> BookResponse (from_attributes) -> JSON-mode dump -> json.dumps,
+which is what FastAPI does for ``response_model=List[BookResponse]``.
+Fast: column rows -> dicts -> orjson (or pydantic-core when orjson is missing).
+
+Usage:
+    python benchmarks/json_serialization.py --rows 1000 --repeat 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import crud  # noqa: E402
+from database import Base, create_db_engine  # noqa: E402
+from models import Book  # noqa: E402
+from schemas import BookResponse  # noqa: E402
+from serialization import orjson, render_books  # noqa: E402
+
+BOOK_LIST = TypeAdapter(List[BookResponse])
+
+
+def default_path(db, limit: int) -> bytes:
+    """Load ORM objects and serialize them the way FastAPI's response_model does."""
+    books = crud.get_all_books(db, limit=limit)
+    validated = BOOK_LIST.validate_python(books, from_attributes=True)
+    content = BOOK_LIST.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def fast_path(db, limit: int) -> bytes:
+    """Load column rows and render them directly."""
+    return render_books(crud.get_all_books(db, limit=limit, as_rows=True))
+
+
+def measure(func: Callable, session_factory: sessionmaker, limit: int, repeat: int) -> float:
+    """
+    Time ``repeat`` page renders with a fresh session each, like one request each.
+
+    Returns:
+        float: Mean milliseconds per page
+    """
+    start: float = time.perf_counter()
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            func(db, limit)
+        finally:
+            db.close()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    """Seed a temporary database and print per-page timings for both paths."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(insert(Book.__table__), [
+                {"title": f"Title {i}", "author": f"Author {i % 100}", "year": 1900 + i % 120 if i % 7 else None}
+                for i in range(args.rows)
+            ])
+        session_factory = sessionmaker(bind=engine)
+
+        with session_factory() as db:
+            assert json.loads(default_path(db, args.rows)) == json.loads(fast_path(db, args.rows))
+
+        default_ms: float = measure(default_path, session_factory, args.rows, args.repeat)
+        fast_ms: float = measure(fast_path, session_factory, args.rows, args.repeat)
+        engine.dispose()
+
+    encoder: str = "orjson" if orjson is not None else "pydantic-core"
+    print(f"{args.rows} rows per page, {args.repeat} pages")
+    print(f"default (ORM + BookResponse + json): {default_ms:8.2f} ms/page")
+    print(f"fast    (rows + {encoder}):{' ' * (19 - len(encoder))}{fast_ms:8.2f} ms/page")
+    print(f"speedup: {default_ms / fast_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Load-test every endpoint of a book API and report latency percentiles and RPS.
+
+Endpoints are discovered from the application's OpenAPI schema, so the same
+harness drives lecture_5/book_api and lecture_6/book_api. Requests go either
+through an in-process ASGI transport (no network, measures the app itself)
+or to a real uvicorn server started as a subprocess. Requires ``httpx``.
+
+Usage:
+    python benchmarks/load.py --workdir /tmp/bench --seed-rows 100000 --save base.json
+    python benchmarks/load.py --workdir /tmp/bench --baseline base.json --max-regression 0.2
+    python benchmarks/load.py --app-dir ../../lecture_5/book_api --workdir /tmp/l5 --transport uvicorn
+
+The exit status is 1 when a scenario regresses past the threshold.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncContextManager, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from seed import prepare_app, seed  # noqa: E402
+
+# Request factory: (rng, state) -> (method, url, json body or None)
+RequestFactory = Callable[[random.Random, "RunState"], Tuple[str, str, Optional[dict]]]
+
+
+@dataclass
+class RunState:
+    """
+    Shared state of a benchmark run.
+
+    Attributes:
+        max_id (int): Highest seeded book ID
+        created (List[int]): IDs created by the create scenario, consumed by delete
+    """
+
+    max_id: int
+    created: List[int] = field(default_factory=list)
+
+
+@dataclass
+class Scenario:
+    """
+    One endpoint exercised by the benchmark.
+
+    Attributes:
+        name (str): Scenario name used in reports and baselines
+        path (str): OpenAPI path the scenario needs
+        method (str): HTTP method
+        make_request (RequestFactory): Builds each request
+        required_params (Tuple[str, ...]): Query parameters the endpoint must support
+        concurrency (Optional[int]): Overrides --concurrency (heavy endpoints)
+    """
+
+    name: str
+    path: str
+    method: str
+    make_request: RequestFactory
+    required_params: Tuple[str, ...] = ()
+    concurrency: Optional[int] = None
+
+
+def _random_id(rng: random.Random, state: RunState) -> int:
+    return rng.randint(1, max(state.max_id, 1))
+
+
+def _new_book(rng: random.Random) -> dict:
+    return {"title": f"Bench Title {rng.randrange(10 ** 9)}", "author": "Bench Author", "year": 2000}
+
+
+def _delete_request(rng: random.Random, state: RunState) -> Tuple[str, str, Optional[dict]]:
+    book_id: int = state.created.pop() if state.created else _random_id(rng, state)
+    return "DELETE", f"/books/{book_id}", None
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("root", "/", "GET", lambda rng, st: ("GET", "/", None)),
+    Scenario("get_book", "/books/{book_id}", "GET",
+             lambda rng, st: ("GET", f"/books/{_random_id(rng, st)}", None)),
+    Scenario("list_first_page", "/books/", "GET", lambda rng, st: ("GET", "/books/?limit=100", None)),
+    Scenario("list_deep_offset", "/books/", "GET",
+             lambda rng, st: ("GET", f"/books/?skip={max(st.max_id - 100, 0)}&limit=100", None)),
+    Scenario("list_1000", "/books/", "GET", lambda rng, st: ("GET", "/books/?limit=1000", None)),
+    Scenario("search_author", "/books/search/", "GET",
+             lambda rng, st: ("GET", f"/books/search/?author=Author{rng.randrange(5000)}&limit=100", None)),
+    Scenario("search_title_year", "/books/search/", "GET",
+             lambda rng, st: ("GET", f"/books/search/?title=garden&year={rng.randint(1800, 2024)}", None)),
+    Scenario("search_fts", "/books/search/", "GET",
+             lambda rng, st: ("GET", "/books/search/?title=gard&mode=fts&limit=100", None),
+             required_params=("mode",)),
+    Scenario("changes_tail", "/books/changes", "GET",
+             lambda rng, st: ("GET", f"/books/changes?since={max(st.max_id - 100, 0)}&limit=100", None)),
+    Scenario("create_book", "/books/", "POST", lambda rng, st: ("POST", "/books/", _new_book(rng))),
+    Scenario("update_book", "/books/{book_id}", "PUT",
+             lambda rng, st: ("PUT", f"/books/{_random_id(rng, st)}", {"year": rng.randint(1800, 2024)})),
+    Scenario("delete_book", "/books/{book_id}", "DELETE", _delete_request),
+    Scenario("bulk_100", "/books/bulk", "POST",
+             lambda rng, st: ("POST", "/books/bulk", [_new_book(rng) for _ in range(100)]), concurrency=1),
+    Scenario("export_ndjson", "/books/export", "GET",
+             lambda rng, st: ("GET", "/books/export", None), concurrency=1),
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an ascending list.
+
+    Args:
+        sorted_values (List[float]): Values sorted ascending
+        pct (float): Percentile in [0, 100]
+
+    Returns:
+        float: Percentile value, 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank: int = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def available_scenarios(openapi: Dict[str, Any]) -> List[Scenario]:
+    """
+    Keep the scenarios whose path, method and query parameters the app exposes.
+
+    Args:
+        openapi (Dict[str, Any]): Application OpenAPI document
+
+    Returns:
+        List[Scenario]: Runnable scenarios
+    """
+    selected: List[Scenario] = []
+    for scenario in SCENARIOS:
+        operation = openapi.get("paths", {}).get(scenario.path, {}).get(scenario.method.lower())
+        if operation is None:
+            continue
+        params = {param["name"] for param in operation.get("parameters", [])}
+        if all(name in params for name in scenario.required_params):
+            selected.append(scenario)
+    return selected
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, state: RunState, concurrency: int, duration: float
+) -> Dict[str, float]:
+    """
+    Drive one scenario with concurrent clients for a fixed duration.
+
+    Args:
+        client (httpx.AsyncClient): Client bound to the app
+        scenario (Scenario): Scenario to run
+        state (RunState): Shared run state
+        concurrency (int): Concurrent clients
+        duration (float): Seconds to run
+
+    Returns:
+        Dict[str, float]: requests, errors, rps and p50/p95/p99 in milliseconds
+    """
+    latencies: List[float] = []
+    errors: List[int] = [0]
+    deadline: float = time.perf_counter() + duration
+
+    async def worker(worker_id: int) -> None:
+        rng = random.Random(worker_id)
+        while time.perf_counter() < deadline:
+            method, url, body = scenario.make_request(rng, state)
+            start: float = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            await response.aread()
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400 and response.status_code != 404:
+                errors[0] += 1
+            if scenario.name == "create_book" and response.status_code == 201:
+                state.created.append(response.json()["id"])
+
+    started: float = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed: float = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline: float = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while True:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Server at {base_url} did not become ready")
+            await asyncio.sleep(0.1)
+
+
+async def run_all(args: argparse.Namespace, max_id: int) -> Dict[str, Dict[str, float]]:
+    """
+    Run every available scenario against the selected transport.
+
+    Args:
+        args (argparse.Namespace): Parsed command line
+        max_id (int): Highest seeded book ID
+
+    Returns:
+        Dict[str, Dict[str, float]]: Results per scenario name
+    """
+    server: Optional[subprocess.Popen] = None
+    lifespan: Optional[AsyncContextManager] = None
+    if args.transport == "asgi":
+        import main
+        # ASGITransport does not send lifespan events; run startup/shutdown ourselves
+        lifespan = main.app.router.lifespan_context(main.app)
+        await lifespan.__aenter__()
+        transport = httpx.ASGITransport(app=main.app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None)
+    else:
+        port: int = _free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", os.path.abspath(args.app_dir),
+             "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+             "--workers", str(args.workers)],
+            cwd=os.getcwd(), env=os.environ.copy(),
+        )
+        base_url: str = f"http://127.0.0.1:{port}"
+        await _wait_ready(base_url)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        client = httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits)
+
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        openapi: Dict[str, Any] = (await client.get("/openapi.json")).json()
+        state = RunState(max_id=max_id)
+        for scenario in available_scenarios(openapi):
+            if args.scenarios and scenario.name not in args.scenarios:
+                continue
+            concurrency: int = scenario.concurrency or args.concurrency
+            results[scenario.name] = await run_scenario(client, scenario, state, concurrency, args.duration)
+            row = results[scenario.name]
+            print(f"{scenario.name:<20}{row['requests']:>9}{row['rps']:>10.0f}{row['p50_ms']:>10.2f}"
+                  f"{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}{row['errors']:>8}")
+    finally:
+        await client.aclose()
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+    return results
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float
+) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    A scenario regresses when its p95 latency grows, or its RPS drops, by
+    more than ``threshold`` (a fraction, 0.2 = 20%).
+
+    Args:
+        results (Dict[str, Dict[str, float]]): Current results
+        baseline (Dict[str, Dict[str, float]]): Saved results
+        threshold (float): Allowed relative change
+
+    Returns:
+        List[str]: Human-readable regression descriptions
+    """
+    regressions: List[str] = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if base["p95_ms"] > 0 and current["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {base['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms")
+        if base["rps"] > 0 and current["rps"] < base["rps"] * (1 - threshold):
+            regressions.append(f"{name}: rps {base['rps']:.0f} -> {current['rps']:.0f}")
+    return regressions
+
+
+def main() -> None:
+    """Parse arguments, optionally seed, run the scenarios and check the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app-dir", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument("--workdir", required=True, help="Directory for the benchmark books.db")
+    parser.add_argument("--seed-rows", type=int, default=0, help="Seed this many synthetic rows first")
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (uvicorn transport)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per scenario")
+    parser.add_argument("--scenarios", nargs="*", help="Only run these scenario names")
+    parser.add_argument("--save", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare with results saved by --save")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    save_path: Optional[str] = os.path.abspath(args.save) if args.save else None
+    baseline_path: Optional[str] = os.path.abspath(args.baseline) if args.baseline else None
+    workdir: str = os.path.abspath(args.workdir)
+    prepare_app(args.app_dir, workdir)
+    db_path: str = os.path.join(workdir, "books.db")
+    if args.seed_rows:
+        rate: float = seed(db_path, args.seed_rows)
+        print(f"Seeded {args.seed_rows} rows at {rate:,.0f} rows/s")
+
+    import sqlite3
+    with sqlite3.connect(db_path) as conn:
+        max_id: int = conn.execute("SELECT COALESCE(MAX(id), 0) FROM books").fetchone()[0]
+
+    print(f"{'scenario':<20}{'requests':>9}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    results = asyncio.run(run_all(args, max_id))
+
+    if save_path:
+        with open(save_path, "w") as fh:
+            json.dump(results, fh, indent=2)
+    if baseline_path:
+        with open(baseline_path) as fh:
+            regressions = find_regressions(results, json.load(fh), args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Show how rate limiting and admission control protect well-behaved clients.
+
+Starts uvicorn twice on a seeded database, once unprotected and once with
+BOOK_API_RATE_LIMIT and BOOK_API_ADMISSION on. In each run, ``--abusers``
+connections flood /books/search/ with unindexed substring queries while
+one polite client fetches single books at ``--polite-rps``. The abusers
+run in a separate process so their client-side work does not delay the
+polite client's event loop. Clients are told apart by X-Forwarded-For
+(the server is started with BOOK_API_RATE_LIMIT_TRUST_FORWARDED). Reports
+the polite client's latency percentiles and errors, plus the status codes
+the abusers got. Requires ``httpx``.
+
+Usage:
+    python benchmarks/overload.py --workdir /tmp/bench --seed-rows 200000 --abusers 64 --duration 10
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load import _free_port, _wait_ready, percentile  # noqa: E402
+from seed import prepare_app, seed  # noqa: E402
+
+APP_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROTECTION_ENV: Dict[str, str] = {"BOOK_API_RATE_LIMIT": "1", "BOOK_API_ADMISSION": "1"}
+
+
+async def abuser(client: httpx.AsyncClient, name: str, deadline: float, statuses: Counter) -> None:
+    """
+    Send unindexed searches back to back until ``deadline``.
+
+    Args:
+        client (httpx.AsyncClient): Client bound to the server
+        name (str): Client address sent as X-Forwarded-For
+        deadline (float): ``time.perf_counter()`` value to stop at
+        statuses (Counter): Response status counts, updated in place
+    """
+    rng = random.Random(name)
+    while time.perf_counter() < deadline:
+        term: str = "".join(rng.choice("aeiou") for _ in range(2))
+        try:
+            response = await client.get(f"/books/search/?title={term}&limit=1000",
+                                        headers={"X-Forwarded-For": name})
+            statuses[response.status_code] += 1
+        except httpx.TransportError:
+            statuses["transport_error"] += 1
+
+
+def abuse(base_url: str, abusers: int, addresses: int, duration: float, results: multiprocessing.Queue) -> None:
+    """
+    Run the abusers for ``duration`` seconds (entry point of the abuser process).
+
+    Args:
+        base_url (str): Server URL
+        abusers (int): Concurrent connections
+        addresses (int): Distinct X-Forwarded-For addresses they share
+        duration (float): Seconds to flood
+        results (multiprocessing.Queue): Receives the status counts
+    """
+    async def flood() -> Counter:
+        statuses: Counter = Counter()
+        limits = httpx.Limits(max_connections=abusers, max_keepalive_connections=abusers)
+        async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+            deadline: float = time.perf_counter() + duration
+            await asyncio.gather(*[abuser(client, f"abuser-{i % addresses}", deadline, statuses)
+                                   for i in range(abusers)])
+        return statuses
+
+    results.put(dict(asyncio.run(flood())))
+
+
+async def polite(client: httpx.AsyncClient, max_id: int, rps: float, deadline: float) -> Dict[str, float]:
+    """
+    Fetch random books at a fixed rate until ``deadline``.
+
+    Args:
+        client (httpx.AsyncClient): Client bound to the server
+        max_id (int): Highest seeded book ID
+        rps (float): Requests per second
+        deadline (float): ``time.perf_counter()`` value to stop at
+
+    Returns:
+        Dict[str, float]: Request count, errors and latency percentiles
+    """
+    rng = random.Random(0)
+    latencies: List[float] = []
+    errors: int = 0
+    while time.perf_counter() < deadline:
+        start: float = time.perf_counter()
+        try:
+            response = await client.get(f"/books/{rng.randint(1, max_id)}", headers={"X-Forwarded-For": "polite"})
+            if response.status_code != 200:
+                errors += 1
+        except httpx.TransportError:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(max(0.0, 1 / rps - (time.perf_counter() - start)))
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def run(args: argparse.Namespace, protected: bool) -> None:
+    """
+    Start a server, run the abusers and the polite client, print one row.
+
+    Args:
+        args (argparse.Namespace): Parsed command line
+        protected (bool): Enable rate limiting and admission control
+    """
+    env: Dict[str, str] = {**os.environ, "BOOK_API_RATE_LIMIT_TRUST_FORWARDED": "1"}
+    if protected:
+        env.update(PROTECTION_ENV)
+    port: int = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", APP_DIR,
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=os.getcwd(), env=env,
+    )
+    base_url: str = f"http://127.0.0.1:{port}"
+    try:
+        await _wait_ready(base_url)
+        results: multiprocessing.Queue = multiprocessing.Queue()
+        flood = multiprocessing.Process(
+            target=abuse, args=(base_url, args.abusers, args.abuser_ips, args.duration + 1, results)
+        )
+        flood.start()
+        await asyncio.sleep(1)  # let the flood build up before measuring
+        async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+            row = await polite(client, args.max_id, args.polite_rps, time.perf_counter() + args.duration)
+        statuses: Dict[str, int] = results.get()
+        flood.join()
+        label: str = "protected" if protected else "unprotected"
+        print(f"{label:<13}{row['requests']:>6}{row['errors']:>7}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+              f"{row['p99_ms']:>10.1f}   {dict(sorted(statuses.items(), key=str))}")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main() -> None:
+    """Parse arguments, optionally seed and compare both configurations."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workdir", required=True, help="Directory for the benchmark books.db")
+    parser.add_argument("--seed-rows", type=int, default=0, help="Seed this many synthetic rows first")
+    parser.add_argument("--max-id", type=int, default=None, help="Highest book ID (defaults to --seed-rows)")
+    parser.add_argument("--abusers", type=int, default=64, help="Concurrent flooding connections")
+    parser.add_argument("--abuser-ips", type=int, default=4, help="Distinct addresses the abusers use")
+    parser.add_argument("--polite-rps", type=float, default=20.0, help="Request rate of the polite client")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per configuration")
+    args = parser.parse_args()
+    args.max_id = args.max_id or args.seed_rows or 1
+
+    workdir: str = os.path.abspath(args.workdir)
+    prepare_app(APP_DIR, workdir)
+    if args.seed_rows:
+        seed(os.path.join(workdir, "books.db"), args.seed_rows)
+    print(f"{'config':<13}{'polite':>6}{'errors':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}   abuser statuses")
+    for protected in (False, True):
+        asyncio.run(run(args, protected))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Seed a book API database with a synthetic catalog.
+
+The schema is created through the application's own code (``main`` for
+lecture_5, ``migrations.init_db`` for lecture_6), so the same script works
+for both, including the FTS index and migrations of the latter. Rows are inserted with executemany
+in large transactions.
+
+Usage:
+    python benchmarks/seed.py --app-dir . --workdir /tmp/bench --rows 100000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from typing import Iterator, List, Tuple
+
+FIRST_WORDS: Tuple[str, ...] = (
+    "War", "Peace", "Crime", "Pride", "Sense", "Night", "Silent", "Lost", "Winter", "Golden",
+    "Hidden", "Broken", "Ancient", "Last", "Red", "Dark", "Little", "Great", "Long", "Secret",
+)
+SECOND_WORDS: Tuple[str, ...] = (
+    "Garden", "River", "House", "Empire", "Road", "Sea", "Kingdom", "Letters", "Harbor", "Forest",
+    "Station", "Mirror", "Voyage", "Island", "Tower", "Bridge", "Song", "Storm", "Fire", "Shadow",
+)
+SURNAMES: Tuple[str, ...] = (
+    "Tolstoy", "Dostoevsky", "Austen", "Dickens", "Orwell", "Woolf", "Chekhov", "Bronte", "Twain",
+    "Hugo", "Kafka", "Joyce", "Nabokov", "Bulgakov", "Pushkin", "Gogol", "Turgenev", "Hemingway",
+)
+
+
+def synthetic_rows(count: int, seed: int = 42) -> Iterator[Tuple[str, str, object]]:
+    """
+    Generate reproducible (title, author, year) rows.
+
+    Args:
+        count (int): Number of rows
+        seed (int): Random seed
+
+    Yields:
+        Tuple[str, str, object]: Row values; about one year in ten is NULL
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        title: str = f"{rng.choice(FIRST_WORDS)} {rng.choice(SECOND_WORDS)} {i}"
+        author: str = f"Author{rng.randrange(5000)} {rng.choice(SURNAMES)}"
+        year = None if rng.random() < 0.1 else rng.randint(1800, 2024)
+        yield title, author, year
+
+
+def prepare_app(app_dir: str, workdir: str) -> None:
+    """
+    Point the application at ``workdir/books.db``, import it and create the schema.
+
+    Args:
+        app_dir (str): Directory containing the application's main.py
+        workdir (str): Directory holding the benchmark database
+    """
+    app_dir, workdir = os.path.abspath(app_dir), os.path.abspath(workdir)
+    os.makedirs(workdir, exist_ok=True)
+    os.environ.setdefault("BOOK_API_DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'books.db')}")
+    sys.path.insert(0, app_dir)
+    os.chdir(workdir)  # lecture_5 always uses ./books.db
+    import main  # noqa: F401  (lecture_5 creates its tables on import)
+    try:
+        from database import engine
+        from migrations import init_db
+    except ImportError:
+        return
+    init_db(engine)  # lecture_6 does this in its lifespan handler instead
+
+
+def seed(db_path: str, rows: int, batch_size: int = 50000) -> float:
+    """
+    Insert synthetic rows into an existing books table.
+
+    Args:
+        db_path (str): SQLite database file
+        rows (int): Rows to insert
+        batch_size (int): Rows per transaction
+
+    Returns:
+        float: Rows per second achieved
+    """
+    conn = sqlite3.connect(db_path)
+    start: float = time.perf_counter()
+    batch: List[Tuple[str, str, object]] = []
+    for row in synthetic_rows(rows):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            conn.executemany("INSERT INTO books (title, author, year) VALUES (?, ?, ?)", batch)
+            conn.commit()
+            batch.clear()
+    if batch:
+        conn.executemany("INSERT INTO books (title, author, year) VALUES (?, ?, ?)", batch)
+        conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    return rows / max(time.perf_counter() - start, 1e-9)
+
+
+def main() -> None:
+    """Parse arguments and seed the database."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app-dir", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument("--workdir", required=True, help="Directory for books.db")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows to insert (10k to 10M)")
+    parser.add_argument("--batch-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    workdir: str = os.path.abspath(args.workdir)
+    prepare_app(args.app_dir, workdir)
+    rate: float = seed(os.path.join(workdir, "books.db"), args.rows, args.batch_size)
+    print(f"Seeded {args.rows} rows into {args.workdir}/books.db at {rate:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Compare read/write concurrency of the "default" and "tuned" SQLite engine profiles.
+
+Readers run point lookups and writers insert rows on separate threads
+against a temporary copy of the schema for a fixed duration.
+
+Usage:
+    python benchmarks/sqlite_profile.py --readers 8 --writers 2 --seconds 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from database import Base, create_db_engine  # noqa: E402
+from models import Book  # noqa: E402
+
+
+def run_profile(profile: str, rows: int, readers: int, writers: int, seconds: float) -> Dict[str, float]:
+    """
+    Run the mixed workload against a fresh database with one engine profile.
+
+    Args:
+        profile (str): "default" or "tuned"
+        rows (int): Rows seeded before the run
+        readers (int): Reader threads
+        writers (int): Writer threads
+        seconds (float): Duration of the run
+
+    Returns:
+        Dict[str, float]: Reads/s, writes/s and failed operations
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", profile=profile)
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(insert(Book.__table__), [
+                {"title": f"Title {i}", "author": f"Author {i % 1000}", "year": 1900 + i % 120}
+                for i in range(rows)
+            ])
+
+        counts: Dict[str, int] = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        deadline: float = time.perf_counter() + seconds
+
+        def reader() -> None:
+            done = errors = 0
+            while time.perf_counter() < deadline:
+                try:
+                    with engine.connect() as conn:
+                        conn.execute(select(Book).where(Book.id == random.randint(1, rows))).first()
+                    done += 1
+                except OperationalError:
+                    errors += 1
+            with lock:
+                counts["reads"] += done
+                counts["errors"] += errors
+
+        def writer() -> None:
+            done = errors = 0
+            while time.perf_counter() < deadline:
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(insert(Book.__table__), {"title": "New", "author": "Bench", "year": 2000})
+                    done += 1
+                except OperationalError:
+                    errors += 1
+            with lock:
+                counts["writes"] += done
+                counts["errors"] += errors
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with engine.connect() as conn:
+            journal: str = conn.execute(text("PRAGMA journal_mode")).scalar()
+        engine.dispose()
+
+    return {
+        "journal": journal,
+        "reads_per_s": counts["reads"] / seconds,
+        "writes_per_s": counts["writes"] / seconds,
+        "errors": counts["errors"],
+    }
+
+
+def main() -> None:
+    """Parse arguments, run both profiles and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10}{'journal':<10}{'reads/s':>12}{'writes/s':>12}{'errors':>8}")
+    for profile in ("default", "tuned"):
+        result = run_profile(profile, args.rows, args.readers, args.writers, args.seconds)
+        print(f"{profile:<10}{result['journal']:<10}{result['reads_per_s']:>12.0f}"
+              f"{result['writes_per_s']:>12.0f}{result['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Measure cold-start cost: import time of ``main`` and time to the first healthy response.
+
+1. Runs ``python -X importtime -c "import main"`` and lists the modules
+   with the largest cumulative import time.
+2. Starts uvicorn repeatedly and polls a health path until it answers
+   200, timing from process spawn. The first run creates the schema; later
+   runs only check it. Exits with status 1 when the median exceeds
+   ``--budget-ms``, so it can guard startup time in CI. Requires ``httpx``.
+
+Usage:
+    python benchmarks/startup.py --workdir /tmp/bench --runs 5 --budget-ms 1500
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load import _free_port  # noqa: E402
+
+APP_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(env: Dict[str, str]) -> List[Tuple[int, int, str]]:
+    """
+    Import ``main`` in a fresh interpreter under ``-X importtime``.
+
+    Args:
+        env (Dict[str, str]): Environment of the child process
+
+    Returns:
+        List[Tuple[int, int, str]]: (cumulative µs, depth, module) for every import
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=APP_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    rows: List[Tuple[int, int, str]] = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            rows.append((int(match.group(2)), len(match.group(3)) // 2, match.group(4)))
+    return rows
+
+
+def time_to_healthy(env: Dict[str, str], path: str, timeout: float = 30.0) -> float:
+    """
+    Start uvicorn and wait for the first 200 response on ``path``.
+
+    Args:
+        env (Dict[str, str]): Environment of the server process
+        path (str): Health path to poll
+        timeout (float): Seconds before giving up
+
+    Returns:
+        float: Milliseconds from spawn to the first healthy response
+    """
+    port: int = _free_port()
+    start: float = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", APP_DIR,
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1.0) as client:
+            while time.perf_counter() - start < timeout:
+                try:
+                    if client.get(path).status_code == 200:
+                        return (time.perf_counter() - start) * 1000
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.005)
+        raise RuntimeError(f"No healthy response on {path} within {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main() -> None:
+    """Parse arguments, report import times and check the startup budget."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workdir", required=True, help="Directory for the benchmark books.db")
+    parser.add_argument("--runs", type=int, default=5, help="Server starts to time")
+    parser.add_argument("--path", default="/", help="Path that must answer 200")
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="Allowed median time to healthy")
+    parser.add_argument("--top", type=int, default=15, help="Heaviest imports to list")
+    args = parser.parse_args()
+
+    workdir: str = os.path.abspath(args.workdir)
+    os.makedirs(workdir, exist_ok=True)
+    env: Dict[str, str] = os.environ.copy()
+    env.setdefault("BOOK_API_DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'books.db')}")
+
+    rows = import_times(env)
+    main_index: int = next(i for i, (_, depth, module) in enumerate(rows) if module == "main" and depth == 0)
+    # importtime prints children before their parent: main's imports are the rows right above it
+    children: List[Tuple[int, int, str]] = []
+    for row in reversed(rows[:main_index]):
+        if row[1] == 0:
+            break
+        if row[1] == 1:
+            children.append(row)
+    print(f"import main: {rows[main_index][0] / 1000:.1f} ms; heaviest direct imports of main:")
+    for cumulative, _, module in sorted(children, reverse=True)[:args.top]:
+        print(f"  {module:<30}{cumulative / 1000:>9.1f} ms")
+
+    timings: List[float] = [time_to_healthy(env, args.path) for _ in range(args.runs)]
+    median: float = statistics.median(timings)
+    print(f"\ntime to first healthy {args.path}: first {timings[0]:.0f} ms, "
+          f"median {median:.0f} ms, min {min(timings):.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if median > args.budget_ms:
+        print("OVER BUDGET")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
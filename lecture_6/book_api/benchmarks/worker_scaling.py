@@ -0,0 +1,100 @@
+"""
+Measure how throughput scales with the number of worker processes.
+
+Starts ``serve.py`` with 1, 2, 4, ... workers (up to the CPU count) against
+the same seeded WAL database and runs read scenarios from load.py against
+each, with the book cache off (serve.py never runs the per-process memory
+cache with several workers). Requires ``httpx``.
+
+Usage:
+    python benchmarks/worker_scaling.py --workdir /tmp/bench --seed-rows 100000
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load import SCENARIOS, RunState, _free_port, _wait_ready, run_scenario  # noqa: E402
+from seed import prepare_app, seed  # noqa: E402
+
+APP_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+READ_SCENARIOS: List[str] = ["get_book", "list_first_page", "search_author"]
+
+
+async def measure(workers: int, concurrency: int, duration: float, max_id: int) -> Dict[str, float]:
+    """
+    Start serve.py with ``workers`` processes and measure RPS per read scenario.
+
+    Args:
+        workers (int): Worker processes
+        concurrency (int): Concurrent clients
+        duration (float): Seconds per scenario
+        max_id (int): Highest seeded book ID
+
+    Returns:
+        Dict[str, float]: RPS per scenario name
+    """
+    port: int = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)],
+        cwd=APP_DIR, env={"BOOK_API_CACHE_BACKEND": "none", **os.environ, "BOOK_API_METRICS": "0"},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url: str = f"http://127.0.0.1:{port}"
+    rps: Dict[str, float] = {}
+    try:
+        await _wait_ready(base_url)
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+            state = RunState(max_id=max_id)
+            for scenario in SCENARIOS:
+                if scenario.name in READ_SCENARIOS:
+                    result = await run_scenario(client, scenario, state, concurrency, duration)
+                    rps[scenario.name] = result["rps"]
+    finally:
+        server.terminate()
+        server.wait(timeout=15)
+    return rps
+
+
+def main() -> None:
+    """Seed if asked, then print an RPS table per worker count."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workdir", required=True)
+    parser.add_argument("--seed-rows", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    workdir: str = os.path.abspath(args.workdir)
+    prepare_app(APP_DIR, workdir)
+    db_path: str = os.path.join(workdir, "books.db")
+    if args.seed_rows:
+        seed(db_path, args.seed_rows)
+
+    import sqlite3
+    with sqlite3.connect(db_path) as conn:
+        max_id: int = conn.execute("SELECT COALESCE(MAX(id), 0) FROM books").fetchone()[0]
+
+    counts: List[int] = []
+    workers: int = 1
+    while workers <= args.max_workers:
+        counts.append(workers)
+        workers *= 2
+
+    print(f"{'workers':>8}" + "".join(f"{name:>18}" for name in READ_SCENARIOS))
+    for workers in counts:
+        rps = asyncio.run(measure(workers, args.concurrency, args.duration, max_id))
+        print(f"{workers:>8}" + "".join(f"{rps.get(name, 0):>18.0f}" for name in READ_SCENARIOS))
+
+
+if __name__ == "__main__":
+    main()
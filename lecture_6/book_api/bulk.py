@@ -0,0 +1,89 @@
+import json
+from pydantic import ValidationError
+from starlette.requests import Request
+from typing import Any, AsyncIterator, List, Tuple
+
+from schemas import BookCreate, BulkRowError
+
+NDJSON_MEDIA_TYPES: Tuple[str, ...] = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+async def iter_raw_rows(request: Request) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Iterate over the rows of a bulk upload.
+    
+    NDJSON bodies are read line by line while they stream in; anything
+    else is parsed as a single JSON array.
+    
+    Args:
+        request (Request): Incoming request
+        
+    Yields:
+        Tuple[int, Any]: Row index and decoded JSON value, or the
+        ``ValueError`` raised while decoding that row
+    """
+    content_type: str = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    
+    if content_type in NDJSON_MEDIA_TYPES:
+        index: int = 0
+        buffer: bytes = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, _decode(line)
+                    index += 1
+        if buffer.strip():
+            yield index, _decode(buffer)
+        return
+    
+    payload = _decode(await request.body())
+    if isinstance(payload, ValueError):
+        raise payload
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON array of books")
+    for index, item in enumerate(payload):
+        yield index, item
+
+
+def _decode(raw: bytes) -> Any:
+    """
+    Decode one JSON document, returning the error instead of raising it.
+    
+    Args:
+        raw (bytes): JSON text
+        
+    Returns:
+        Any: Decoded value or ValueError
+    """
+    try:
+        return json.loads(raw)
+    except ValueError as exc:
+        return ValueError(f"Invalid JSON: {exc}")
+
+
+def validate_rows(rows: List[Tuple[int, Any]]) -> Tuple[List[BookCreate], List[BulkRowError]]:
+    """
+    Validate a chunk of raw rows against BookCreate.
+    
+    Args:
+        rows (List[Tuple[int, Any]]): Row index and decoded value pairs
+        
+    Returns:
+        Tuple[List[BookCreate], List[BulkRowError]]: Valid books and row errors
+    """
+    books: List[BookCreate] = []
+    errors: List[BulkRowError] = []
+    for index, value in rows:
+        if isinstance(value, ValueError):
+            errors.append(BulkRowError(row=index, errors=[{"msg": str(value)}]))
+            continue
+        try:
+            books.append(BookCreate.model_validate(value))
+        except ValidationError as exc:
+            errors.append(BulkRowError(
+                row=index,
+                errors=exc.errors(include_url=False, include_context=False, include_input=False)
+            ))
+    return books, errors
@@ -0,0 +1,415 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from config import CACHE_BACKEND, CACHE_MAXSIZE, CACHE_TTL, CACHE_URL
+
+# Namespace versions outlive the entries built from them by this long, which covers a slow
+# database read between reading a version and storing the entry under it
+VERSION_GRACE: float = 60.0
+
+# Bump a namespace version on a Redis-protocol server. Versions come from a shared clock in
+# milliseconds (passed in, like the rate limiter's) kept strictly increasing, so a version that
+# expired and is bumped again never reuses a number an older entry may still be stored under.
+BUMP_VERSION_SCRIPT: str = """
+local version = math.max(tonumber(ARGV[1]), (tonumber(redis.call('GET', KEYS[2])) or 0) + 1)
+version = string.format('%d', version)
+redis.call('SET', KEYS[2], version)
+redis.call('SET', KEYS[1], version, 'PX', ARGV[2])
+return version
+"""
+
+# Read a namespace version and the entry stored under it in one round trip
+LOOKUP_SCRIPT: str = """
+local version = redis.call('GET', KEYS[1]) or '0'
+return {version, redis.call('GET', ARGV[1] .. ':' .. version)}
+"""
+
+
+class Cache:
+    """
+    Base class of the read-through caches used by the service.
+
+    Subclasses implement ``_get``, ``_set``, ``_delete`` and ``_clear``;
+    this class keeps the hit/miss counters exposed by ``stats``.
+
+    Attributes:
+        name (str): Backend name reported in stats
+        ttl (float): Seconds an entry stays valid
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that fell through to the database
+        invalidations (int): Entries dropped because of writes
+    """
+
+    name: str = "base"
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalidations: int = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a value.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Any]: Cached value, or None on a miss
+        """
+        value = await self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def lookup(self, namespace: str) -> Tuple[str, Optional[Any]]:
+        """
+        Look up the entry of a versioned namespace (e.g. one book).
+
+        A miss is filled by ``set`` under the returned key. If a write bumps
+        the namespace in between, that key is never read again, so a value
+        read from the database before the write cannot outlive it.
+
+        Args:
+            namespace (str): Namespace name
+
+        Returns:
+            Tuple[str, Optional[Any]]: Key of the current version, and its value or None on a miss
+        """
+        key, value = await self._lookup(namespace)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return key, value
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Store a JSON-serializable value for ``ttl`` seconds.
+
+        Args:
+            key (str): Cache key
+            value (Any): Value to store (None is not cacheable)
+        """
+        await self._set(key, value)
+
+    async def delete(self, key: str) -> None:
+        """
+        Invalidate a key after a write.
+
+        Args:
+            key (str): Cache key
+        """
+        self.invalidations += 1
+        await self._delete(key)
+
+    async def clear(self) -> None:
+        """Drop every entry."""
+        await self._clear()
+
+    async def version(self, namespace: str) -> int:
+        """
+        Get the current version of a key namespace.
+
+        Embedding it in keys lets ``bump_version`` invalidate a whole family
+        of entries (e.g. every filter combination of /books/stats) at once.
+
+        Args:
+            namespace (str): Namespace name
+
+        Returns:
+            int: Version, 0 until the first bump
+        """
+        return await self._version(namespace)
+
+    async def bump_version(self, namespace: str) -> None:
+        """
+        Invalidate every key built with the current version of a namespace.
+
+        Old entries are never read again and age out through TTL/LRU. A
+        version itself is forgotten ``ttl`` + VERSION_GRACE seconds after
+        its last bump, once no entry built from an older one can be stored.
+
+        Args:
+            namespace (str): Namespace name
+        """
+        self.invalidations += 1
+        await self._bump_version(namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get counters for sizing the cache.
+
+        Returns:
+            Dict[str, Any]: Backend, hits, misses, hit ratio and invalidations
+        """
+        lookups: int = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+    async def _get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def _lookup(self, namespace: str) -> Tuple[str, Optional[Any]]:
+        key: str = versioned_key(namespace, await self._version(namespace))
+        return key, await self._get(key)
+
+    async def _set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    async def _delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def _clear(self) -> None:
+        raise NotImplementedError
+
+    async def _version(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    async def _bump_version(self, namespace: str) -> None:
+        raise NotImplementedError
+
+
+class NullCache(Cache):
+    """Cache that stores nothing; every lookup is a miss."""
+
+    name: str = "none"
+
+    async def _get(self, key: str) -> Optional[Any]:
+        return None
+
+    async def _set(self, key: str, value: Any) -> None:
+        return None
+
+    async def _delete(self, key: str) -> None:
+        return None
+
+    async def _clear(self) -> None:
+        return None
+
+    async def _version(self, namespace: str) -> int:
+        return 0
+
+    async def _bump_version(self, namespace: str) -> None:
+        return None
+
+
+class MemoryCache(Cache):
+    """
+    In-process cache with a TTL and an LRU bound on the number of entries.
+
+    Other worker processes' writes never invalidate it, so it is only
+    correct with a single worker (serve.py never runs it with several).
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept
+        evictions (int): Entries dropped to respect ``maxsize``
+    """
+
+    name: str = "memory"
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        super().__init__(ttl)
+        self.maxsize: int = maxsize
+        self.evictions: int = 0
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # namespace -> (version, expiry), oldest bump first
+        self._versions: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._clock: int = 0
+        # Sync-mode handlers touch the cache from threadpool workers too
+        self._lock = threading.Lock()
+
+    async def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def _set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    async def _delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    async def _clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    async def _version(self, namespace: str) -> int:
+        entry = self._versions.get(namespace)
+        return 0 if entry is None or entry[1] < time.monotonic() else entry[0]
+
+    async def _bump_version(self, namespace: str) -> None:
+        now: float = time.monotonic()
+        with self._lock:
+            self._clock += 1
+            self._versions[namespace] = (self._clock, now + self.ttl + VERSION_GRACE)
+            self._versions.move_to_end(namespace)
+            while self._versions:
+                oldest: str = next(iter(self._versions))
+                if self._versions[oldest][1] >= now:
+                    break
+                del self._versions[oldest]
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = super().stats()
+        stats.update(size=len(self._data), maxsize=self.maxsize, evictions=self.evictions)
+        return stats
+
+
+class RedisCache(Cache):
+    """
+    Cache stored in any server speaking the Redis protocol.
+
+    Works with Redis itself or a local stand-in (Valkey, KeyDB, ...).
+    Values are stored as JSON under a key prefix with a server-side TTL.
+    Requires the optional ``redis`` package.
+
+    Attributes:
+        prefix (str): Prefix added to every key
+    """
+
+    name: str = "redis"
+
+    def __init__(self, url: str, ttl: float, prefix: str = "book_api:") -> None:
+        super().__init__(ttl)
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:
+            raise RuntimeError("BOOK_API_CACHE_BACKEND=redis requires the 'redis' package") from exc
+        self.prefix: str = prefix
+        self._client = redis_asyncio.from_url(url)
+        self._bump_script = self._client.register_script(BUMP_VERSION_SCRIPT)
+        self._lookup_script = self._client.register_script(LOOKUP_SCRIPT)
+
+    async def _get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def _lookup(self, namespace: str) -> Tuple[str, Optional[Any]]:
+        version, raw = await self._lookup_script(
+            keys=[f"{self.prefix}version:{namespace}"], args=[self.prefix + namespace],
+        )
+        return versioned_key(namespace, int(version)), None if raw is None else json.loads(raw)
+
+    async def _set(self, key: str, value: Any) -> None:
+        await self._client.set(self.prefix + key, json.dumps(value), px=int(self.ttl * 1000))
+
+    async def _delete(self, key: str) -> None:
+        await self._client.delete(self.prefix + key)
+
+    async def _clear(self) -> None:
+        keys = [key async for key in self._client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await self._client.delete(*keys)
+
+    async def _version(self, namespace: str) -> int:
+        raw = await self._client.get(f"{self.prefix}version:{namespace}")
+        return 0 if raw is None else int(raw)
+
+    async def _bump_version(self, namespace: str) -> None:
+        # Shared by every worker, unlike the per-process memory backend
+        await self._bump_script(
+            keys=[f"{self.prefix}version:{namespace}", f"{self.prefix}version-clock"],
+            args=[int(time.time() * 1000), int((self.ttl + VERSION_GRACE) * 1000)],
+        )
+
+
+def create_cache(backend: str, ttl: float, maxsize: int, url: str) -> Cache:
+    """
+    Build a cache from configuration values.
+
+    Args:
+        backend (str): "memory", "redis" or "none"
+        ttl (float): Seconds an entry stays valid
+        maxsize (int): Entry bound for the memory backend
+        url (str): Server URL for the redis backend
+
+    Returns:
+        Cache: Configured cache
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if backend == "memory":
+        return MemoryCache(ttl=ttl, maxsize=maxsize)
+    if backend == "redis":
+        return RedisCache(url=url, ttl=ttl)
+    if backend == "none":
+        return NullCache(ttl=ttl)
+    raise ValueError(f"Unknown cache backend '{backend}'")
+
+
+# Cache in front of crud.get_book, one versioned namespace per book (book_namespace())
+book_cache: Cache = create_cache(CACHE_BACKEND, CACHE_TTL, CACHE_MAXSIZE, CACHE_URL)
+
+# Cache in front of crud.book_stats, keyed by stats_key(); separate counters from book_cache
+stats_cache: Cache = create_cache(CACHE_BACKEND, CACHE_TTL, CACHE_MAXSIZE, CACHE_URL)
+
+# Namespace bumped on every write, see Cache.bump_version
+STATS_NAMESPACE: str = "stats"
+
+
+def versioned_key(namespace: str, version: int) -> str:
+    """
+    Get the key of a namespace's entry at one version (see Cache.lookup).
+
+    Args:
+        namespace (str): Namespace name
+        version (int): Namespace version
+
+    Returns:
+        str: Cache key
+    """
+    return f"{namespace}:{version}"
+
+
+def book_namespace(book_id: int) -> str:
+    """
+    Get the cache namespace of a single book; writes bump it.
+
+    Args:
+        book_id (int): Book ID
+
+    Returns:
+        str: Namespace name
+    """
+    return f"book:{book_id}"
+
+
+def stats_key(version: int, params: Dict[str, Any]) -> str:
+    """
+    Get the cache key of one /books/stats result.
+
+    Args:
+        version (int): Current version of STATS_NAMESPACE
+        params (Dict[str, Any]): Filters and options the result depends on
+
+    Returns:
+        str: Cache key
+    """
+    return f"stats:{version}:{json.dumps(params, sort_keys=True)}"
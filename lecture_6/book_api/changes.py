@@ -0,0 +1,260 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from sqlalchemy import Row
+from sqlalchemy.exc import SQLAlchemyError
+
+import crud
+from config import CHANGES_HEARTBEAT_MS, CHANGES_POLL_MS, CHANGES_SEQUENCE_DELAY_MS, CHANGES_STREAM_MAX_MS, DB_MODE
+from database import AsyncSessionLocal, SessionLocal, engine, run_read
+
+logger = logging.getLogger("book_api.changes")
+
+# Entries read per query by the SSE stream
+STREAM_BATCH_SIZE: int = 500
+
+# Milliseconds an EventSource waits before reconnecting after the stream ends
+STREAM_RETRY_MS: int = 1000
+
+
+class ChangeNotifier:
+    """
+    Wake change-feed waiters when this process commits a write.
+
+    Writes made by other worker processes are not seen here; waiters also
+    re-check the log every CHANGES_POLL_MS, which bounds their delay.
+    Waiters take ``changed()`` before reading the log, so a write committed
+    between that read and the wait still wakes them.
+    """
+
+    def __init__(self) -> None:
+        self._event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def changed(self) -> asyncio.Event:
+        """
+        Get the event the next notify sets.
+
+        Returns:
+            asyncio.Event: Event to pass to ``wait``
+        """
+        loop = asyncio.get_running_loop()
+        if self._event is None or self._loop is not loop:  # events belong to the loop that waits on them
+            self._event, self._loop = asyncio.Event(), loop
+        return self._event
+
+    def notify(self) -> None:
+        """Wake every current waiter (called after each committed write)."""
+        if self._event is not None:
+            self._event.set()
+            self._event = None
+
+    @staticmethod
+    async def wait(changed: asyncio.Event, timeout: float) -> None:
+        """
+        Wait until ``changed`` is set, at most ``timeout`` seconds.
+
+        Args:
+            changed (asyncio.Event): Result of ``changed()`` taken before reading the log
+            timeout (float): Seconds to wait
+        """
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+change_notifier: ChangeNotifier = ChangeNotifier()
+
+
+class ChangeSequencer:
+    """
+    Number committed change-log entries on PostgreSQL (see crud.sequence_changes).
+
+    Writes only request a step and return. One task per process runs the
+    steps, each starting ``delay`` after a request and numbering every
+    write committed before it, so one short transaction sequences many
+    writes; change-feed waiters are woken after each step. Like
+    GroupCommitWriter, this trades a little latency (a write reaches the
+    feed one step after its commit) for fewer WAL flushes. Feed reads also
+    run a step, at most once per ``interval`` per process and never
+    waiting, which picks up writes made outside the API. On SQLite entries
+    are numbered as they are written and this does nothing.
+
+    Attributes:
+        enabled (bool): Whether the database queues entries for sequencing
+        delay (float): Seconds a requested step waits for more writes
+        interval (float): Minimum seconds between steps run for reads
+        steps (int): Steps run for writes
+    """
+
+    def __init__(self, session_factory: Callable, enabled: bool, delay: float, interval: float) -> None:
+        self.session_factory: Callable = session_factory
+        self.enabled: bool = enabled
+        self.delay: float = delay
+        self.interval: float = interval
+        self.steps: int = 0
+        self._requested: bool = False
+        self._read_step_at: float = float("-inf")
+        self._task: Optional[asyncio.Task] = None
+
+    def request(self) -> None:
+        """Make sure a step starts after this process's latest commit (called after each write)."""
+        if not self.enabled:
+            return
+        self._requested = True
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            # Started lazily, and again if the application moved to a new event loop
+            self._task = loop.create_task(self._run())
+
+    async def before_read(self) -> None:
+        """Sequence entries of writes made elsewhere, unless a step ran recently."""
+        if self.enabled and time.monotonic() - self._read_step_at >= self.interval:
+            self._read_step_at = time.monotonic()
+            await self._step(False)
+
+    async def _run(self) -> None:
+        """Run steps while writes request them; the next request starts the task again."""
+        while self._requested:
+            if self.delay > 0:
+                await asyncio.sleep(self.delay)
+            self._requested = False
+            await self._step(True)
+            self.steps += 1
+            change_notifier.notify()
+
+    async def _step(self, wait: bool) -> None:
+        """
+        Run crud.sequence_changes on the primary.
+
+        The writes it follows have committed either way, so a failure is
+        only logged; the entries stay queued for the next step.
+
+        Args:
+            wait (bool): Wait for a concurrent step instead of skipping
+        """
+        try:
+            await run_read(self.session_factory, crud.sequence_changes, wait)
+        except SQLAlchemyError:
+            logger.warning("Sequencing the change log failed", exc_info=True)
+
+
+change_sequencer: ChangeSequencer = ChangeSequencer(
+    AsyncSessionLocal if DB_MODE == "async" else SessionLocal,
+    engine.dialect.name == "postgresql",
+    CHANGES_SEQUENCE_DELAY_MS / 1000,
+    CHANGES_POLL_MS / 1000,
+)
+
+
+def change_item(row: Row) -> Dict[str, Any]:
+    """
+    Shape a crud.get_changes row as a BookChangeResponse dict.
+
+    Args:
+        row (Row): Change-log row joined with the book's current columns
+
+    Returns:
+        Dict[str, Any]: seq, op, book_id, changed_at and the book (None once deleted)
+    """
+    book: Optional[Dict[str, Any]] = (
+        {"id": row.book_id, "title": row.title, "author": row.author, "year": row.year}
+        if row.title is not None else None
+    )
+    return {"seq": row.seq, "op": row.op, "book_id": row.book_id, "changed_at": row.changed_at, "book": book}
+
+
+def _event(row: Row) -> str:
+    """
+    Encode one change-log entry as a Server-Sent Event.
+
+    Args:
+        row (Row): crud.get_changes row
+
+    Returns:
+        str: ``id``/``event``/``data`` lines and the blank line ending the event
+    """
+    item: Dict[str, Any] = change_item(row)
+    data: str = json.dumps({**item, "changed_at": item["changed_at"].isoformat()})
+    return f"id: {row.seq}\nevent: {row.op}\ndata: {data}\n\n"
+
+
+async def read_changes(session_factory: Callable, since: int, limit: int) -> List[Row]:
+    """
+    Read one page of the change log on a short-lived session.
+
+    A fresh session per read means a waiting client holds no pooled
+    connection between checks.
+
+    Args:
+        session_factory (Callable): Read pool (async_sessionmaker in async mode, sessionmaker otherwise)
+        since (int): Last ``seq`` the client has seen
+        limit (int): Maximum number of entries
+
+    Returns:
+        List[Row]: Entries after ``since``, oldest first
+    """
+    await change_sequencer.before_read()
+    return await run_read(session_factory, crud.get_changes, since, limit)
+
+
+async def wait_for_changes(session_factory: Callable, since: int, limit: int, timeout: float) -> List[Row]:
+    """
+    Long poll: return entries after ``since`` as soon as there are any.
+
+    Args:
+        session_factory (Callable): Read pool to query
+        since (int): Last ``seq`` the client has seen
+        limit (int): Maximum number of entries
+        timeout (float): Seconds to wait when there are none yet (0 answers at once)
+
+    Returns:
+        List[Row]: Entries after ``since``, empty if none arrived in time
+    """
+    deadline: float = time.monotonic() + timeout
+    while True:
+        changed: asyncio.Event = change_notifier.changed()
+        rows: List[Row] = await read_changes(session_factory, since, limit)
+        remaining: float = deadline - time.monotonic()
+        if rows or remaining <= 0:
+            return rows
+        await change_notifier.wait(changed, min(CHANGES_POLL_MS / 1000, remaining))
+
+
+async def stream_changes(session_factory: Callable, since: int) -> AsyncIterator[bytes]:
+    """
+    Server-Sent Events body: every entry after ``since``, then new ones as they commit.
+
+    Each entry is one event whose ``id`` is its seq (an EventSource sends it
+    back as Last-Event-ID when it reconnects) and whose type is the op. Idle
+    streams get a comment line every CHANGES_HEARTBEAT_MS so proxies keep
+    them open and closed clients are noticed. The stream ends after
+    CHANGES_STREAM_MAX_MS; clients reconnect and resume.
+
+    Args:
+        session_factory (Callable): Read pool to query
+        since (int): Last ``seq`` the client has seen
+
+    Yields:
+        bytes: Encoded events
+    """
+    yield f"retry: {STREAM_RETRY_MS}\n\n".encode()
+    closes_at: float = time.monotonic() + CHANGES_STREAM_MAX_MS / 1000
+    last_sent: float = time.monotonic()
+    while time.monotonic() < closes_at:
+        changed: asyncio.Event = change_notifier.changed()
+        rows: List[Row] = await read_changes(session_factory, since, STREAM_BATCH_SIZE)
+        if rows:
+            yield "".join(_event(row) for row in rows).encode()
+            since = rows[-1].seq
+            last_sent = time.monotonic()
+            if len(rows) == STREAM_BATCH_SIZE:
+                continue  # catching up: read the next batch right away
+        elif time.monotonic() - last_sent >= CHANGES_HEARTBEAT_MS / 1000:
+            yield b": keep-alive\n\n"
+            last_sent = time.monotonic()
+        await change_notifier.wait(changed, min(CHANGES_POLL_MS / 1000, max(closes_at - time.monotonic(), 0)))
@@ -0,0 +1,84 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Share one execution between identical concurrent calls.
+
+    The first caller for a key starts ``func`` as a task; callers arriving
+    with the same key while it runs await that task instead of starting
+    their own, and all get its result (or its exception). The task runs
+    shielded, so a caller that goes away does not cancel it for the rest;
+    ``func`` must therefore not use anything owned by one request, such
+    as its database session.
+
+    A caller only joins a task that started after the last ``forget``,
+    which runs after every write of this process, so a client never gets a
+    result read before its own write. Writes committed by other processes
+    while a shared task runs may be missed by the callers that joined it.
+
+    Attributes:
+        flights (int): Executions started
+        deduplicated (int): Calls served by another call's execution
+    """
+
+    def __init__(self) -> None:
+        self.flights: int = 0
+        self.deduplicated: int = 0
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``func``, or wait for the identical call already running.
+
+        Args:
+            key (Hashable): Identity of the call, e.g. its normalized parameters
+            func (Callable[[], Awaitable[Any]]): Coroutine function doing the work
+
+        Returns:
+            Any: Result of the shared execution
+
+        Raises:
+            Exception: Whatever the shared execution raised
+        """
+        loop = asyncio.get_running_loop()
+        task = self._tasks.get(key)
+        if task is not None and task.get_loop() is loop:
+            self.deduplicated += 1
+        else:
+            task = loop.create_task(func())
+            task.add_done_callback(lambda done: self._finished(key, done))
+            self._tasks[key] = task
+            self.flights += 1
+        return await asyncio.shield(task)
+
+    def forget(self) -> None:
+        """Make later calls start new executions (called after each committed write)."""
+        self._tasks.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dict[str, Any]: Executions, deduplicated calls, their share and executions running
+        """
+        calls: int = self.flights + self.deduplicated
+        return {
+            "flights": self.flights,
+            "deduplicated": self.deduplicated,
+            "deduplicated_ratio": round(self.deduplicated / calls, 4) if calls else 0.0,
+            "in_flight": len(self._tasks),
+        }
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop a finished task so the next call runs again."""
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here, so an error nobody waited for is not logged as unhandled
+
+
+# Shared by the list and search endpoints when BOOK_API_COALESCE_READS is on
+read_flights: SingleFlight = SingleFlight()
@@ -0,0 +1,257 @@
+import importlib.util
+import zlib
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Levels chosen for per-request latency rather than maximum ratio
+GZIP_LEVEL: int = 6
+BROTLI_QUALITY: int = 4
+ZSTD_LEVEL: int = 3
+
+# Content types worth compressing; images, archives etc. are already compressed
+COMPRESSIBLE_TYPES: Tuple[str, ...] = ("text/", "application/json", "application/x-ndjson", "application/xml")
+
+
+class _GzipEncoder:
+    """Streaming gzip encoder; every chunk is flushed so clients can decode it immediately."""
+
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    """Streaming brotli encoder (requires the ``brotli`` package)."""
+
+    def __init__(self) -> None:
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdEncoder:
+    """Streaming zstd encoder (requires the ``zstandard`` package)."""
+
+    def __init__(self) -> None:
+        import zstandard
+
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        self._flush_block: int = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._flush_finish: int = zstandard.COMPRESSOBJ_FLUSH_FINISH
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(self._flush_finish)
+
+
+# Content-Encoding token -> encoder class, for the encodings usable in this environment.
+# brotli and zstandard are optional: an encoding whose package is not installed is simply
+# not offered. Installed ones are only imported by the first response using them.
+ENCODERS: Dict[str, Callable[[], object]] = {"gzip": _GzipEncoder}
+if importlib.util.find_spec("brotli") is not None:
+    ENCODERS["br"] = _BrotliEncoder
+if importlib.util.find_spec("zstandard") is not None:
+    ENCODERS["zstd"] = _ZstdEncoder
+
+
+def available_encodings(preferred: Sequence[str]) -> List[str]:
+    """
+    Filter the configured encodings down to those that can be produced.
+
+    Args:
+        preferred (Sequence[str]): Encodings in server preference order
+
+    Returns:
+        List[str]: Usable encodings, same order
+    """
+    return [name for name in preferred if name in ENCODERS]
+
+
+def negotiate(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """
+    Pick a response encoding from an Accept-Encoding header.
+
+    The client's q-values win; among equal q-values the server's
+    preference order (``encodings``) decides. ``*`` covers every encoding
+    the client did not list, and ``q=0`` refuses an encoding.
+
+    Args:
+        accept_encoding (str): Header value, e.g. ``"gzip, br;q=0.9"``
+        encodings (Sequence[str]): Usable encodings in preference order
+
+    Returns:
+        Optional[str]: Chosen encoding, or None to send the body as is
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality: float = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[token] = quality
+
+    best: Optional[str] = None
+    best_quality: float = 0.0
+    for name in encodings:
+        quality = weights.get(name, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing response bodies with gzip, brotli or zstd.
+
+    Bodies smaller than ``minimum_size`` and already encoded or
+    incompressible responses pass through untouched. Everything else is
+    compressed incrementally: streaming responses chunk by chunk as the
+    application produces them, large single-message bodies in
+    ``chunk_size`` slices, so compressed bytes reach the client (HTTP/1.1
+    chunked or HTTP/2 DATA frames) before the whole body is encoded.
+    """
+
+    def __init__(
+        self, app: Callable, encodings: Sequence[str], minimum_size: int = 1024, chunk_size: int = 16384
+    ) -> None:
+        self.app = app
+        self.encodings: List[str] = available_encodings(encodings)
+        self.minimum_size: int = minimum_size
+        self.chunk_size: int = chunk_size
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        accept_encoding: str = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding += value.decode("latin-1") + ","
+        encoding: Optional[str] = negotiate(accept_encoding, self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSender(send, encoding, self.minimum_size, self.chunk_size))
+
+
+class _CompressingSender:
+    """
+    ``send`` wrapper of one response: holds back the start message until
+    the first body message shows whether compression is worthwhile.
+    """
+
+    def __init__(self, send: Callable, encoding: str, minimum_size: int, chunk_size: int) -> None:
+        self.send = send
+        self.encoding: str = encoding
+        self.minimum_size: int = minimum_size
+        self.chunk_size: int = chunk_size
+        self.start: Optional[dict] = None
+        self.encoder = None
+        self.passthrough: bool = False
+
+    async def __call__(self, message: dict) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            if not self._should_compress(start, body, more_body):
+                self.passthrough = True
+                await self.send(start)
+            else:
+                self.encoder = ENCODERS[self.encoding]()
+                await self.send(self._compressed_start(start))
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        # Slice large bodies so each compressed piece goes out as soon as it is ready
+        for offset in range(0, len(body), self.chunk_size):
+            data: bytes = self.encoder.compress(body[offset:offset + self.chunk_size])
+            if data:
+                await self.send({"type": "http.response.body", "body": data, "more_body": True})
+        if not more_body:
+            await self.send({"type": "http.response.body", "body": self.encoder.finish(), "more_body": False})
+
+    def _should_compress(self, start: dict, body: bytes, more_body: bool) -> bool:
+        """
+        Decide from the first body message whether to compress the response.
+
+        Args:
+            start (dict): ``http.response.start`` message
+            body (bytes): First body chunk
+            more_body (bool): Whether more chunks follow
+
+        Returns:
+            bool: True to compress
+        """
+        if start["status"] < 200 or start["status"] in (204, 304):
+            return False
+        content_type: str = ""
+        for name, value in start.get("headers", []):
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value.decode("latin-1").lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return False
+        return more_body or len(body) >= self.minimum_size
+
+    def _compressed_start(self, start: dict) -> dict:
+        """
+        Adjust the response headers for a compressed body.
+
+        Drops Content-Length (the body is now chunked), adds Content-Encoding
+        and Vary, and weakens a strong ETag, since the encoded bytes differ
+        from the representation it was computed for.
+
+        Args:
+            start (dict): Original ``http.response.start`` message
+
+        Returns:
+            dict: Message to send
+        """
+        headers: List[Tuple[bytes, bytes]] = []
+        vary: List[bytes] = []
+        for name, value in start.get("headers", []):
+            if name == b"content-length":
+                continue
+            if name == b"vary":
+                vary.append(value)
+                continue
+            if name == b"etag" and not value.startswith(b"W/"):
+                value = b"W/" + value
+            headers.append((name, value))
+        if not any(b"accept-encoding" in value.lower() for value in vary):
+            vary.append(b"Accept-Encoding")
+        headers.append((b"vary", b", ".join(vary)))
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+        return {**start, "headers": headers}
@@ -0,0 +1,139 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from starlette.requests import Request
+from starlette.responses import Response
+from typing import Iterable, Optional, Tuple
+
+# Origin of the write stamps in ETags
+EPOCH: datetime = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def write_stamp(updated_at: datetime) -> str:
+    """
+    Encode a row's updated_at, to the microsecond, for use in an ETag.
+    
+    SQLite hands the ID of a deleted newest book to the next one, which
+    starts again at version 1; the write time tells the two books apart.
+    
+    Args:
+        updated_at (datetime): Naive UTC or aware datetime
+        
+    Returns:
+        str: Microseconds since the Unix epoch, in hex
+    """
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return format((updated_at - EPOCH) // timedelta(microseconds=1), "x")
+
+
+def book_etag(book_id: int, version: int, updated_at: datetime) -> str:
+    """
+    Build the ETag of a single book.
+    
+    Args:
+        book_id (int): Book ID
+        version (int): Row version
+        updated_at (datetime): Time of the last write, see write_stamp
+        
+    Returns:
+        str: Quoted strong ETag
+    """
+    return f'"{book_id}-{version}-{write_stamp(updated_at)}"'
+
+
+def page_etag(versions: Iterable[Tuple[int, int, datetime]]) -> str:
+    """
+    Build the ETag of a list page from the (id, version, updated_at) of its rows.
+    
+    Any insert, delete or update inside the page, including a deleted
+    book's ID being reused, changes the triples and therefore the tag.
+    
+    Args:
+        versions (Iterable[Tuple[int, int, datetime]]): (id, version, updated_at) per row, in page order
+        
+    Returns:
+        str: Quoted weak ETag
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    for book_id, version, updated_at in versions:
+        digest.update(f"{book_id}:{version}:{write_stamp(updated_at)};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    """
+    Attach UTC to a naive datetime and drop sub-second precision (HTTP dates are whole seconds).
+    
+    Args:
+        value (datetime): Naive UTC or aware datetime
+        
+    Returns:
+        datetime: Aware UTC datetime
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since for a GET request (RFC 9110).
+    
+    If-None-Match takes precedence; If-Modified-Since is only consulted
+    when the client did not send it.
+    
+    Args:
+        request (Request): Incoming request
+        etag (str): Current ETag of the resource
+        last_modified (Optional[datetime]): Current modification time
+        
+    Returns:
+        bool: True if a 304 should be sent
+    """
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: W/"x" matches "x"
+        current: str = etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+    
+    if_modified_since: Optional[str] = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since: datetime = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _as_utc(last_modified) <= _as_utc(since)
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> None:
+    """
+    Add ETag and Last-Modified headers.
+    
+    Args:
+        response (Response): Response to update
+        etag (str): ETag value
+        last_modified (Optional[datetime]): Modification time, if known
+    """
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+
+def not_modified(etag: str, last_modified: Optional[datetime]) -> Response:
+    """
+    Build an empty 304 response carrying the validators.
+    
+    Args:
+        etag (str): ETag value
+        last_modified (Optional[datetime]): Modification time, if known
+        
+    Returns:
+        Response: 304 Not Modified
+    """
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,153 @@
+import os
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    """
+    Read a boolean flag from the environment.
+
+    Args:
+        name (str): Environment variable name
+        default (bool): Value used when the variable is not set
+
+    Returns:
+        bool: True for "1", "true", "yes" or "on" (case insensitive)
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_int(name: str, default: int) -> int:
+    """
+    Read an integer setting from the environment.
+
+    Args:
+        name (str): Environment variable name
+        default (int): Value used when the variable is not set
+
+    Returns:
+        int: Parsed value
+    """
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+# Database access mode: "sync" (Session in a threadpool) or "async" (AsyncSession over aiosqlite)
+DB_MODE: str = os.getenv("BOOK_API_DB_MODE", "sync").strip().lower()
+
+if DB_MODE not in ("sync", "async"):
+    raise ValueError(f"BOOK_API_DB_MODE must be 'sync' or 'async', got '{DB_MODE}'")
+
+# Database location; the async engine derives its URL from this one
+DATABASE_URL: str = os.getenv("BOOK_API_DATABASE_URL", "sqlite:///./books.db")
+
+# SQLite engine profile: "tuned" (WAL + pragmas below) or "default" (driver defaults)
+SQLITE_PROFILE: str = os.getenv("BOOK_API_SQLITE_PROFILE", "tuned").strip().lower()
+SQLITE_SYNCHRONOUS: str = os.getenv("BOOK_API_SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE: int = env_int("BOOK_API_SQLITE_MMAP_SIZE", 256 * 1024 * 1024)
+SQLITE_CACHE_SIZE: int = env_int("BOOK_API_SQLITE_CACHE_SIZE", -64000)  # negative = KiB, i.e. 64 MiB
+SQLITE_BUSY_TIMEOUT: int = env_int("BOOK_API_SQLITE_BUSY_TIMEOUT", 5000)  # milliseconds
+
+# Connection pool (ignored for in-memory SQLite)
+DB_POOL_SIZE: int = env_int("BOOK_API_DB_POOL_SIZE", 10)
+DB_MAX_OVERFLOW: int = env_int("BOOK_API_DB_MAX_OVERFLOW", 20)
+DB_POOL_TIMEOUT: int = env_int("BOOK_API_DB_POOL_TIMEOUT", 30)
+
+# Serve GET endpoints from a separate read-only SQLite pool (query_only connections)
+READ_ONLY_POOL: bool = env_bool("BOOK_API_READ_ONLY_POOL", True)
+
+# Read replicas for GET endpoints: comma-separated URLs of databases the primary replicates to
+# (read-only SQLite copies work for local testing). Reads rotate over them; writes use DATABASE_URL.
+REPLICA_URLS: list = [url.strip() for url in os.getenv("BOOK_API_REPLICA_URLS", "").split(",") if url.strip()]
+
+# After a successful write, the client reads from the primary for this long (milliseconds, 0 = off)
+READ_YOUR_WRITES_MS: int = env_int("BOOK_API_READ_YOUR_WRITES_MS", 0)
+
+# Set by serve.py once it has created the schema, so workers skip create_all/migrations
+SKIP_SCHEMA_SETUP: bool = env_bool("BOOK_API_SKIP_SCHEMA_SETUP", False)
+
+# Group commit for POST /books/: concurrent creates share one transaction
+GROUP_COMMIT: bool = env_bool("BOOK_API_GROUP_COMMIT", False)
+GROUP_COMMIT_MAX_BATCH: int = env_int("BOOK_API_GROUP_COMMIT_MAX_BATCH", 256)
+GROUP_COMMIT_MAX_DELAY_MS: float = float(os.getenv("BOOK_API_GROUP_COMMIT_MAX_DELAY_MS", "2"))  # 0 = no waiting
+
+# Rows validated and inserted per transaction by POST /books/bulk
+BULK_CHUNK_SIZE: int = env_int("BOOK_API_BULK_CHUNK_SIZE", 1000)
+
+# Maximum number of per-row errors reported by POST /books/bulk
+BULK_MAX_ERRORS: int = env_int("BOOK_API_BULK_MAX_ERRORS", 1000)
+
+# Rows fetched per round trip by GET /books/export
+EXPORT_BATCH_SIZE: int = env_int("BOOK_API_EXPORT_BATCH_SIZE", 1000)
+
+# Read-through cache for GET /books/{id}: "memory", "redis" or "none".
+# "memory" is per process: with more than one worker serve.py turns the default off and refuses
+# an explicit BOOK_API_CACHE_BACKEND=memory.
+CACHE_BACKEND: str = os.getenv("BOOK_API_CACHE_BACKEND", "memory").strip().lower()
+CACHE_TTL: float = float(os.getenv("BOOK_API_CACHE_TTL", "60"))
+CACHE_MAXSIZE: int = env_int("BOOK_API_CACHE_MAXSIZE", 10000)
+CACHE_URL: str = os.getenv("BOOK_API_CACHE_URL", "redis://localhost:6379/0")
+
+# Token-bucket rate limiting per client and route (429 when a bucket is empty).
+# Rules: "route=rate:burst" per path template, "*" for every other route; see admission.parse_rules.
+# The "memory" backend is per process: serve.py refuses it with more than one worker.
+RATE_LIMIT_ENABLED: bool = env_bool("BOOK_API_RATE_LIMIT", False)
+RATE_LIMIT_BACKEND: str = os.getenv("BOOK_API_RATE_LIMIT_BACKEND", "memory").strip().lower()  # or "redis"
+RATE_LIMIT_URL: str = os.getenv("BOOK_API_RATE_LIMIT_URL", CACHE_URL)
+RATE_LIMIT_RULES: str = os.getenv("BOOK_API_RATE_LIMIT_RULES", "*=50:100,/books/search/=5:10")
+RATE_LIMIT_MAXSIZE: int = env_int("BOOK_API_RATE_LIMIT_MAXSIZE", 100000)  # buckets kept by the memory backend
+RATE_LIMIT_TRUST_FORWARDED: bool = env_bool("BOOK_API_RATE_LIMIT_TRUST_FORWARDED", False)  # behind a proxy only
+
+# Admission control: bound requests in flight, shed the rest with 503
+ADMISSION_ENABLED: bool = env_bool("BOOK_API_ADMISSION", False)
+ADMISSION_MAX_CONCURRENT: int = env_int("BOOK_API_ADMISSION_MAX_CONCURRENT", 32)  # below the 40 threadpool workers
+ADMISSION_MAX_QUEUE: int = env_int("BOOK_API_ADMISSION_MAX_QUEUE", 64)
+ADMISSION_QUEUE_TIMEOUT_MS: float = float(os.getenv("BOOK_API_ADMISSION_QUEUE_TIMEOUT_MS", "500"))
+ADMISSION_POOL_SATURATION: float = float(os.getenv("BOOK_API_ADMISSION_POOL_SATURATION", "1.0"))  # share of the pool
+# Extra "route=concurrent:queue" limits for expensive routes, applied before the global one
+ADMISSION_ROUTE_LIMITS: str = os.getenv("BOOK_API_ADMISSION_ROUTE_LIMITS", "/books/search/=4:8")
+
+# GET /healthz/ready answers 503 while the busiest connection pool is at least this full (share
+# of its capacity) or the event loop has recently woken up more than READY_LOOP_LAG_MS late
+READY_POOL_SATURATION: float = float(os.getenv("BOOK_API_READY_POOL_SATURATION", "0.9"))
+READY_LOOP_LAG_MS: float = float(os.getenv("BOOK_API_READY_LOOP_LAG_MS", "200"))
+
+# Change feed (GET /books/changes, /books/changes/stream): waiting clients re-check the log this
+# often (writes in this process wake them at once), idle streams send a keep-alive comment, and a
+# stream is closed after CHANGES_STREAM_MAX_MS so it cannot hold up a graceful shutdown
+# (EventSource reconnects with Last-Event-ID)
+CHANGES_POLL_MS: float = float(os.getenv("BOOK_API_CHANGES_POLL_MS", "500"))
+CHANGES_HEARTBEAT_MS: float = float(os.getenv("BOOK_API_CHANGES_HEARTBEAT_MS", "15000"))
+CHANGES_STREAM_MAX_MS: float = float(os.getenv("BOOK_API_CHANGES_STREAM_MAX_MS", "60000"))
+# On PostgreSQL entries get their seq in a short step after the write commits, so the feed never
+# skips a seq while writers commit in parallel. API writes request a step, which starts up to
+# CHANGES_SEQUENCE_DELAY_MS later so writes in between share it; feed reads run one at most once
+# per CHANGES_POLL_MS for writes made elsewhere. See benchmarks/change_log_lock.py.
+CHANGES_SEQUENCE_DELAY_MS: float = float(os.getenv("BOOK_API_CHANGES_SEQUENCE_DELAY_MS", "10"))  # 0 = no waiting
+
+# Bitmap of existing book IDs: GET/PUT/DELETE /books/{id} answer 404 for IDs known to be missing
+# without a query. Other processes' writes are picked up from the change log every ID_FILTER_SYNC_MS.
+ID_FILTER: bool = env_bool("BOOK_API_ID_FILTER", False)
+ID_FILTER_SYNC_MS: float = float(os.getenv("BOOK_API_ID_FILTER_SYNC_MS", "1000"))
+
+# Identical concurrent GET /books/ and /books/search/ requests share one query and one rendered body
+COALESCE_READS: bool = env_bool("BOOK_API_COALESCE_READS", False)
+
+# Serve list endpoints from plain rows rendered with orjson, skipping per-row pydantic validation
+FAST_JSON: bool = env_bool("BOOK_API_FAST_JSON", False)
+
+# Request/query instrumentation and the /metrics endpoint
+METRICS_ENABLED: bool = env_bool("BOOK_API_METRICS", True)
+
+# Statements slower than this (milliseconds) are logged with their SQL
+SLOW_QUERY_MS: float = float(os.getenv("BOOK_API_SLOW_QUERY_MS", "100"))
+
+# Response compression (gzip always; br and zstd when brotli/zstandard are installed)
+COMPRESSION_ENABLED: bool = env_bool("BOOK_API_COMPRESSION", True)
+COMPRESSION_ENCODINGS: list = [
+    name.strip().lower() for name in os.getenv("BOOK_API_COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",")
+    if name.strip()
+]  # server preference order when the client accepts several equally
+COMPRESSION_MIN_SIZE: int = env_int("BOOK_API_COMPRESSION_MIN_SIZE", 1024)  # bytes; smaller bodies are sent as is
+COMPRESSION_CHUNK_SIZE: int = env_int("BOOK_API_COMPRESSION_CHUNK_SIZE", 16384)  # one HTTP/2 DATA frame by default
@@ -1,8 +1,29 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from models import Book
-from schemas import BookCreate, BookUpdate
-from typing import List, Optional
+from sqlalchemy import Row, Select, and_, delete, false, func, insert, literal_column, or_, select, tuple_, update
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.util import await_only
+from models import Book, BookChange, books_fts, utcnow
+from schemas import BookBulkUpdate, BookCreate, BookUpdate
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Columns selected when plain rows are wanted instead of ORM objects
+BOOK_COLUMNS: tuple = (Book.id, Book.title, Book.author, Book.year)
+
+# Row columns for list pages: BOOK_COLUMNS plus the validators used for ETags
+PAGE_COLUMNS: tuple = BOOK_COLUMNS + (Book.version, Book.updated_at)
+
+# Columns loaded by _copy_books, in record order
+COPY_COLUMNS: Tuple[str, ...] = ("title", "author", "year", "version", "updated_at")
+
+# ORDER BY keys of each sort option. Every key ends with the primary key so
+# the order is total, and matches an index (see models.Book) so SQLite walks
+# the index instead of sorting the result in a temporary B-tree.
+SORT_KEYS: Dict[str, tuple] = {
+    "id": (Book.id,),
+    "title": (Book.title, Book.id),
+    "author": (Book.author, Book.year, Book.id),
+    "year": (Book.year, Book.id),
+}
 
 
 def create_book(db: Session, book: BookCreate) -> Book:
@@ -27,6 +48,91 @@ def create_book(db: Session, book: BookCreate) -> Book:
     return db_book
 
 
+def create_books_bulk(db: Session, books: List[BookCreate]) -> int:
+    """
+    Insert a chunk of already validated books in one transaction.
+    
+    Uses COPY on PostgreSQL (see _copy_books) and a single executemany
+    INSERT elsewhere, instead of one add/commit/refresh round trip per book.
+    
+    Args:
+        db (Session): Database session
+        books (List[BookCreate]): Validated book data
+        
+    Returns:
+        int: Number of inserted books
+    """
+    if not books:
+        return 0
+    if _copy_books(db, books):
+        db.commit()
+        return len(books)
+    rows: List[dict] = [
+        {"title": book.title, "author": book.author, "year": book.year}
+        for book in books
+    ]
+    db.execute(insert(Book.__table__), rows)
+    db.commit()
+    return len(rows)
+
+
+def _copy_books(db: Session, books: List[BookCreate]) -> bool:
+    """
+    Load books with PostgreSQL's ``COPY ... FROM STDIN`` when the driver supports it.
+    
+    COPY streams the rows in one command instead of binding an INSERT per
+    row. It bypasses SQLAlchemy's column defaults, so version and
+    updated_at are sent explicitly.
+    
+    Args:
+        db (Session): Database session (sync, or the sync view of an AsyncSession)
+        books (List[BookCreate]): Validated book data
+        
+    Returns:
+        bool: True if the rows were copied, False if the caller should INSERT them
+    """
+    dialect = db.get_bind().dialect
+    if dialect.name != "postgresql" or dialect.driver not in ("psycopg", "asyncpg"):
+        return False
+    now = utcnow()
+    records: List[tuple] = [(book.title, book.author, book.year, 1, now) for book in books]
+    driver_connection = db.connection().connection.driver_connection
+    if dialect.driver == "asyncpg":
+        # Runs inside AsyncSession.run_sync, so the coroutine can be awaited in place
+        await_only(driver_connection.copy_records_to_table("books", records=records, columns=COPY_COLUMNS))
+    else:
+        with driver_connection.cursor() as cursor:
+            with cursor.copy(f"COPY books ({', '.join(COPY_COLUMNS)}) FROM STDIN") as copy:
+                for record in records:
+                    copy.write_row(record)
+    return True
+
+
+def create_books_returning(db: Session, books: List[BookCreate]) -> List[Row]:
+    """
+    Insert several books in one transaction and return their rows in input order.
+    
+    Used by the group-commit writer: one commit (one fsync) covers every
+    book of the batch, and each caller still gets its own ID back.
+    
+    Args:
+        db (Session): Database session
+        books (List[BookCreate]): Validated book data
+        
+    Returns:
+        List[Row]: Inserted PAGE_COLUMNS rows, one per book, same order
+    """
+    if not books:
+        return []
+    stmt = insert(Book).returning(*PAGE_COLUMNS, sort_by_parameter_order=True)
+    rows: List[Row] = list(db.execute(stmt, [
+        {"title": book.title, "author": book.author, "year": book.year}
+        for book in books
+    ]))
+    db.commit()
+    return rows
+
+
 def get_book(db: Session, book_id: int) -> Optional[Book]:
     """
     Get a book by its ID.
@@ -41,7 +147,146 @@ def get_book(db: Session, book_id: int) -> Optional[Book]:
     return db.query(Book).filter(Book.id == book_id).first()
 
 
-def get_all_books(db: Session, skip: int = 0, limit: int = 100) -> List[Book]:
+def resolve_sort(
+    mode: str = "like",
+    sort: Optional[str] = None,
+    title: Optional[str] = None,
+    author: Optional[str] = None
+) -> str:
+    """
+    Get the sort option a listing or search actually uses.
+    
+    Ranked full-text searches default to "rank"; everything else to "id".
+    
+    Args:
+        mode (str): Search mode; plain listings use "like"
+        sort (Optional[str]): Requested sort option, if any
+        title (Optional[str]): Title search words
+        author (Optional[str]): Author search words
+        
+    Returns:
+        str: "rank" or a key of SORT_KEYS
+        
+    Raises:
+        ValueError: If "rank" is requested without a full-text query
+    """
+    ranked: bool = mode == "fts" and bool(build_fts_query(title, author))
+    if sort is None:
+        return "rank" if ranked else "id"
+    if sort == "rank" and not ranked:
+        raise ValueError("sort=rank requires mode=fts and title or author words")
+    return sort
+
+
+def cursor_fields(sort: str = "id") -> Tuple[str, ...]:
+    """
+    Get the row attributes that form the keyset (cursor) of a listing.
+    
+    Args:
+        sort (str): Sort option, see resolve_sort
+        
+    Returns:
+        Tuple[str, ...]: Attribute names in ORDER BY order, ending with "id"
+    """
+    if sort == "rank":
+        return ("rank", "id")
+    return tuple(col.key for col in SORT_KEYS[sort])
+
+
+def cursor_types(sort: str = "id") -> Tuple[Tuple[type, bool], ...]:
+    """
+    Get the type of each keyset value of a listing, to validate client cursors.
+    
+    Args:
+        sort (str): Sort option, see resolve_sort
+        
+    Returns:
+        Tuple[Tuple[type, bool], ...]: (Python type, nullable) in cursor_fields order
+    """
+    if sort == "rank":
+        return ((float, False), (int, False))
+    return tuple((col.type.python_type, bool(col.nullable)) for col in SORT_KEYS[sort])
+
+
+def _order_by(columns: Sequence[Any], order: str) -> list:
+    """
+    Build ORDER BY clauses with one direction for every column.
+    
+    A single direction keeps the order walkable by one index scan
+    (forwards or backwards). Nullable keys state SQLite's NULL order
+    (first ascending, last descending) explicitly, so PostgreSQL, which
+    defaults to the opposite, pages through NULL years the same way.
+    
+    Args:
+        columns (Sequence[Any]): Sort key columns
+        order (str): "asc" or "desc"
+        
+    Returns:
+        list: Clauses for order_by()
+    """
+    clauses: list = []
+    for col in columns:
+        clause = col.desc() if order == "desc" else col.asc()
+        if getattr(col, "nullable", False):
+            clause = clause.nulls_last() if order == "desc" else clause.nulls_first()
+        clauses.append(clause)
+    return clauses
+
+
+def _keyset_filter(columns: Sequence[Any], values: Sequence[Any], order: str) -> ColumnElement:
+    """
+    Build the condition selecting rows that come after a cursor.
+    
+    Expands ``(a, b, id) > (x, y, z)`` into ``a > x OR (a = x AND b > y)
+    OR ...`` so that NULL keys (``year``) work: they sort before every
+    value in ascending order and after every value in descending order
+    (see _order_by). A redundant bound on the leading column lets SQLite seek into
+    the index instead of scanning it from the start; descending pages of a
+    nullable leading key (``year``) cannot have one, because the NULLs that
+    still follow are stored at the other end of the index.
+    
+    Args:
+        columns (Sequence[Any]): Sort key columns
+        values (Sequence[Any]): Key of the last row of the previous page
+        order (str): "asc" or "desc"
+        
+    Returns:
+        ColumnElement: WHERE condition
+    """
+    descending: bool = order == "desc"
+    
+    def after(col: Any, value: Any) -> ColumnElement:
+        if value is None:
+            return false() if descending else col.is_not(None)
+        condition = col < value if descending else col > value
+        if descending and col.nullable:
+            condition = or_(condition, col.is_(None))
+        return condition
+    
+    def equal(col: Any, value: Any) -> ColumnElement:
+        return col.is_(None) if value is None else col == value
+    
+    branches: list = [
+        and_(*(equal(c, v) for c, v in zip(columns[:i], values[:i])), after(columns[i], values[i]))
+        for i in range(len(columns))
+    ]
+    condition = or_(*branches) if len(branches) > 1 else branches[0]
+    
+    lead, lead_value = columns[0], values[0]
+    if len(columns) > 1 and lead_value is not None and not (descending and lead.nullable):
+        condition = and_(lead <= lead_value if descending else lead >= lead_value, condition)
+    return condition
+
+
+def get_all_books(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[List[Any]] = None,
+    as_rows: bool = False,
+    sort: str = "id",
+    order: str = "asc"
+) -> List[Book]:
     """
     Get all books with pagination.
     
@@ -49,47 +294,209 @@ def get_all_books(db: Session, skip: int = 0, limit: int = 100) -> List[Book]:
         db (Session): Database session
         skip (int): Number of records to skip (default 0)
         limit (int): Maximum number of records to return (default 100)
+        after (Optional[List[Any]]): Keyset of the last row of the previous
+            page (see cursor_fields); when given, ``skip`` is ignored
+        as_rows (bool): Return PAGE_COLUMNS rows instead of ORM objects,
+            skipping identity-map bookkeeping
+        sort (str): Key of SORT_KEYS (default "id")
+        order (str): "asc" (default) or "desc"
         
     Returns:
-        List[Book]: List of book objects
+        List[Book]: List of book objects (or rows) in the requested order
     """
-    return db.query(Book).offset(skip).limit(limit).all()
+    columns: tuple = SORT_KEYS[sort]
+    query = (db.query(*PAGE_COLUMNS) if as_rows else db.query(Book)).order_by(*_order_by(columns, order))
+    if after is not None:
+        return query.filter(_keyset_filter(columns, after, order)).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
 
 
-def update_book(db: Session, book_id: int, book_update: BookUpdate) -> Optional[Book]:
+def export_books_query(batch_size: int = 1000) -> Select:
     """
-    Update a book's information.
+    Build the statement used to stream the whole catalog.
+    
+    Selects plain column tuples (no ORM objects) in ID order and asks the
+    driver to fetch ``batch_size`` rows at a time instead of buffering all.
+    
+    Args:
+        batch_size (int): Rows fetched per round trip
+        
+    Returns:
+        Select: Statement returning (id, title, author, year) rows
+    """
+    return (
+        select(*BOOK_COLUMNS)
+        .order_by(Book.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+
+def iter_book_batches(db: Session, batch_size: int = 1000) -> Iterator[Sequence[Any]]:
+    """
+    Iterate over every book in batches without loading the table into memory.
     
     Args:
         db (Session): Database session
-        book_id (int): ID of the book to update
-        book_update (BookUpdate): Updated book data
+        batch_size (int): Rows per batch
+        
+    Yields:
+        Sequence[Any]: Batch of (id, title, author, year) rows
+    """
+    result = db.execute(export_books_query(batch_size))
+    yield from result.partitions()
+
+
+def get_changes(db: Session, since: int = 0, limit: int = 100) -> List[Row]:
+    """
+    Get change-log entries after ``since``, oldest first, with each book's current state.
+    
+    The book columns come from a LEFT JOIN, so they are None for deleted
+    books and may already reflect later changes; consumers applying the
+    entries in order end up with the current catalog either way.
+    
+    Entries commit in ``seq`` order (see migrations._add_change_log and,
+    on PostgreSQL, sequence_changes), so a reader advancing ``since``
+    never skips one.
+    
+    Args:
+        db (Session): Database session
+        since (int): Last ``seq`` the caller has seen (0 for the whole log)
+        limit (int): Maximum number of entries
+        
+    Returns:
+        List[Row]: Rows of (seq, op, book_id, changed_at, title, author, year, version)
+    """
+    return (
+        db.query(
+            BookChange.seq, BookChange.op, BookChange.book_id, BookChange.changed_at,
+            Book.title, Book.author, Book.year, Book.version,
+        )
+        .outerjoin(Book, Book.id == BookChange.book_id)
+        .filter(BookChange.seq > since)
+        .order_by(BookChange.seq)
+        .limit(limit)
+        .all()
+    )
+
+
+def sequence_changes(db: Session, wait: bool = True) -> int:
+    """
+    Number the change-log entries of committed transactions (PostgreSQL).
+    
+    PostgreSQL triggers queue entries without a seq so concurrent writers
+    do not serialize; this moves the committed ones into the log in one
+    short transaction (see migrations._sequence_change_log). SQLite's
+    single writer numbers entries as they are written, so it does nothing.
+    
+    Args:
+        db (Session): Session on the primary (writable) database
+        wait (bool): Wait for a concurrent sequencing step instead of skipping
         
     Returns:
-        Optional[Book]: Updated book object if found, None otherwise
+        int: Number of entries added to the log
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return 0
+    moved: int = db.execute(select(func.book_changes_sequence(wait))).scalar_one()
+    db.commit()
+    return moved
+
+
+def get_book_ids(db: Session) -> Tuple[int, List[int]]:
+    """
+    Get every book ID and the change-log position they reflect.
+
+    The position is read first, so replaying the log after it (get_changes)
+    covers every write the ID list may have missed.
+
+    Args:
+        db (Session): Database session
+
+    Returns:
+        Tuple[int, List[int]]: Newest ``seq`` and the IDs in ascending order
     """
-    db_book: Optional[Book] = get_book(db, book_id)
-    if not db_book:
-        return None
+    last_seq: int = db.query(func.coalesce(func.max(BookChange.seq), 0)).scalar()
+    ids: List[int] = list(db.execute(select(Book.id).order_by(Book.id)).scalars())
+    return last_seq, ids
+
+
+def _update_values(book_update: BookUpdate) -> dict:
+    """
+    Build the SET clause of an update from the fields the client sent.
     
-    update_data: dict = book_update.model_dump(exclude_unset=True)
+    Fields explicitly sent as null (e.g. ``"year": null``) are cleared; the
+    row version and updated_at are always bumped for ETag/Last-Modified.
     
-    # If year is explicitly passed as null (None), remove the year
-    if 'year' in update_data and update_data['year'] is None:
-        db_book.year = None
-        del update_data['year']
+    Args:
+        book_update (BookUpdate): Updated book data (an ``id`` field, as in
+            BookBulkUpdate, is ignored)
+        
+    Returns:
+        dict: Column values for UPDATE ... SET
+    """
+    values: dict = book_update.model_dump(exclude_unset=True, exclude={"id"})
+    values["version"] = Book.version + 1
+    values["updated_at"] = utcnow()
+    return values
+
+
+def update_book(db: Session, book_id: int, book_update: BookUpdate) -> Optional[Row]:
+    """
+    Update a book's information.
     
-    for field, value in update_data.items():
-        setattr(db_book, field, value)
+    Runs a single ``UPDATE ... RETURNING`` instead of SELECT, modify and
+    refresh, so the write is one round trip and no ORM object is loaded.
     
+    Args:
+        db (Session): Database session
+        book_id (int): ID of the book to update
+        book_update (BookUpdate): Updated book data
+        
+    Returns:
+        Optional[Row]: Updated PAGE_COLUMNS row if found, None otherwise
+    """
+    stmt = (
+        update(Book)
+        .where(Book.id == book_id)
+        .values(**_update_values(book_update))
+        .returning(*PAGE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    row: Optional[Row] = db.execute(stmt).first()
     db.commit()
-    db.refresh(db_book)
-    return db_book
+    return row
+
+
+def update_books_bulk(db: Session, updates: List[BookBulkUpdate]) -> List[Row]:
+    """
+    Apply several partial updates in one transaction.
+    
+    Args:
+        db (Session): Database session
+        updates (List[BookBulkUpdate]): Book ID plus fields to change, per book
+        
+    Returns:
+        List[Row]: Updated PAGE_COLUMNS rows; IDs that do not exist are absent
+    """
+    rows: List[Row] = []
+    for book_update in updates:
+        stmt = (
+            update(Book)
+            .where(Book.id == book_update.id)
+            .values(**_update_values(book_update))
+            .returning(*PAGE_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        row: Optional[Row] = db.execute(stmt).first()
+        if row is not None:
+            rows.append(row)
+    db.commit()
+    return rows
 
 
 def delete_book(db: Session, book_id: int) -> bool:
     """
-    Delete a book by ID.
+    Delete a book by ID with a single ``DELETE ... RETURNING``.
     
     Args:
         db (Session): Database session
@@ -98,13 +505,39 @@ def delete_book(db: Session, book_id: int) -> bool:
     Returns:
         bool: True if deleted, False if not found
     """
-    db_book: Optional[Book] = get_book(db, book_id)
-    if not db_book:
-        return False
+    stmt = (
+        delete(Book)
+        .where(Book.id == book_id)
+        .returning(Book.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted: Optional[int] = db.scalars(stmt).first()
+    db.commit()
+    return deleted is not None
+
+
+def delete_books(db: Session, book_ids: List[int]) -> List[int]:
+    """
+    Delete several books in one statement.
     
-    db.delete(db_book)
+    Args:
+        db (Session): Database session
+        book_ids (List[int]): IDs of the books to delete
+        
+    Returns:
+        List[int]: IDs that existed and were deleted
+    """
+    if not book_ids:
+        return []
+    stmt = (
+        delete(Book)
+        .where(Book.id.in_(book_ids))
+        .returning(Book.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted: List[int] = list(db.scalars(stmt))
     db.commit()
-    return True
+    return deleted
 
 
 def search_books(
@@ -113,7 +546,12 @@ def search_books(
     author: Optional[str] = None,
     year: Optional[int] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    mode: str = "like",
+    after: Optional[List[Any]] = None,
+    as_rows: bool = False,
+    sort: Optional[str] = None,
+    order: str = "asc"
 ) -> List[Book]:
     """
     Search books by various criteria.
@@ -125,11 +563,31 @@ def search_books(
         year (Optional[int]): Publication year to search for
         skip (int): Number of records to skip (default 0)
         limit (int): Maximum number of records to return (default 100)
+        mode (str): "like" for substring matching, "fts" for ranked
+            word-prefix matching through the FTS5 index
+        after (Optional[List[Any]]): Keyset of the last row of the previous
+            page (see cursor_fields); when given, ``skip`` is ignored
+        as_rows (bool): Return PAGE_COLUMNS rows instead of ORM objects
+        sort (Optional[str]): Sort option (see resolve_sort); defaults to
+            "rank" for full-text searches and "id" otherwise
+        order (str): "asc" (default) or "desc"
         
     Returns:
-        List[Book]: List of book objects matching the criteria
+        List[Book]: List of book objects (or rows) matching the criteria
+        
+    Raises:
+        ValueError: If sort is "rank" but the search is not full-text, or
+            mode is "fts" on a database without the FTS5 index
     """
-    query = db.query(Book)
+    sort = resolve_sort(mode, sort, title, author)
+    if mode == "fts" and (title or author):
+        _require_fts(db)
+        return _search_books_fts(
+            db, title=title, author=author, year=year, skip=skip, limit=limit, after=after, as_rows=as_rows,
+            sort=sort, order=order
+        )
+    
+    query = db.query(*PAGE_COLUMNS) if as_rows else db.query(Book)
     
     # Add search conditions if parameters are provided
     filters: list = []
@@ -140,8 +598,194 @@ def search_books(
     if year:
         filters.append(Book.year == year)
     
+    columns: tuple = SORT_KEYS[sort]
+    if after is not None:
+        filters.append(_keyset_filter(columns, after, order))
+    
     # Apply filters (logical AND)
     if filters:
         query = query.filter(and_(*filters))
     
-    return query.offset(skip).limit(limit).all()
\ No newline at end of file
+    query = query.order_by(*_order_by(columns, order))
+    if after is not None:
+        return query.limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+
+def build_fts_query(title: Optional[str] = None, author: Optional[str] = None) -> str:
+    """
+    Build an FTS5 MATCH expression from free-text title/author input.
+    
+    Every word becomes a quoted prefix term restricted to its column,
+    so user input cannot inject FTS5 operators.
+    
+    Args:
+        title (Optional[str]): Words to look for in the title
+        author (Optional[str]): Words to look for in the author
+        
+    Returns:
+        str: MATCH expression, e.g. 'title : "war"* AND author : "tol"*'
+    """
+    terms: List[str] = []
+    for column_name, value in (("title", title), ("author", author)):
+        for word in (value or "").split():
+            escaped: str = word.replace('"', '""')
+            terms.append(f'{column_name} : "{escaped}"*')
+    return " AND ".join(terms)
+
+
+def _require_fts(db: Session) -> None:
+    """
+    Check that the database has the FTS5 index (SQLite only, see migrations).
+    
+    Args:
+        db (Session): Database session
+        
+    Raises:
+        ValueError: On other backends; substring search (mode=like) works everywhere
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        raise ValueError("mode=fts requires the SQLite FTS5 index; use mode=like on this database")
+
+
+def _search_books_fts(
+    db: Session,
+    title: Optional[str],
+    author: Optional[str],
+    year: Optional[int],
+    skip: int,
+    limit: int,
+    after: Optional[List[Any]] = None,
+    as_rows: bool = False,
+    sort: str = "rank",
+    order: str = "asc"
+) -> List[Book]:
+    """
+    Search books through the FTS5 index, best matches first by default.
+    
+    Args:
+        db (Session): Database session
+        title (Optional[str]): Title words (prefix match)
+        author (Optional[str]): Author words (prefix match)
+        year (Optional[int]): Publication year to filter on
+        skip (int): Number of records to skip
+        limit (int): Maximum number of records to return
+        after (Optional[List[Any]]): Keyset of the last row of the previous
+            page, (rank, id) when sorting by rank
+        as_rows (bool): Return PAGE_COLUMNS + rank rows instead of ORM objects
+        sort (str): "rank" (bm25 score) or a key of SORT_KEYS
+        order (str): "asc" (default) or "desc"
+        
+    Returns:
+        List[Book]: Matching books in the requested order; each carries its
+        score in a ``rank`` attribute for cursor building
+    """
+    match: str = build_fts_query(title, author)
+    if not match:
+        return []
+    
+    entities: tuple = (*PAGE_COLUMNS, books_fts.c.rank) if as_rows else (Book, books_fts.c.rank)
+    query = (
+        db.query(*entities)
+        .join(books_fts, books_fts.c.rowid == Book.id)
+        .filter(literal_column("books_fts").op("MATCH")(match))
+    )
+    if year:
+        query = query.filter(Book.year == year)
+    
+    if sort == "rank":
+        query = query.order_by(*_order_by((books_fts.c.rank, Book.id), order))
+        if after is not None:
+            keyset, cursor = tuple_(books_fts.c.rank, Book.id), tuple_(*after)
+            query = query.filter(keyset < cursor if order == "desc" else keyset > cursor)
+    else:
+        query = query.order_by(*_order_by(SORT_KEYS[sort], order))
+        if after is not None:
+            query = query.filter(_keyset_filter(SORT_KEYS[sort], after, order))
+    if after is None:
+        query = query.offset(skip)
+    
+    if as_rows:
+        return query.limit(limit).all()
+    
+    books: List[Book] = []
+    for book, rank in query.limit(limit).all():
+        book.rank = rank
+        books.append(book)
+    return books
+
+
+def book_stats(
+    db: Session,
+    title: Optional[str] = None,
+    author: Optional[str] = None,
+    year: Optional[int] = None,
+    mode: str = "like",
+    top_authors: int = 20,
+    year_bucket: int = 1
+) -> dict:
+    """
+    Aggregate the books matching search_books-style filters.
+    
+    Runs three GROUP BY/aggregate statements instead of loading rows; the
+    author and year groupings read only the (author, year, id) and
+    (year, id) indexes.
+    
+    Args:
+        db (Session): Database session
+        title (Optional[str]): Title filter, as in search_books
+        author (Optional[str]): Author filter, as in search_books
+        year (Optional[int]): Publication year filter
+        mode (str): "like" or "fts", as in search_books
+        top_authors (int): Number of authors in the author facet
+        year_bucket (int): Width of the year histogram buckets in years
+        
+    Returns:
+        dict: Fields of schemas.BookStatsResponse
+        
+    Raises:
+        ValueError: If mode is "fts" on a database without the FTS5 index
+    """
+    filters: list = []
+    fts: bool = mode == "fts" and bool(title or author)
+    if fts:
+        _require_fts(db)
+        match: str = build_fts_query(title, author)
+        filters.append(literal_column("books_fts").op("MATCH")(match) if match else false())
+    else:
+        if title:
+            filters.append(Book.title.ilike(f"%{title}%"))
+        if author:
+            filters.append(Book.author.ilike(f"%{author}%"))
+    if year:
+        filters.append(Book.year == year)
+    
+    def filtered(stmt: Select) -> Select:
+        stmt = stmt.select_from(Book)
+        if fts:
+            stmt = stmt.join(books_fts, books_fts.c.rowid == Book.id)
+        return stmt.where(*filters)
+    
+    total, with_year, min_year, max_year = db.execute(filtered(select(
+        func.count(), func.count(Book.year), func.min(Book.year), func.max(Book.year)
+    ))).one()
+    
+    count = func.count().label("count")
+    authors = db.execute(
+        filtered(select(Book.author, count))
+        .group_by(Book.author)
+        .order_by(count.desc(), Book.author)
+        .limit(top_authors)
+    ).all()
+    
+    bucket = (Book.year if year_bucket == 1 else Book.year // year_bucket * year_bucket).label("year")
+    years = db.execute(filtered(select(bucket, count)).group_by(bucket).order_by(bucket)).all()
+    
+    return {
+        "total": total,
+        "with_year": with_year,
+        "min_year": min_year,
+        "max_year": max_year,
+        "authors": [{"author": name, "count": n} for name, n in authors],
+        "years": [{"year": start, "count": n} for start, n in years],
+    }
@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Sequence, Union
+
+import async_crud
+import crud
+from config import DB_MODE, EXPORT_BATCH_SIZE
+
+EXPORT_COLUMNS: tuple = ("id", "title", "author", "year")
+
+MEDIA_TYPES: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def encode_batch(rows: Sequence[Any], fmt: str) -> bytes:
+    """
+    Serialize a batch of (id, title, author, year) rows.
+    
+    Args:
+        rows (Sequence[Any]): Rows to serialize
+        fmt (str): "ndjson" or "csv"
+        
+    Returns:
+        bytes: Encoded rows, each terminated by a newline
+    """
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue().encode()
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n" for row in rows
+    ).encode()
+
+
+def _header(fmt: str) -> bytes:
+    """
+    Get the bytes sent before the first row.
+    
+    Args:
+        fmt (str): "ndjson" or "csv"
+        
+    Returns:
+        bytes: CSV header line, or nothing for NDJSON
+    """
+    return (",".join(EXPORT_COLUMNS) + "\n").encode() if fmt == "csv" else b""
+
+
+def _stream_sync(fmt: str, session_factory: Callable) -> Iterator[bytes]:
+    """
+    Stream the catalog from a dedicated sync session (runs in the threadpool).
+    
+    Args:
+        fmt (str): "ndjson" or "csv"
+        session_factory (Callable): sessionmaker of a read pool
+        
+    Yields:
+        bytes: Encoded chunks
+    """
+    yield _header(fmt)
+    db = session_factory()
+    try:
+        for batch in crud.iter_book_batches(db, EXPORT_BATCH_SIZE):
+            yield encode_batch(batch, fmt)
+    finally:
+        db.close()
+
+
+async def _stream_async(fmt: str, session_factory: Callable) -> AsyncIterator[bytes]:
+    """
+    Stream the catalog from a dedicated async session.
+    
+    Args:
+        fmt (str): "ndjson" or "csv"
+        session_factory (Callable): async_sessionmaker of a read pool
+        
+    Yields:
+        bytes: Encoded chunks
+    """
+    yield _header(fmt)
+    async with session_factory() as db:
+        async for batch in async_crud.iter_book_batches(db, EXPORT_BATCH_SIZE):
+            yield encode_batch(batch, fmt)
+
+
+def stream_catalog(fmt: str, session_factory: Callable) -> Union[Iterator[bytes], AsyncIterator[bytes]]:
+    """
+    Get a body iterator for StreamingResponse that exports every book.
+    
+    The export owns its session because it outlives the request handler.
+    
+    Args:
+        fmt (str): "ndjson" or "csv"
+        session_factory (Callable): Read pool to export from (see database.read_router);
+            async_sessionmaker in async mode, sessionmaker otherwise
+        
+    Returns:
+        Union[Iterator[bytes], AsyncIterator[bytes]]: Encoded chunks
+    """
+    return _stream_async(fmt, session_factory) if DB_MODE == "async" else _stream_sync(fmt, session_factory)
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Row
+
+import async_crud
+import crud
+from config import DB_MODE, GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_MAX_DELAY_MS
+from database import AsyncSessionLocal, SessionLocal
+from id_filter import book_id_filter
+from schemas import BookCreate
+
+logger = logging.getLogger("book_api.group_commit")
+
+
+class GroupCommitWriter:
+    """
+    Write-behind queue that commits concurrent book creations together.
+
+    Callers put their book on an asyncio queue and await a future. A single
+    writer task takes everything queued (waiting up to ``max_delay`` for
+    more, at most ``max_batch`` rows), inserts it in one transaction and
+    resolves each future with the caller's row. SQLite then pays one lock
+    acquisition and one fsync per batch instead of per book. Futures
+    resolve only after the commit, so callers can read their writes.
+
+    Attributes:
+        max_batch (int): Maximum books per transaction
+        max_delay (float): Seconds to wait for more books after the first
+        batches (int): Transactions committed
+        rows (int): Books inserted
+        largest_batch (int): Size of the largest batch so far
+    """
+
+    def __init__(self, max_batch: int = 256, max_delay: float = 0.002) -> None:
+        self.max_batch: int = max_batch
+        self.max_delay: float = max_delay
+        self.batches: int = 0
+        self.rows: int = 0
+        self.largest_batch: int = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, book: BookCreate) -> Row:
+        """
+        Queue a book and wait until its batch is committed.
+
+        Args:
+            book (BookCreate): Validated book data
+
+        Returns:
+            Row: Inserted PAGE_COLUMNS row
+
+        Raises:
+            Exception: Whatever inserting this book on its own raised
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            # Started lazily, and again if the application moved to a new event loop
+            self._queue, self._loop = asyncio.Queue(), loop
+            self._task = loop.create_task(self._run())
+        future: asyncio.Future = loop.create_future()
+        self._queue.put_nowait((book, future))
+        return await future
+
+    async def close(self) -> None:
+        """Commit everything still queued and stop the writer task."""
+        if self._task is None or self._task.done():
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get batching counters.
+
+        Returns:
+            Dict[str, Any]: Batches, rows, average and largest batch size, queue length
+        """
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "average_batch": round(self.rows / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def _run(self) -> None:
+        """Collect batches from the queue and flush them, forever."""
+        queue: asyncio.Queue = self._queue
+        while True:
+            batch: List[Tuple[BookCreate, asyncio.Future]] = [await queue.get()]
+            if self.max_delay > 0 and queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.max_delay)
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._flush(batch)
+            except Exception:  # never let the writer die; callers get errors via their futures
+                logger.exception("Group commit flush failed")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _flush(self, batch: List[Tuple[BookCreate, asyncio.Future]]) -> None:
+        """
+        Insert one batch and resolve its futures.
+
+        If the batch transaction fails, every book is retried in its own
+        transaction so one bad row only fails its own caller.
+
+        Args:
+            batch (List[Tuple[BookCreate, asyncio.Future]]): Queued books and their futures
+        """
+        try:
+            rows: List[Row] = await self._insert([book for book, _ in batch])
+        except Exception:
+            logger.warning("Batch of %d books failed; retrying one by one", len(batch), exc_info=True)
+            for book, future in batch:
+                try:
+                    row: Row = (await self._insert([book]))[0]
+                except Exception as exc:
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    book_id_filter.add(row.id)
+                    self.batches += 1
+                    self.rows += 1
+                    if not future.done():
+                        future.set_result(row)
+        else:
+            self.batches += 1
+            self.rows += len(rows)
+            self.largest_batch = max(self.largest_batch, len(rows))
+            for (_, future), row in zip(batch, rows):
+                book_id_filter.add(row.id)
+                if not future.done():  # the caller may have gone away
+                    future.set_result(row)
+        await async_crud.after_write()
+
+    @staticmethod
+    async def _insert(books: List[BookCreate]) -> List[Row]:
+        """
+        Run crud.create_books_returning on a session owned by the writer.
+
+        Args:
+            books (List[BookCreate]): Books of one transaction
+
+        Returns:
+            List[Row]: Inserted rows in input order
+        """
+        if DB_MODE == "async":
+            async with AsyncSessionLocal() as db:
+                return await async_crud.run(db, crud.create_books_returning, books)
+        db = SessionLocal()
+        try:
+            return await async_crud.run(db, crud.create_books_returning, books)
+        finally:
+            db.close()
+
+
+# Shared by every POST /books/ request of this process when BOOK_API_GROUP_COMMIT is on
+group_writer: GroupCommitWriter = GroupCommitWriter(GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_MAX_DELAY_MS / 1000)
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+# How often the loop monitor wakes up, and how many samples the reported maximum covers
+LOOP_LAG_INTERVAL: float = 0.1
+LOOP_LAG_SAMPLES: int = 50
+
+
+class LoopLagMonitor:
+    """
+    Measure event-loop lag: how late a periodic sleep wakes up.
+
+    A blocked loop (CPU-bound work, synchronous I/O) delays every request
+    on this process, so a large lag means the instance should stop
+    receiving traffic even though the database looks healthy.
+
+    Attributes:
+        limit_ms (float): Lag at which the loop counts as not keeping up
+        samples (Deque[float]): Recent lag measurements in milliseconds
+    """
+
+    def __init__(self, limit_ms: float, interval: float = LOOP_LAG_INTERVAL, window: int = LOOP_LAG_SAMPLES) -> None:
+        self.limit_ms: float = limit_ms
+        self.interval: float = interval
+        self.samples: Deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start sampling on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def check(self) -> Dict[str, Any]:
+        """
+        Report the largest recent lag.
+
+        Returns:
+            Dict[str, Any]: ``ok`` flag and the maximum lag over the sample window
+        """
+        lag: float = max(self.samples, default=0.0)
+        return {"ok": lag < self.limit_ms, "max_lag_ms": round(lag, 2)}
+
+    async def _run(self) -> None:
+        """Sleep for ``interval`` forever and record how late each wake-up was."""
+        while True:
+            start: float = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            late: float = (time.perf_counter() - start - self.interval) * 1000
+            self.samples.append(max(late, 0.0))
+
+
+def check_pool(saturation: float, limit: float) -> Dict[str, Any]:
+    """
+    Judge the checked-out share of the busiest connection pool.
+
+    Args:
+        saturation (float): database.pool_saturation()
+        limit (float): Share at which new requests would start to wait for a connection
+
+    Returns:
+        Dict[str, Any]: ``ok`` flag and the saturation
+    """
+    return {"ok": saturation < limit, "saturation": round(saturation, 3)}
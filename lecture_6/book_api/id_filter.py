@@ -0,0 +1,230 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import Row
+
+import crud
+from changes import read_changes
+from database import run_read
+
+logger = logging.getLogger("book_api.id_filter")
+
+# Change-log entries read per query while syncing
+SYNC_BATCH_SIZE: int = 5000
+
+
+class BookIdFilter:
+    """
+    In-memory set of existing book IDs, so lookups of missing IDs skip the database.
+
+    IDs are small autoincrement integers, so a bitmap (one bit per ID up to
+    the largest) is exact and about 125 KB per million books, where a bloom
+    filter would add false positives and could not forget deleted IDs.
+
+    Only IDs up to ``ceiling`` are answered from the bitmap; anything above
+    it may have been created by another process since the last sync and
+    goes to the database. The bitmap is built at startup, updated by this
+    process's creates and deletes, and catches up with other processes'
+    writes by replaying the change log every ``interval`` seconds. A book
+    created elsewhere with a lower ID than one already synced (IDs handed
+    out before a slower commit, or SQLite reusing the IDs of deleted newest
+    books) can get a 404 here until the next sync.
+
+    Attributes:
+        lookups (int): IDs checked
+        negatives (int): IDs answered as missing without a query
+        unknown (int): IDs above the ceiling, passed to the database
+        false_positives (int): IDs the bitmap held that the database did not have
+        syncs (int): Change-log replays applied
+    """
+
+    def __init__(self) -> None:
+        self.ready: bool = False
+        self.ceiling: int = 0
+        self.synced_seq: int = 0
+        self.lookups: int = 0
+        self.negatives: int = 0
+        self.unknown: int = 0
+        self.false_positives: int = 0
+        self.syncs: int = 0
+        self._bits: bytearray = bytearray()
+        self._count: int = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def known_missing(self, book_id: int) -> bool:
+        """
+        Check whether a book is known not to exist.
+
+        Args:
+            book_id (int): ID to look up
+
+        Returns:
+            bool: True if the book certainly does not exist; False means ask the database
+        """
+        if not self.ready:
+            return False
+        self.lookups += 1
+        if book_id > self.ceiling:
+            self.unknown += 1
+            return False
+        if self._has(book_id):
+            return False
+        self.negatives += 1
+        return True
+
+    def missed(self, book_id: int) -> None:
+        """
+        Record that the database had no book the bitmap let through.
+
+        The bit is left alone: a replica may simply not have the book yet.
+        Deletes reach the bitmap through ``discard`` and the change log.
+
+        Args:
+            book_id (int): ID the database did not find
+        """
+        if self.ready and book_id <= self.ceiling and self._has(book_id):
+            self.false_positives += 1
+
+    def add(self, book_id: int) -> None:
+        """
+        Mark a book as existing (after this process created it).
+
+        Args:
+            book_id (int): ID of the new book
+        """
+        byte, mask = divmod(book_id, 8)
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte - len(self._bits) + 1 + len(self._bits) // 2))
+        if not self._bits[byte] & (1 << mask):
+            self._bits[byte] |= 1 << mask
+            self._count += 1
+
+    def discard(self, book_id: int) -> None:
+        """
+        Mark a book as deleted (after this process deleted it).
+
+        SQLite gives a new book the ID after the largest existing one, so
+        deleting the newest books makes their IDs reusable: the ceiling
+        drops to the largest remaining ID and reused IDs go to the database.
+
+        Args:
+            book_id (int): ID of the deleted book
+        """
+        if not self._has(book_id):
+            return
+        byte, mask = divmod(book_id, 8)
+        self._bits[byte] &= ~(1 << mask)
+        self._count -= 1
+        if book_id == self.ceiling:
+            self.ceiling = self._highest(book_id - 1)
+
+    async def start(self, session_factory: Callable, interval: float) -> None:
+        """
+        Build the bitmap and start replaying the change log in the background.
+
+        Args:
+            session_factory (Callable): Primary read pool (not a replica, which may lag)
+            interval (float): Seconds between change-log replays
+        """
+        last_seq, ids = await run_read(session_factory, crud.get_book_ids)
+        self._bits = bytearray((ids[-1] // 8 + 1) if ids else 0)
+        self._count = 0
+        for book_id in ids:
+            self.add(book_id)
+        self.ceiling = ids[-1] if ids else 0
+        self.synced_seq = last_seq
+        self.ready = True
+        logger.info("Book ID filter built: %d IDs up to %d", self._count, self.ceiling)
+        self._task = asyncio.get_running_loop().create_task(self._run(session_factory, interval))
+
+    async def stop(self) -> None:
+        """Stop the background replay."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def sync(self, session_factory: Callable) -> None:
+        """
+        Apply every change-log entry after the last one seen.
+
+        All pages are read before any is applied, so a write this process
+        makes meanwhile is never undone by an older entry half-way through.
+
+        Args:
+            session_factory (Callable): Primary read pool
+        """
+        entries: List[Row] = []
+        since: int = self.synced_seq
+        while True:
+            page: List[Row] = await read_changes(session_factory, since, SYNC_BATCH_SIZE)
+            entries += page
+            if len(page) < SYNC_BATCH_SIZE:
+                break
+            since = page[-1].seq
+        if not entries:
+            return
+        top: int = self.ceiling
+        for entry in entries:
+            if entry.op == "delete":
+                self.discard(entry.book_id)
+            else:
+                self.add(entry.book_id)
+                top = max(top, entry.book_id)
+        # IDs up to the newest synced one are now known, unless the newest books were deleted
+        self.ceiling = self._highest(top)
+        self.synced_seq = entries[-1].seq
+        self.syncs += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get filter counters.
+
+        The false-positive rate is the share of missing IDs that still
+        reached the database: false_positives / (false_positives + negatives).
+
+        Returns:
+            Dict[str, Any]: Size, lookup outcomes and false-positive rate
+        """
+        missing: int = self.false_positives + self.negatives
+        return {
+            "ids": self._count,
+            "ceiling": self.ceiling,
+            "bytes": len(self._bits),
+            "synced_seq": self.synced_seq,
+            "syncs": self.syncs,
+            "lookups": self.lookups,
+            "negatives": self.negatives,
+            "unknown": self.unknown,
+            "false_positives": self.false_positives,
+            "false_positive_rate": round(self.false_positives / missing, 4) if missing else 0.0,
+        }
+
+    async def _run(self, session_factory: Callable, interval: float) -> None:
+        """Replay the change log every ``interval`` seconds, forever."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync(session_factory)
+            except Exception:  # keep serving from the last good state; the next sync retries
+                logger.exception("Book ID filter sync failed")
+
+    def _has(self, book_id: int) -> bool:
+        """Check one bit."""
+        byte, mask = divmod(book_id, 8)
+        return 0 <= byte < len(self._bits) and bool(self._bits[byte] & (1 << mask))
+
+    def _highest(self, book_id: int) -> int:
+        """Get the largest set ID not above ``book_id`` (0 if none)."""
+        while book_id > 0 and not self._has(book_id):
+            book_id -= 1
+        return book_id
+
+
+# Consulted by get/update/delete of single books when BOOK_API_ID_FILTER is on
+book_id_filter: BookIdFilter = BookIdFilter()
@@ -1,16 +1,82 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-import uvicorn
+from fastapi import FastAPI, Depends, Header, HTTPException, Path, status, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from datetime import datetime
+import re
+from starlette.concurrency import run_in_threadpool
+from typing import Annotated, Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
-from database import get_db, engine, Base
+from admission import (
+    AdmissionMiddleware, ConcurrencyLimiter, RateLimiter, create_rate_limit_store, parse_rules,
+)
+from async_crud import AnySession
+from bulk import iter_raw_rows, validate_rows
+from cache import book_cache, stats_cache
+from changes import change_item, stream_changes, wait_for_changes
+from coalesce import read_flights
+from compression import CompressionMiddleware
+from conditional import book_etag, is_not_modified, not_modified, page_etag, set_validators
+from config import (
+    ADMISSION_ENABLED, ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_QUEUE, ADMISSION_POOL_SATURATION,
+    ADMISSION_QUEUE_TIMEOUT_MS, ADMISSION_ROUTE_LIMITS, BULK_CHUNK_SIZE, BULK_MAX_ERRORS, COALESCE_READS,
+    COMPRESSION_CHUNK_SIZE, COMPRESSION_ENABLED, COMPRESSION_ENCODINGS, COMPRESSION_MIN_SIZE, FAST_JSON,
+    GROUP_COMMIT, ID_FILTER, ID_FILTER_SYNC_MS, METRICS_ENABLED, RATE_LIMIT_BACKEND, RATE_LIMIT_ENABLED,
+    RATE_LIMIT_MAXSIZE, RATE_LIMIT_RULES, RATE_LIMIT_TRUST_FORWARDED, RATE_LIMIT_URL, READ_YOUR_WRITES_MS,
+    READY_LOOP_LAG_MS, READY_POOL_SATURATION, REPLICA_URLS, SKIP_SCHEMA_SETUP, SLOW_QUERY_MS,
+)
+from database import (
+    get_read_session, get_session, dispose_engines, engine, async_engine, read_engine, async_read_engine,
+    pool_saturation, read_router, replica_engines, async_replica_engines, run_read,
+)
+from export import MEDIA_TYPES, stream_catalog
+from group_commit import group_writer
+from health import LoopLagMonitor, check_pool
+from id_filter import book_id_filter
+from migrations import init_db
+import metrics
+from pagination import decode_cursor, set_next_link
+from replicas import ReadYourWritesMiddleware, reads_own_writes
 from models import Book
-from schemas import BookCreate, BookUpdate, BookResponse
+from serialization import FastJSONResponse, render_books
+from schemas import (
+    MAX_BOOK_ID, BookBulkUpdate, BookChangesResponse, BookCreate, BookUpdate, BookResponse, BookStatsResponse,
+    BulkCreateResponse, BulkDeleteResponse, BulkRowError, BulkUpdateResponse,
+)
+import async_crud
 import crud
 
+# Event-loop lag of this worker, reported by GET /healthz/ready
+loop_monitor: LoopLagMonitor = LoopLagMonitor(READY_LOOP_LAG_MS)
+
+# Path parameter of the single-book endpoints; larger values do not fit the 64-bit key
+BookId = Annotated[int, Path(ge=1, le=MAX_BOOK_ID, description="ID of the book")]
+
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Prepare the database on startup and release resources on shutdown.
+    
+    Importing this module touches neither the database nor the server, so
+    workers start quickly; the schema check runs here, once, off the event
+    loop.
+    
+    Args:
+        app (FastAPI): Application being served
+    """
+    # Create tables and apply schema migrations (FTS index, ...), unless serve.py already did
+    if not SKIP_SCHEMA_SETUP:
+        await run_in_threadpool(init_db, engine)
+    # Load the existing book IDs from the primary (replicas may lag)
+    if ID_FILTER:
+        await book_id_filter.start(read_router.primary, ID_FILTER_SYNC_MS / 1000)
+    loop_monitor.start()
+    yield
+    # Commit whatever the group-commit writer still holds, then close the pools
+    await loop_monitor.stop()
+    await book_id_filter.stop()
+    await group_writer.close()
+    await dispose_engines()
 
 
 # Create FastAPI application
@@ -18,8 +84,180 @@ app = FastAPI(
     title="Book API",
     description="API for managing books.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# gzip/br/zstd bodies negotiated from Accept-Encoding (inside the metrics middleware,
+# so request latency includes compression time)
+if COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        encodings=COMPRESSION_ENCODINGS,
+        minimum_size=COMPRESSION_MIN_SIZE,
+        chunk_size=COMPRESSION_CHUNK_SIZE,
+    )
+
+# Per-client rate limits (429) and load shedding (503), checked before any work is done.
+# Inside the metrics middleware, so rejections show up in the latency histograms.
+rate_limiter: Optional[RateLimiter] = (
+    RateLimiter(
+        create_rate_limit_store(RATE_LIMIT_BACKEND, RATE_LIMIT_MAXSIZE, RATE_LIMIT_URL),
+        parse_rules(RATE_LIMIT_RULES),
+    )
+    if RATE_LIMIT_ENABLED else None
+)
+concurrency_limiter: Optional[ConcurrencyLimiter] = (
+    ConcurrencyLimiter(
+        ADMISSION_MAX_CONCURRENT,
+        ADMISSION_MAX_QUEUE,
+        ADMISSION_QUEUE_TIMEOUT_MS / 1000,
+        pool_saturation=pool_saturation,
+        pool_limit=ADMISSION_POOL_SATURATION,
+    )
+    if ADMISSION_ENABLED else None
+)
+route_limiters: Dict[str, ConcurrencyLimiter] = {
+    route: ConcurrencyLimiter(int(limit), int(queue), ADMISSION_QUEUE_TIMEOUT_MS / 1000)
+    for route, (limit, queue) in parse_rules(ADMISSION_ROUTE_LIMITS).items()
+} if ADMISSION_ENABLED else {}
+if rate_limiter is not None or concurrency_limiter is not None:
+    app.add_middleware(
+        AdmissionMiddleware,
+        rate_limiter=rate_limiter,
+        concurrency=concurrency_limiter,
+        route_concurrency=route_limiters,
+        trust_forwarded=RATE_LIMIT_TRUST_FORWARDED,
+    )
+
+# After a write, the client's reads skip the replicas for a while (cookie set on the response)
+if REPLICA_URLS and READ_YOUR_WRITES_MS > 0:
+    app.add_middleware(ReadYourWritesMiddleware, window=READ_YOUR_WRITES_MS / 1000)
+
+# Latency histograms, per-request query counts and slow-query log
+if METRICS_ENABLED:
+    for instrumented in {engine, read_engine, *replica_engines}:
+        metrics.instrument_engine(instrumented, SLOW_QUERY_MS)
+    for instrumented in {async_engine, async_read_engine, *async_replica_engines} - {None}:
+        metrics.instrument_engine(instrumented.sync_engine, SLOW_QUERY_MS)
+    metrics.register_collector(metrics.stats_collector("book_api_cache", book_cache.stats))
+    metrics.register_collector(metrics.stats_collector("book_api_stats_cache", stats_cache.stats))
+    if GROUP_COMMIT:
+        metrics.register_collector(metrics.stats_collector("book_api_group_commit", group_writer.stats))
+    if REPLICA_URLS:
+        metrics.register_collector(metrics.stats_collector("book_api_replicas", read_router.stats))
+    if ID_FILTER:
+        metrics.register_collector(metrics.stats_collector("book_api_id_filter", book_id_filter.stats))
+    if COALESCE_READS:
+        metrics.register_collector(metrics.stats_collector("book_api_coalesce", read_flights.stats))
+    if rate_limiter is not None:
+        metrics.register_collector(metrics.stats_collector("book_api_rate_limit", rate_limiter.stats))
+    if concurrency_limiter is not None:
+        metrics.register_collector(metrics.stats_collector("book_api_admission", concurrency_limiter.stats))
+    for route, limiter in route_limiters.items():
+        prefix: str = "book_api_admission_" + re.sub(r"[^0-9A-Za-z]+", "_", route).strip("_")
+        metrics.register_collector(metrics.stats_collector(prefix, limiter.stats))
+    app.add_middleware(metrics.MetricsMiddleware)
+
+
+def _parse_cursor(cursor: Optional[str], sort: str) -> Optional[list]:
+    """
+    Decode the ``cursor`` query parameter.
+    
+    Args:
+        cursor (Optional[str]): Cursor from the client, if any
+        sort (str): Resolved sort option; its key columns give the expected values
+        
+    Returns:
+        Optional[list]: Keyset values, or None when no cursor was sent
+        
+    Raises:
+        HTTPException: 400 if the cursor is invalid
+    """
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, crud.cursor_types(sort))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+def _list_response(
+    request: Request, response: Response, books: list, limit: int, fields: tuple
+) -> Union[Response, list]:
+    """
+    Finish a list endpoint: conditional GET, pagination headers and serializer.
+    
+    The page ETag is derived from the (id, version, updated_at) of its
+    rows, so a matching If-None-Match is answered with 304 before anything
+    is serialized. With BOOK_API_FAST_JSON the rows are rendered directly
+    to JSON bytes; otherwise the ORM objects go through BookResponse.
+    
+    Pages carry no Last-Modified: the newest updated_at of the remaining
+    rows does not move when a row is deleted or moves off the page, so
+    If-Modified-Since would keep confirming a stale page. The ETag covers
+    the exact set of rows.
+    
+    Args:
+        request (Request): Incoming request
+        response (Response): Response injected into the handler
+        books (list): Page of books (rows when FAST_JSON is on)
+        limit (int): Requested page size
+        fields (tuple): Keyset attributes, see crud.cursor_fields
+        
+    Returns:
+        Union[Response, list]: Ready response or the books for FastAPI to serialize
+    """
+    etag: str = page_etag((book.id, book.version, book.updated_at) for book in books)
+    if is_not_modified(request, etag, None):
+        response = not_modified(etag, None)
+        set_next_link(response, request.url, books, limit, fields)
+        return response
+    
+    if FAST_JSON:
+        response = FastJSONResponse(render_books(books))
+    set_validators(response, etag, None)
+    set_next_link(response, request.url, books, limit, fields)
+    return response if FAST_JSON else books
+
+
+async def _coalesced_list_response(
+    request: Request, key: tuple, fetch: Callable[[Callable], Awaitable[list]], limit: int, fields: tuple
+) -> Response:
+    """
+    Finish a list endpoint through read_flights (BOOK_API_COALESCE_READS).
+    
+    Requests with the same ``key`` arriving while one is being served
+    share its query, rendered JSON body and ETag; each still gets its
+    own conditional-GET check and next-page link. The query runs on a
+    session of its own from the request's read pool, as the first
+    request's session may close before the others are served.
+    
+    Args:
+        request (Request): Incoming request
+        key (tuple): Normalized query parameters
+        fetch (Callable[[Callable], Awaitable[list]]): Reads the page as rows from a session factory
+        limit (int): Requested page size
+        fields (tuple): Keyset attributes, see crud.cursor_fields
+        
+    Returns:
+        Response: JSON page, or an empty 304
+    """
+    pinned: bool = reads_own_writes(request.cookies)  # never share a primary read with replica reads
+    read_pool: Callable = request.state.read_pool
+    
+    async def render() -> Tuple[list, bytes, str]:
+        books: list = await fetch(read_pool)
+        return books, render_books(books), page_etag((book.id, book.version, book.updated_at) for book in books)
+    
+    books, body, etag = await read_flights.do((*key, pinned), render)
+    if is_not_modified(request, etag, None):  # pages have no Last-Modified, see _list_response
+        response: Response = not_modified(etag, None)
+    else:
+        response = FastJSONResponse(body)
+        set_validators(response, etag, None)
+    set_next_link(response, request.url, books, limit, fields)
+    return response
+
 
 # ========== ROOT ENDPOINT ==========
 @app.get("/")
@@ -36,11 +274,19 @@ async def root() -> dict:
         "docs": "/docs",
         "endpoints": [
             "POST /books/ - Add a book (year optional)",
+            "POST /books/bulk - Add many books (JSON array or NDJSON)",
             "GET /books/ - Get all books",
+            "GET /books/export - Stream the whole catalog (NDJSON or CSV)",
             "GET /books/{id} - Get book by ID",
             "PUT /books/{id} - Update book",
+            "PATCH /books/bulk - Update many books",
             "DELETE /books/{id} - Delete book",
-            "GET /books/search/ - Search books"
+            "DELETE /books?ids=1,2,3 - Delete many books",
+            "GET /books/search/ - Search books",
+            "GET /books/stats - Author and year counts",
+            "GET /cache/stats - Book cache counters",
+            "GET /healthz/ready - Readiness (pool saturation, event-loop lag)",
+            "GET /metrics - Prometheus metrics"
         ]
     }
 
@@ -51,19 +297,21 @@ async def root() -> dict:
           status_code=status.HTTP_201_CREATED,
           summary="Add a new book",
           tags=["Books"])
-async def add_book(book: BookCreate, db: Session = Depends(get_db)) -> BookResponse:
+async def add_book(book: BookCreate, db: AnySession = Depends(get_session)) -> BookResponse:
     """
     Add a new book to the database.
     
     Args:
         book (BookCreate): Book data for creation
-        db (Session): Database session
+        db (AnySession): Database session
         
     Returns:
         BookResponse: Created book
         
     Notes:
         Year field is optional.
+        With BOOK_API_GROUP_COMMIT=1 the book is committed together with
+        other concurrent creates; the response is sent after the commit.
         Example without year:
         ```json
         {
@@ -72,7 +320,127 @@ async def add_book(book: BookCreate, db: Session = Depends(get_db)) -> BookRespo
         }
         ```
     """
-    return crud.create_book(db, book)
+    if GROUP_COMMIT:
+        return await group_writer.submit(book)
+    return await async_crud.create_book(db, book)
+
+
+# ========== POST /books/bulk ==========
+@app.post("/books/bulk",
+          response_model=BulkCreateResponse,
+          summary="Add many books at once",
+          tags=["Books"])
+async def add_books_bulk(request: Request, db: AnySession = Depends(get_session)) -> BulkCreateResponse:
+    """
+    Add many books in chunked transactions.
+    
+    Args:
+        request (Request): Body is a JSON array of books, or NDJSON
+            (one book per line) with `Content-Type: application/x-ndjson`
+        db (AnySession): Database session
+        
+    Returns:
+        BulkCreateResponse: Inserted and failed counts with per-row errors
+        
+    Raises:
+        HTTPException: 400 if a JSON array body cannot be parsed
+        
+    Notes:
+        Rows are validated and inserted BULK_CHUNK_SIZE at a time, each
+        chunk in its own transaction. Invalid rows are skipped and
+        reported; valid rows are still inserted.
+    """
+    inserted: int = 0
+    failed: int = 0
+    errors: List[BulkRowError] = []
+    chunk: list = []
+    
+    async def flush() -> None:
+        nonlocal inserted, failed
+        books, chunk_errors = validate_rows(chunk)
+        inserted += await async_crud.create_books_bulk(db, books)
+        failed += len(chunk_errors)
+        errors.extend(chunk_errors[:max(BULK_MAX_ERRORS - len(errors), 0)])
+        chunk.clear()
+    
+    try:
+        async for row in iter_raw_rows(request):
+            chunk.append(row)
+            if len(chunk) >= BULK_CHUNK_SIZE:
+                await flush()
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    await flush()
+    
+    return BulkCreateResponse(inserted=inserted, failed=failed, errors=errors)
+
+
+# ========== PATCH /books/bulk ==========
+@app.patch("/books/bulk",
+           response_model=BulkUpdateResponse,
+           summary="Update many books at once",
+           tags=["Books"])
+async def update_books_bulk_endpoint(
+    updates: List[BookBulkUpdate],
+    db: AnySession = Depends(get_session)
+) -> BulkUpdateResponse:
+    """
+    Apply partial updates to many books in one transaction.
+    
+    Args:
+        updates (List[BookBulkUpdate]): Each entry has an `id` plus the
+            fields to change, with the same rules as PUT /books/{id}
+        db (AnySession): Database session
+        
+    Returns:
+        BulkUpdateResponse: Updated books and the IDs that were not found
+    """
+    rows = await async_crud.update_books_bulk(db, updates)
+    found = {row.id for row in rows}
+    return BulkUpdateResponse(
+        updated=[BookResponse.model_validate(row) for row in rows],
+        not_found=[u.id for u in updates if u.id not in found]
+    )
+
+
+# ========== DELETE /books ==========
+@app.delete("/books",
+            response_model=BulkDeleteResponse,
+            summary="Delete many books",
+            tags=["Books"])
+async def delete_books_endpoint(
+    ids: List[str] = Query(..., description="IDs to delete: `ids=1&ids=2` or `ids=1,2`"),
+    db: AnySession = Depends(get_session)
+) -> BulkDeleteResponse:
+    """
+    Delete many books with a single statement.
+    
+    Args:
+        ids (List[str]): Book IDs, repeated and/or comma-separated (max 1000)
+        db (AnySession): Database session
+        
+    Returns:
+        BulkDeleteResponse: Deleted IDs and the IDs that were not found
+        
+    Raises:
+        HTTPException: 422 if an ID is not an integer, is out of range, or more than 1000 are given
+    """
+    try:
+        book_ids: List[int] = list(dict.fromkeys(
+            int(part) for value in ids for part in value.split(",") if part.strip()
+        ))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="ids must be integers")
+    if not all(1 <= book_id <= MAX_BOOK_ID for book_id in book_ids):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=f"ids must be between 1 and {MAX_BOOK_ID}"
+        )
+    if len(book_ids) > 1000:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="At most 1000 ids per request")
+    
+    deleted = await async_crud.delete_books(db, book_ids)
+    deleted_set = set(deleted)
+    return BulkDeleteResponse(deleted=deleted, not_found=[i for i in book_ids if i not in deleted_set])
 
 
 # ========== GET /books/ ==========
@@ -81,22 +449,81 @@ async def add_book(book: BookCreate, db: Session = Depends(get_db)) -> BookRespo
          summary="Get all books",
          tags=["Books"])
 async def get_all_books_endpoint(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's Link header"),
+    sort: str = Query("id", pattern="^(id|title|author|year)$", description="Sort key: id, title, author or year"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="Sort direction: asc or desc"),
+    db: AnySession = Depends(get_read_session)
 ) -> List[BookResponse]:
     """
     Retrieve all books from the database.
     
     Args:
+        request (Request): Incoming request, used to build the next-page link
+        response (Response): Outgoing response, receives pagination headers
         skip (int): Number of records to skip (default 0)
         limit (int): Number of records to return (default 100, max 1000)
-        db (Session): Database session
+        cursor (Optional[str]): Keyset cursor; replaces ``skip`` for deep pages
+        sort (str): Sort key (default "id"); ties are broken by ID
+        order (str): "asc" (default) or "desc"
+        db (AnySession): Database session
+        
+    Returns:
+        List[BookResponse]: List of all books in the requested order
+        
+    Notes:
+        Full pages carry `Link: <...>; rel="next"` and `X-Next-Cursor`
+        headers. Following them costs the same at any depth, unlike `skip`.
+        A cursor is only valid with the sort it was issued for.
+        Books without a year come first when sorting by year ascending.
+    """
+    fields = crud.cursor_fields(sort)
+    after = _parse_cursor(cursor, sort)
+    if COALESCE_READS:
+        params: Dict[str, Any] = {"skip": skip, "limit": limit, "after": after, "sort": sort, "order": order}
+        return await _coalesced_list_response(
+            request,
+            ("list", skip, limit, tuple(after or ()), sort, order),
+            lambda read_pool: run_read(read_pool, crud.get_all_books, as_rows=True, **params),
+            limit, fields,
+        )
+    books = await async_crud.get_all_books(
+        db, skip=skip, limit=limit, after=after, as_rows=FAST_JSON, sort=sort, order=order
+    )
+    return _list_response(request, response, books, limit, fields)
+
+
+# ========== GET /books/export ==========
+@app.get("/books/export",
+         response_class=StreamingResponse,
+         summary="Export the whole catalog",
+         tags=["Books"])
+async def export_books_endpoint(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Output format: ndjson or csv")
+) -> StreamingResponse:
+    """
+    Stream every book as NDJSON or CSV.
+    
+    Args:
+        request (Request): Incoming request (read-your-writes cookie picks the pool)
+        format (str): "ndjson" (default) or "csv"
         
     Returns:
-        List[BookResponse]: List of all books
+        StreamingResponse: Rows in ID order, sent batch by batch
+        
+    Notes:
+        Rows are read through a server-side cursor and written as they
+        arrive, so memory use does not depend on the catalog size.
     """
-    return crud.get_all_books(db, skip=skip, limit=limit)
+    return StreamingResponse(
+        stream_catalog(format, read_router.choose(reads_own_writes(request.cookies))),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="books.{format}"'}
+    )
 
 
 # ========== GET /books/search/ ==========
@@ -105,37 +532,251 @@ async def get_all_books_endpoint(
          summary="Search books",
          tags=["Search"])
 async def search_books_endpoint(
+    request: Request,
+    response: Response,
     title: Optional[str] = Query(None, description="Search by title (partial match)"),
     author: Optional[str] = Query(None, description="Search by author (partial match)"),
     year: Optional[int] = Query(None, description="Search by year"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
-    db: Session = Depends(get_db)
+    mode: str = Query("like", pattern="^(like|fts)$",
+                      description="'like' for substring match, 'fts' for ranked word-prefix match"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's Link header"),
+    sort: Optional[str] = Query(None, pattern="^(id|title|author|year|rank)$",
+                                description="Sort key: id, title, author, year or rank (fts only)"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="Sort direction: asc or desc"),
+    db: AnySession = Depends(get_read_session)
 ) -> List[BookResponse]:
     """
     Search books by title, author, or year.
     
     Args:
+        request (Request): Incoming request, used to build the next-page link
+        response (Response): Outgoing response, receives pagination headers
         title (Optional[str]): Title to search for
         author (Optional[str]): Author to search for
         year (Optional[int]): Publication year to search for
         skip (int): Number of records to skip
         limit (int): Number of records to return
-        db (Session): Database session
+        mode (str): Search mode, "like" (default) or "fts"
+        cursor (Optional[str]): Keyset cursor; replaces ``skip`` for deep pages
+        sort (Optional[str]): Sort key; defaults to "rank" for full-text
+            searches and "id" otherwise
+        order (str): "asc" (default) or "desc"
+        db (AnySession): Database session
         
     Returns:
         List[BookResponse]: List of matching books
         
+    Raises:
+        HTTPException: 422 if sort=rank is used without a full-text query, or
+            mode=fts on PostgreSQL
+        
     Examples:
         - `/books/search/?author=Tolstoy` - Books by Tolstoy
         - `/books/search/?title=war&author=tolstoy` - Books with "war" in title by Tolstoy
         - `/books/search/?year=1869` - Books from 1869
+        - `/books/search/?title=war pea&mode=fts` - Full-text search, best matches first
+        - `/books/search/?author=tolstoy&sort=year&order=desc` - Newest first
         
     Note:
         Searching by year will only return books with the specified year.
         Books without a year will not be included in year search results.
     """
-    return crud.search_books(db, title=title, author=author, year=year, skip=skip, limit=limit)
+    try:
+        sort = crud.resolve_sort(mode, sort, title, author)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc))
+    fields = crud.cursor_fields(sort)
+    after = _parse_cursor(cursor, sort)
+    try:
+        if COALESCE_READS:
+            params: Dict[str, Any] = {
+                "title": title, "author": author, "year": year, "skip": skip, "limit": limit, "mode": mode,
+                "after": after, "sort": sort, "order": order,
+            }
+            return await _coalesced_list_response(
+                request,
+                ("search", title, author, year, skip, limit, mode, tuple(after or ()), sort, order),
+                lambda read_pool: run_read(read_pool, crud.search_books, as_rows=True, **params),
+                limit, fields,
+            )
+        books = await async_crud.search_books(
+            db, title=title, author=author, year=year, skip=skip, limit=limit, mode=mode, after=after,
+            as_rows=FAST_JSON, sort=sort, order=order
+        )
+    except ValueError as exc:  # mode=fts on a backend without the FTS5 index
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc))
+    return _list_response(request, response, books, limit, fields)
+
+
+# ========== GET /books/stats ==========
+@app.get("/books/stats",
+         response_model=BookStatsResponse,
+         summary="Catalog statistics",
+         tags=["Search"])
+async def book_stats_endpoint(
+    request: Request,
+    title: Optional[str] = Query(None, description="Filter by title (partial match)"),
+    author: Optional[str] = Query(None, description="Filter by author (partial match)"),
+    year: Optional[int] = Query(None, description="Filter by year"),
+    mode: str = Query("like", pattern="^(like|fts)$",
+                      description="'like' for substring match, 'fts' for word-prefix match"),
+    top_authors: int = Query(20, ge=1, le=1000, description="Number of authors in the author facet"),
+    year_bucket: int = Query(1, ge=1, le=1000, description="Width of year histogram buckets, e.g. 10 for decades"),
+    db: AnySession = Depends(get_read_session)
+) -> BookStatsResponse:
+    """
+    Count books per author and per year, with the filters of /books/search/.
+    
+    Args:
+        request (Request): Incoming request (read-your-writes cookie bypasses the cache)
+        title (Optional[str]): Title filter
+        author (Optional[str]): Author filter
+        year (Optional[int]): Year filter
+        mode (str): Filter mode, "like" (default) or "fts"
+        top_authors (int): Most frequent authors to return (default 20)
+        year_bucket (int): Years per histogram bucket (default 1)
+        db (AnySession): Database session
+        
+    Returns:
+        BookStatsResponse: Totals, author facet and year histogram
+        
+    Raises:
+        HTTPException: 422 for mode=fts on PostgreSQL
+        
+    Notes:
+        Computed with SQL GROUP BY and cached until the next write, so
+        dashboards never page through the catalog.
+        
+    Examples:
+        - `/books/stats?year_bucket=10` - Books per decade
+        - `/books/stats?author=tolstoy` - Year histogram of one author
+    """
+    try:
+        return await async_crud.book_stats_cached(
+            db, refresh=reads_own_writes(request.cookies),
+            title=title, author=author, year=year, mode=mode, top_authors=top_authors, year_bucket=year_bucket
+        )
+    except ValueError as exc:  # mode=fts on a backend without the FTS5 index
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc))
+
+
+# ========== GET /books/changes ==========
+@app.get("/books/changes",
+         response_model=BookChangesResponse,
+         summary="Changes since a sequence number",
+         tags=["Changes"])
+async def get_changes_endpoint(
+    request: Request,
+    response: Response,
+    since: int = Query(0, ge=0, description="Last seq already seen (0 for the whole log)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of changes to return"),
+    wait: float = Query(0, ge=0, le=60, description="Seconds to wait for a change if there is none yet"),
+) -> BookChangesResponse:
+    """
+    Read the change log: every create, update and delete after ``since``, oldest first.
+    
+    Args:
+        request (Request): Incoming request (read-your-writes cookie picks the pool)
+        response (Response): Outgoing response, marked as not cacheable
+        since (int): Last ``seq`` the client has processed
+        limit (int): Maximum number of changes (default 100, max 1000)
+        wait (float): Long-poll timeout in seconds (default 0: answer at once)
+        
+    Returns:
+        BookChangesResponse: Changes and the ``last_seq`` to send as ``since`` next time
+        
+    Notes:
+        Each change carries the book's current state (null once deleted).
+        An indexer keeps up by calling this in a loop with ``wait``, at a
+        cost proportional to the changes rather than to the catalog. On
+        PostgreSQL a write shows up here one sequencing step after its
+        commit (BOOK_API_CHANGES_SEQUENCE_DELAY_MS, default 10 ms).
+        
+    Examples:
+        - `/books/changes?since=0` - Replay the catalog from the start
+        - `/books/changes?since=1200&wait=30` - Block up to 30 s for the next change
+    """
+    rows = await wait_for_changes(read_router.choose(reads_own_writes(request.cookies)), since, limit, wait)
+    response.headers["Cache-Control"] = "no-store"
+    return {"changes": [change_item(row) for row in rows], "last_seq": rows[-1].seq if rows else since}
+
+
+# ========== GET /books/changes/stream ==========
+@app.get("/books/changes/stream",
+         response_class=StreamingResponse,
+         summary="Stream changes as Server-Sent Events",
+         tags=["Changes"])
+async def stream_changes_endpoint(
+    request: Request,
+    since: int = Query(0, ge=0, description="Last seq already seen (0 for the whole log)"),
+    last_event_id: Optional[str] = Header(None, description="Sent by EventSource when it reconnects"),
+) -> StreamingResponse:
+    """
+    Stream the change log as Server-Sent Events, then follow new changes live.
+    
+    Args:
+        request (Request): Incoming request (read-your-writes cookie picks the pool)
+        since (int): Last ``seq`` the client has processed
+        last_event_id (Optional[str]): ``Last-Event-ID`` header; resumes after it
+        
+    Returns:
+        StreamingResponse: ``text/event-stream`` with one event per change
+        (``id`` = seq, ``event`` = op, ``data`` = the change as JSON)
+        
+    Notes:
+        The server closes the stream periodically (BOOK_API_CHANGES_STREAM_MAX_MS);
+        EventSource reconnects and resumes from Last-Event-ID by itself.
+    """
+    if last_event_id is not None and last_event_id.isdigit():
+        since = max(since, int(last_event_id))
+    return StreamingResponse(
+        stream_changes(read_router.choose(reads_own_writes(request.cookies)), since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+# ========== GET /books/{book_id} ==========
+@app.get("/books/{book_id}",
+         response_model=BookResponse,
+         summary="Get a book by ID",
+         tags=["Books"])
+async def get_book_endpoint(
+    book_id: BookId,
+    request: Request,
+    response: Response,
+    db: AnySession = Depends(get_read_session)
+) -> BookResponse:
+    """
+    Get a single book, served from the read-through cache when possible.
+    
+    Args:
+        book_id (int): ID of the book to retrieve
+        request (Request): Incoming request (conditional headers, read-your-writes cookie)
+        response (Response): Outgoing response, receives ETag/Last-Modified
+        db (AnySession): Database session
+        
+    Returns:
+        BookResponse: Requested book, or an empty 304 if the client's
+        If-None-Match / If-Modified-Since still matches
+        
+    Raises:
+        HTTPException: 404 if book not found
+    """
+    entry = await async_crud.get_book_cached(db, book_id, refresh=reads_own_writes(request.cookies))
+    if entry is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Book with ID {book_id} not found"
+        )
+    last_modified: datetime = datetime.fromisoformat(entry["updated_at"])
+    etag: str = book_etag(book_id, entry["version"], last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    set_validators(response, etag, last_modified)
+    return entry["book"]
 
 
 # ========== PUT /books/{book_id} ==========
@@ -144,9 +785,9 @@ async def search_books_endpoint(
          summary="Update book information",
          tags=["Books"])
 async def update_book_endpoint(
-    book_id: int,
+    book_id: BookId,
     book_update: BookUpdate,
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ) -> BookResponse:
     """
     Update book information.
@@ -154,7 +795,7 @@ async def update_book_endpoint(
     Args:
         book_id (int): ID of the book to update
         book_update (BookUpdate): Updated book data
-        db (Session): Database session
+        db (AnySession): Database session
         
     Returns:
         BookResponse: Updated book
@@ -173,7 +814,7 @@ async def update_book_endpoint(
         }
         ```
     """
-    db_book = crud.update_book(db, book_id, book_update)
+    db_book = await async_crud.update_book(db, book_id, book_update)
     if db_book is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -186,13 +827,13 @@ async def update_book_endpoint(
 @app.delete("/books/{book_id}",
             summary="Delete a book",
             tags=["Books"])
-async def delete_book_endpoint(book_id: int, db: Session = Depends(get_db)) -> dict:
+async def delete_book_endpoint(book_id: BookId, db: AnySession = Depends(get_session)) -> dict:
     """
     Delete a book by ID.
     
     Args:
         book_id (int): ID of the book to delete
-        db (Session): Database session
+        db (AnySession): Database session
         
     Returns:
         dict: Success message
@@ -200,7 +841,7 @@ async def delete_book_endpoint(book_id: int, db: Session = Depends(get_db)) -> d
     Raises:
         HTTPException: 404 if book not found
     """
-    success: bool = crud.delete_book(db, book_id)
+    success: bool = await async_crud.delete_book(db, book_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -209,6 +850,70 @@ async def delete_book_endpoint(book_id: int, db: Session = Depends(get_db)) -> d
     return {"message": f"Book with ID {book_id} successfully deleted"}
 
 
+# ========== GET /cache/stats ==========
+@app.get("/cache/stats",
+         summary="Book cache statistics",
+         tags=["Cache"])
+async def cache_stats() -> dict:
+    """
+    Report hit/miss counters of the GET /books/{id} cache.
+    
+    Returns:
+        dict: Backend name, hits, misses, hit ratio, invalidations and,
+        for the memory backend, size and evictions
+    """
+    return book_cache.stats()
+
+
+# ========== GET /healthz/ready ==========
+@app.get("/healthz/ready",
+         summary="Readiness of this worker",
+         tags=["Health"])
+async def ready(response: Response) -> dict:
+    """
+    Report whether this worker can take more traffic.
+    
+    Checks the checked-out share of the busiest connection pool and the
+    largest recent event-loop lag, both measured inside this process; a
+    separate probe cannot see either. Each worker answers for itself.
+    
+    Args:
+        response (Response): Response whose status is set to 503 while a check fails
+        
+    Returns:
+        dict: Overall status and per-check details
+    """
+    checks: Dict[str, Dict[str, Any]] = {
+        "pool": check_pool(pool_saturation(), READY_POOL_SATURATION),
+        "event_loop": loop_monitor.check(),
+    }
+    ready_now: bool = all(check["ok"] for check in checks.values())
+    if not ready_now:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    response.headers["Cache-Control"] = "no-store"
+    return {"status": "ok" if ready_now else "unavailable", "checks": checks}
+
+
+# ========== GET /metrics ==========
+@app.get("/metrics",
+         response_class=PlainTextResponse,
+         include_in_schema=False)
+async def metrics_endpoint() -> PlainTextResponse:
+    """
+    Expose request latency, query counts and cache counters for Prometheus.
+    
+    Returns:
+        PlainTextResponse: Text exposition format 0.0.4
+        
+    Raises:
+        HTTPException: 404 if metrics are disabled (BOOK_API_METRICS=0)
+    """
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # Start server
 if __name__ == "__main__":
+    import uvicorn  # only needed here; importing main for a server must stay light
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,268 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("book_api.slow_query")
+
+# Latency buckets in seconds, from sub-millisecond cache hits to multi-second exports
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUERY_COUNT_BUCKETS: Tuple[float, ...] = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """
+    Render a Prometheus label set.
+
+    Args:
+        names (Sequence[str]): Label names
+        values (Sequence[str]): Label values
+
+    Returns:
+        str: ``{a="1",b="2"}`` or an empty string
+    """
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    """
+    Monotonic counter with labels.
+
+    Attributes:
+        name (str): Metric name
+        help (str): Help text
+        labelnames (Tuple[str, ...]): Label names
+    """
+
+    kind: str = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name: str = name
+        self.help: str = help
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Add ``amount`` to the series identified by ``labels``."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        """Render the sample lines of this metric."""
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {value}" for labels, value in items]
+
+
+class Histogram:
+    """
+    Cumulative histogram with labels, rendered in Prometheus format.
+
+    Attributes:
+        name (str): Metric name
+        help (str): Help text
+        buckets (Tuple[float, ...]): Upper bounds, ascending
+        labelnames (Tuple[str, ...]): Label names
+    """
+
+    kind: str = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float], labelnames: Sequence[str] = ()) -> None:
+        self.name: str = name
+        self.help: str = help
+        self.buckets: Tuple[float, ...] = tuple(buckets)
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation in the series identified by ``labels``."""
+        index: int = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def collect(self) -> List[str]:
+        """Render the bucket, sum and count lines of this metric."""
+        lines: List[str] = []
+        with self._lock:
+            items = [(labels, (list(s[0]), s[1], s[2])) for labels, s in self._series.items()]
+        for labels, (counts, total, count) in items:
+            cumulative: int = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le: str = "+Inf" if bound == float("inf") else repr(float(bound))
+                label_str = _format_labels(self.labelnames + ("le",), labels + (le,))
+                lines.append(f"{self.name}_bucket{label_str} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {total}")
+            lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "book_api_request_duration_seconds", "HTTP request latency by route.",
+    LATENCY_BUCKETS, ("method", "route", "status"),
+)
+REQUEST_QUERIES = Histogram(
+    "book_api_request_db_queries", "Database statements executed per HTTP request.",
+    QUERY_COUNT_BUCKETS, ("route",),
+)
+QUERY_LATENCY = Histogram(
+    "book_api_db_query_duration_seconds", "Database statement execution time.", LATENCY_BUCKETS,
+)
+SLOW_QUERIES = Counter("book_api_db_slow_queries_total", "Statements slower than the slow-query threshold.")
+
+# Extra collectors (e.g. cache stats) registered by other modules; each returns exposition lines
+_collectors: List[Callable[[], List[str]]] = []
+_metrics: List[Any] = [REQUEST_LATENCY, REQUEST_QUERIES, QUERY_LATENCY, SLOW_QUERIES]
+
+
+class _RequestStats:
+    """Mutable per-request query counter shared with threadpool workers through a ContextVar."""
+
+    __slots__ = ("queries",)
+
+    def __init__(self) -> None:
+        self.queries: int = 0
+
+
+_request_stats: ContextVar[Optional[_RequestStats]] = ContextVar("book_api_request_stats", default=None)
+
+
+def register_collector(collector: Callable[[], List[str]]) -> None:
+    """
+    Add a function whose lines are appended to the /metrics output.
+
+    Args:
+        collector (Callable[[], List[str]]): Returns complete exposition lines (with HELP/TYPE)
+    """
+    _collectors.append(collector)
+
+
+def stats_collector(prefix: str, stats: Callable[[], Dict[str, Any]]) -> Callable[[], List[str]]:
+    """
+    Expose the numeric values of a stats dict as gauges.
+
+    Args:
+        prefix (str): Metric name prefix, e.g. ``book_api_cache``
+        stats (Callable[[], Dict[str, Any]]): Returns the current stats
+
+    Returns:
+        Callable[[], List[str]]: Collector for register_collector
+    """
+    def collect() -> List[str]:
+        lines: List[str] = []
+        for key, value in stats().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            lines.append(f"# TYPE {prefix}_{key} gauge")
+            lines.append(f"{prefix}_{key} {value}")
+        return lines
+    return collect
+
+
+def render() -> str:
+    """
+    Render every metric in the Prometheus text exposition format.
+
+    Returns:
+        str: Exposition text
+    """
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.collect())
+    for collector in _collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
+
+
+def instrument_engine(engine: Engine, slow_query_ms: float) -> None:
+    """
+    Time every statement of an engine and count it against the current request.
+
+    Args:
+        engine (Engine): Sync engine (``AsyncEngine.sync_engine`` for async)
+        slow_query_ms (float): Statements slower than this are logged with their SQL
+    """
+    slow_seconds: float = slow_query_ms / 1000
+
+    # The start time lives on the statement's execution context, so a statement that fails
+    # (no after_cursor_execute) leaves nothing behind to be matched with the next one. A few
+    # internal statements run without a context; they are not timed.
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        if context is not None:
+            context.book_api_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        start: Optional[float] = getattr(context, "book_api_query_start", None)
+        if start is None:
+            return
+        elapsed: float = time.perf_counter() - start
+        QUERY_LATENCY.observe(elapsed)
+        stats: Optional[_RequestStats] = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+        if elapsed >= slow_seconds:
+            SLOW_QUERIES.inc()
+            logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, " ".join(statement.split()))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency and query count per route template.
+
+    Routes are labelled by their path template (``/books/{book_id}``), so
+    label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = _RequestStats()
+        token = _request_stats.set(stats)
+        status_code: List[int] = [500]
+
+        async def send_wrapper(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        start: float = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed: float = time.perf_counter() - start
+            _request_stats.reset(token)
+            route = scope.get("route")
+            route_path: str = getattr(route, "path", "<unmatched>")
+            REQUEST_LATENCY.observe(elapsed, scope["method"], route_path, str(status_code[0]))
+            REQUEST_QUERIES.observe(stats.queries, route_path)
@@ -0,0 +1,285 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from typing import Callable, List, Optional, Tuple
+
+
+def _create_books_fts(conn: Connection) -> None:
+    """
+    Create the FTS5 index mirroring ``books`` and the triggers that keep it in sync.
+
+    The table uses external content (no second copy of the text) and
+    prefix indexes so that ``"war"*`` style queries stay index lookups.
+
+    Args:
+        conn (Connection): Open connection inside the migration transaction
+    """
+    if conn.dialect.name != "sqlite":
+        return
+    conn.execute(text(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5("
+        "title, author, content='books', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN "
+        "INSERT INTO books_fts(rowid, title, author) VALUES (new.id, new.title, new.author); "
+        "END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN "
+        "INSERT INTO books_fts(books_fts, rowid, title, author) "
+        "VALUES ('delete', old.id, old.title, old.author); "
+        "END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF title, author ON books BEGIN "
+        "INSERT INTO books_fts(books_fts, rowid, title, author) "
+        "VALUES ('delete', old.id, old.title, old.author); "
+        "INSERT INTO books_fts(rowid, title, author) VALUES (new.id, new.title, new.author); "
+        "END"
+    ))
+    # Index rows that existed before the table was created
+    conn.execute(text("INSERT INTO books_fts(books_fts) VALUES ('rebuild')"))
+
+
+def _add_book_versioning(conn: Connection) -> None:
+    """
+    Add the version and updated_at columns used for ETag/Last-Modified.
+
+    Fresh databases already get them from create_all; older files are altered.
+
+    Args:
+        conn (Connection): Open connection inside the migration transaction
+    """
+    existing = {col["name"] for col in inspect(conn).get_columns("books")}
+    if "version" not in existing:
+        conn.execute(text("ALTER TABLE books ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+    if "updated_at" not in existing:
+        conn.execute(text(
+            "ALTER TABLE books ADD COLUMN updated_at DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00'"
+        ))
+        conn.execute(text("UPDATE books SET updated_at = CURRENT_TIMESTAMP"))
+
+
+def _add_sort_indexes(conn: Connection) -> None:
+    """
+    Add the composite indexes behind the ``sort`` options of list endpoints.
+
+    Fresh databases already get them from create_all; older files are altered.
+
+    Args:
+        conn (Connection): Open connection inside the migration transaction
+    """
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_books_author_year_id ON books (author, year, id)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_books_year_id ON books (year, id)"))
+
+
+def _add_postgres_search_indexes(conn: Connection) -> None:
+    """
+    Add trigram indexes for substring search and keyset sort indexes (PostgreSQL).
+
+    ``ILIKE '%war%'`` cannot use a B-tree; pg_trgm GIN indexes serve it
+    for patterns of three or more characters. SQLite has the FTS5 index
+    instead. The year sort indexes are rebuilt with NULLS FIRST to match
+    crud._order_by, and title gets a (title, id) index because PostgreSQL
+    indexes, unlike SQLite's, do not end with the row ID, so every sort
+    walks an index like on SQLite.
+
+    Args:
+        conn (Connection): Open connection inside the migration transaction
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_books_title_trgm ON books USING gin (title gin_trgm_ops)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_books_author_trgm ON books USING gin (author gin_trgm_ops)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_books_title_id ON books (title, id)"))
+    conn.execute(text("DROP INDEX IF EXISTS ix_books_author_year_id"))
+    conn.execute(text("CREATE INDEX ix_books_author_year_id ON books (author, year NULLS FIRST, id)"))
+    conn.execute(text("DROP INDEX IF EXISTS ix_books_year_id"))
+    conn.execute(text("CREATE INDEX ix_books_year_id ON books (year NULLS FIRST, id)"))
+
+
+def _add_change_log(conn: Connection) -> None:
+    """
+    Add the triggers that fill ``book_changes`` (the table comes from create_all).
+
+    Triggers run inside the writing statement's transaction, so a change is
+    logged exactly when it commits, whichever code path wrote it. Books that
+    already exist are logged as created, so reading the feed from 0 replays
+    the whole catalog.
+
+    Args:
+        conn (Connection): Open connection inside the migration transaction
+    """
+    if conn.dialect.name == "sqlite":
+        for event, op, ref in (("INSERT", "create", "new"), ("UPDATE", "update", "new"), ("DELETE", "delete", "old")):
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS book_changes_{event.lower()} AFTER {event} ON books BEGIN "
+                f"INSERT INTO book_changes (book_id, op, changed_at) VALUES ({ref}.id, '{op}', CURRENT_TIMESTAMP); "
+                "END"
+            ))
+        backfill: str = "SELECT id, 'create', CURRENT_TIMESTAMP FROM books"
+    elif conn.dialect.name == "postgresql":
+        # Sequence values are handed out before commit, so concurrent writers could commit a
+        # lower seq after a reader has moved past it. The transaction-scoped lock (held until
+        # commit) makes log appends commit in seq order, like SQLite's single writer. The price
+        # is that book writes commit one at a time from their first row change on, so their
+        # WAL flushes are never shared. A horizon such as pg_snapshot_xmin does not fit the
+        # integer seq cursor: a committed entry can pass the horizon before a lower seq from an
+        # older, still-open transaction does. Migration 7 replaces this function.
+        conn.execute(text(
+            "CREATE OR REPLACE FUNCTION book_changes_log() RETURNS trigger AS $$ BEGIN "
+            "PERFORM pg_advisory_xact_lock(hashtext('book_changes')); "
+            "INSERT INTO book_changes (book_id, op, changed_at) VALUES ("
+            "CASE TG_OP WHEN 'DELETE' THEN OLD.id ELSE NEW.id END, "
+            "CASE TG_OP WHEN 'INSERT' THEN 'create' WHEN 'UPDATE' THEN 'update' ELSE 'delete' END, "
+            "now() AT TIME ZONE 'UTC'); "
+            "RETURN NULL; END $$ LANGUAGE plpgsql"
+        ))
+        conn.execute(text("DROP TRIGGER IF EXISTS book_changes_log ON books"))
+        conn.execute(text(
+            "CREATE TRIGGER book_changes_log AFTER INSERT OR UPDATE OR DELETE ON books "
+            "FOR EACH ROW EXECUTE FUNCTION book_changes_log()"
+        ))
+        backfill = "SELECT id, 'create', now() AT TIME ZONE 'UTC' FROM books"
+    else:
+        return
+    conn.execute(text(f"INSERT INTO book_changes (book_id, op, changed_at) {backfill} ORDER BY id"))
+
+
+def _widen_book_ids(conn: Connection) -> None:
+    """
+    Make book IDs 64-bit on PostgreSQL, where create_all used to make them int4.
+
+    The API accepts IDs up to schemas.MAX_BOOK_ID; against an int4 column
+    larger ones failed to bind instead of finding no book. SQLite IDs are
+    the 64-bit rowid already.
+
+    Args:
+        conn (Connection): Open connection inside the migration transaction
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    conn.execute(text("ALTER TABLE books ALTER COLUMN id TYPE bigint"))
+    conn.execute(text("ALTER TABLE book_changes ALTER COLUMN book_id TYPE bigint"))
+    sequence: Optional[str] = conn.execute(text("SELECT pg_get_serial_sequence('books', 'id')")).scalar()
+    if sequence is not None:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} AS bigint"))
+
+
+def _sequence_change_log(conn: Connection) -> None:
+    """
+    Number PostgreSQL change-log entries after commit instead of under a global lock.
+
+    Migration 5's trigger serialized every book-writing transaction on one
+    advisory lock so entries committed in seq order. The trigger now only
+    queues entries in ``book_changes_pending``; ``book_changes_sequence()``
+    moves the committed ones into ``book_changes``, which hands out their
+    seq then. Concurrent writers share nothing but the short sequencing
+    step, which runs after their commit (see changes.ChangeSequencer) and
+    serializes on the lock instead, so seq still commits in order.
+
+    Entries of one book queue in commit order: a writer reaches the trigger
+    only once the previous writer of that row has committed.
+
+    Args:
+        conn (Connection): Open connection inside the migration transaction
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS book_changes_pending ("
+        "id BIGSERIAL PRIMARY KEY, book_id BIGINT NOT NULL, op VARCHAR(6) NOT NULL, changed_at TIMESTAMP NOT NULL)"
+    ))
+    conn.execute(text(
+        "CREATE OR REPLACE FUNCTION book_changes_log() RETURNS trigger AS $$ BEGIN "
+        "INSERT INTO book_changes_pending (book_id, op, changed_at) VALUES ("
+        "CASE TG_OP WHEN 'DELETE' THEN OLD.id ELSE NEW.id END, "
+        "CASE TG_OP WHEN 'INSERT' THEN 'create' WHEN 'UPDATE' THEN 'update' ELSE 'delete' END, "
+        "now() AT TIME ZONE 'UTC'); "
+        "RETURN NULL; END $$ LANGUAGE plpgsql"
+    ))
+    # Each statement reads a fresh snapshot, so the move sees every commit made before the lock was
+    # taken; the lock is held until this transaction's entries are visible. With wait => false a
+    # caller gives up while another step runs; that step, or the next one, moves its entries.
+    conn.execute(text(
+        "CREATE OR REPLACE FUNCTION book_changes_sequence(wait boolean) RETURNS integer AS $$ "
+        "DECLARE moved integer; BEGIN "
+        "IF NOT EXISTS (SELECT 1 FROM book_changes_pending) THEN RETURN 0; END IF; "
+        "IF wait THEN PERFORM pg_advisory_xact_lock(hashtext('book_changes')); "
+        "ELSIF NOT pg_try_advisory_xact_lock(hashtext('book_changes')) THEN RETURN 0; END IF; "
+        "WITH queued AS (DELETE FROM book_changes_pending RETURNING id, book_id, op, changed_at) "
+        "INSERT INTO book_changes (book_id, op, changed_at) SELECT book_id, op, changed_at FROM queued ORDER BY id; "
+        "GET DIAGNOSTICS moved = ROW_COUNT; "
+        "RETURN moved; END $$ LANGUAGE plpgsql"
+    ))
+
+
+# Ordered list of (version, migration). Append only; never renumber.
+MIGRATIONS: List[Tuple[int, Callable[[Connection], None]]] = [
+    (1, _create_books_fts),
+    (2, _add_book_versioning),
+    (3, _add_sort_indexes),
+    (4, _add_postgres_search_indexes),
+    (5, _add_change_log),
+    (6, _widen_book_ids),
+    (7, _sequence_change_log),
+]
+
+
+def schema_version(engine: Engine) -> int:
+    """
+    Get the newest migration recorded in the database.
+
+    Args:
+        engine (Engine): Engine of the database to check
+
+    Returns:
+        int: Migration version, 0 for a database that was never migrated
+    """
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")).scalar()
+    except DBAPIError:  # no schema_migrations table yet
+        return 0
+
+
+def run_migrations(engine: Engine) -> None:
+    """
+    Apply every migration newer than the version recorded in the database.
+
+    Args:
+        engine (Engine): Engine of the database to migrate
+    """
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS schema_migrations (version INTEGER PRIMARY KEY)"))
+        current: int = conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")).scalar()
+        for version, migration in MIGRATIONS:
+            if version <= current:
+                continue
+            migration(conn)
+            conn.execute(text("INSERT INTO schema_migrations (version) VALUES (:v)"), {"v": version})
+
+
+def init_db(engine: Engine) -> None:
+    """
+    Create missing tables and apply migrations.
+
+    Run once per deployment (serve.py does it before starting workers) or
+    at application startup for single-process runs. An up-to-date database
+    costs one query; create_all's per-table inspection only runs for new
+    or outdated files, so new tables must come with a migration.
+
+    Args:
+        engine (Engine): Engine of the primary (writable) database
+    """
+    if schema_version(engine) >= MIGRATIONS[-1][0]:
+        return
+
+    import models  # noqa: F401  (registers the tables on Base.metadata)
+    from database import Base
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
@@ -1,7 +1,18 @@
-from sqlalchemy import Column, Integer, String
+from datetime import datetime, timezone
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, column, table
 from database import Base
 
 
+def utcnow() -> datetime:
+    """
+    Get the current UTC time as a naive datetime (how SQLite stores it).
+    
+    Returns:
+        datetime: Current UTC time without tzinfo
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class Book(Base):
     """
     SQLAlchemy model representing a book in the database.
@@ -11,14 +22,24 @@ class Book(Base):
         title (str): Book title, indexed and required
         author (str): Book author, indexed and required
         year (int, optional): Publication year, nullable
+        version (int): Row version, incremented on every update (ETag source)
+        updated_at (datetime): UTC time of the last write (Last-Modified source)
     """
     
     __tablename__: str = "books"
+    __table_args__: tuple = (
+        # Serve the sort options of crud.SORT_KEYS (and year filters) without a sort step
+        Index("ix_books_author_year_id", "author", "year", "id"),
+        Index("ix_books_year_id", "year", "id"),
+    )
     
-    id: Column = Column(Integer, primary_key=True, index=True)
+    # BIGSERIAL on PostgreSQL; on SQLite INTEGER PRIMARY KEY (the 64-bit rowid) must stay as is
+    id: Column = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
     title: Column = Column(String, index=True, nullable=False)
     author: Column = Column(String, index=True, nullable=False)
     year: Column = Column(Integer, nullable=True)  # Year is now optional
+    version: Column = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at: Column = Column(DateTime, nullable=False, default=utcnow, server_default="1970-01-01 00:00:00")
     
     def __repr__(self) -> str:
         """
@@ -28,4 +49,34 @@ class Book(Base):
             str: Formatted string with book details
         """
         year_str: str = f", year={self.year}" if self.year else ", year=not specified"
-        return f"<Book(id={self.id}, title='{self.title}', author='{self.author}'{year_str})>"
\ No newline at end of file
+        return f"<Book(id={self.id}, title='{self.title}', author='{self.author}'{year_str})>"
+
+
+class BookChange(Base):
+    """
+    Append-only change log of ``books``, one row per inserted, updated or deleted book.
+    
+    Rows are written by database triggers (see migrations), so every write
+    path, bulk COPY included, logs its changes in its own transaction. On
+    PostgreSQL they are queued and get their seq just after commit
+    (crud.sequence_changes).
+    
+    Attributes:
+        seq (int): Position in the log, strictly increasing
+        book_id (int): ID of the changed book (no foreign key: deletes are logged too)
+        op (str): "create", "update" or "delete"
+        changed_at (datetime): UTC time of the change
+    """
+    
+    __tablename__: str = "book_changes"
+    __table_args__: dict = {"sqlite_autoincrement": True}  # never reuse a seq, even after deleting rows
+    
+    seq: Column = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    book_id: Column = Column(BigInteger().with_variant(Integer, "sqlite"), nullable=False)
+    op: Column = Column(String(6), nullable=False)
+    changed_at: Column = Column(DateTime, nullable=False)
+
+
+# FTS5 index over books(title, author); created by migrations, not by create_all.
+# rowid equals Book.id, rank is the bm25 score (lower is better).
+books_fts = table("books_fts", column("rowid"), column("rank"))
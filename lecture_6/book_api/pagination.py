@@ -0,0 +1,94 @@
+import base64
+import json
+import math
+from typing import Any, List, Sequence, Tuple
+
+from starlette.datastructures import URL
+from starlette.responses import Response
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode keyset values of the last returned row into an opaque cursor.
+
+    Args:
+        values (Sequence[Any]): Sort key values, ending with the book ID
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw: bytes = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, kinds: Sequence[Tuple[type, bool]]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Cursors come from clients, so every value is checked against its sort
+    column before it reaches the keyset WHERE clause.
+
+    Args:
+        cursor (str): Cursor string from the client
+        kinds (Sequence[Tuple[type, bool]]): (Python type, nullable) of each key column,
+            see crud.cursor_types
+
+    Returns:
+        List[Any]: Sort key values
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another query shape
+    """
+    try:
+        padded: str = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if not isinstance(values, list) or len(values) != len(kinds):
+        raise ValueError("Cursor does not match this query")
+    for value, (kind, nullable) in zip(values, kinds):
+        if not (value is None and nullable or _is_kind(value, kind)):
+            raise ValueError("Cursor does not match this query")
+    return values
+
+
+def _is_kind(value: Any, kind: type) -> bool:
+    """
+    Check that a decoded cursor value can be bound as a column of type ``kind``.
+
+    Args:
+        value (Any): Value from the cursor JSON
+        kind (type): int, float or str
+
+    Returns:
+        bool: True if the value fits (integers within 64 bits, finite floats)
+    """
+    if isinstance(value, bool):  # JSON true/false would pass as int
+        return False
+    if kind is int:
+        return isinstance(value, int) and -2 ** 63 <= value < 2 ** 63
+    if kind is float:
+        return isinstance(value, (int, float)) and math.isfinite(value)
+    return isinstance(value, kind)
+
+
+def set_next_link(response: Response, url: URL, items: list, limit: int, fields: Sequence[str]) -> None:
+    """
+    Add ``Link: <...>; rel="next"`` and ``X-Next-Cursor`` headers for a full page.
+
+    Nothing is added when the page is shorter than ``limit`` (last page).
+
+    Args:
+        response (Response): Response whose headers are updated
+        url (URL): URL of the current request
+        items (list): Rows of the current page
+        limit (int): Requested page size
+        fields (Sequence[str]): Attribute names forming the keyset of a row
+    """
+    if len(items) < limit:
+        return
+    last = items[-1]
+    cursor: str = encode_cursor([getattr(last, field) for field in fields])
+    next_url: URL = url.remove_query_params("skip").include_query_params(cursor=cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+    response.headers["X-Next-Cursor"] = cursor
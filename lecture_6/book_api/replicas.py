@@ -0,0 +1,118 @@
+import itertools
+import math
+import time
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+
+# Cookie holding the time (Unix milliseconds) until which the client reads from the primary
+PIN_COOKIE: str = "book_api_primary_until"
+
+# Requests with these methods never change data, so they do not start a read-your-writes window
+READ_METHODS: frozenset = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def reads_own_writes(cookies: Mapping[str, str]) -> bool:
+    """
+    Check whether a client is inside its read-your-writes window.
+
+    Args:
+        cookies (Mapping[str, str]): Request cookies
+
+    Returns:
+        bool: True if the client wrote recently and must read from the primary
+    """
+    try:
+        return int(cookies.get(PIN_COOKIE, 0)) > time.time() * 1000
+    except ValueError:  # malformed cookie
+        return False
+
+
+class ReplicaRouter:
+    """
+    Pick the session factory that serves a read.
+
+    Reads go to the replicas in turn; clients inside their read-your-writes
+    window, and every read when no replica is configured, go to the
+    primary's read pool. Writes never come through here (get_session).
+
+    Attributes:
+        primary_reads (int): Reads served by the primary
+        replica_reads (List[int]): Reads served by each replica
+        pinned_reads (int): Primary reads caused by a read-your-writes window
+    """
+
+    def __init__(self, primary: Callable[[], Any], replicas: Sequence[Callable[[], Any]] = ()) -> None:
+        self.primary: Callable[[], Any] = primary
+        self.replicas: List[Callable[[], Any]] = list(replicas)
+        self.primary_reads: int = 0
+        self.replica_reads: List[int] = [0] * len(self.replicas)
+        self.pinned_reads: int = 0
+        self._turn = itertools.cycle(range(len(self.replicas)))
+
+    def choose(self, pinned: bool = False) -> Callable[[], Any]:
+        """
+        Get the session factory for one read.
+
+        Args:
+            pinned (bool): The client must see its own writes (read the primary)
+
+        Returns:
+            Callable[[], Any]: sessionmaker or async_sessionmaker
+        """
+        if not self.replicas:
+            self.primary_reads += 1
+            return self.primary
+        if pinned:
+            self.primary_reads += 1
+            self.pinned_reads += 1
+            return self.primary
+        index: int = next(self._turn)
+        self.replica_reads[index] += 1
+        return self.replicas[index]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get routing counters.
+
+        Returns:
+            Dict[str, Any]: Replica count, primary/pinned reads and reads per replica
+        """
+        stats: Dict[str, Any] = {
+            "replicas": len(self.replicas),
+            "primary_reads": self.primary_reads,
+            "pinned_reads": self.pinned_reads,
+        }
+        stats.update({f"replica_{index}_reads": count for index, count in enumerate(self.replica_reads)})
+        return stats
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware starting a read-your-writes window after each successful write.
+
+    Replicas apply the primary's changes with some lag, so a client that
+    creates a book and fetches it right away could get a 404 from a
+    replica. Every successful non-read request gets a cookie valid for
+    ``window`` seconds; while the client sends it back, ReplicaRouter
+    serves its reads from the primary. The cookie carries the deadline
+    itself, so it holds across worker processes.
+    """
+
+    def __init__(self, app: Callable, window: float) -> None:
+        self.app = app
+        self.window: float = window
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope["method"] in READ_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: dict) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until: int = int((time.time() + self.window) * 1000)
+                cookie: str = (
+                    f"{PIN_COOKIE}={until}; Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,7 +1,10 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+# Largest book ID: the primary key is the 64-bit rowid on SQLite and a BIGINT on PostgreSQL (migration 6)
+MAX_BOOK_ID: int = 2 ** 63 - 1
+
 
 class BookCreate(BaseModel):
     """
@@ -67,6 +70,27 @@ class BookUpdate(BaseModel):
     author: Optional[str] = Field(None, min_length=1, max_length=100)
     year: Optional[int] = Field(None, ge=1000, le=2100)
     
+    @field_validator('title', 'author')
+    @classmethod
+    def reject_null(cls, v: Optional[str]) -> str:
+        """
+        Reject an explicit null for a required column.
+        
+        Title and author may be left out of an update, but not cleared.
+        
+        Args:
+            v (Optional[str]): Value sent by the client
+            
+        Returns:
+            str: Validated value
+            
+        Raises:
+            ValueError: If the value is null
+        """
+        if v is None:
+            raise ValueError('Cannot be null; leave the field out to keep it')
+        return v
+    
     @field_validator('year')
     @classmethod
     def validate_year(cls, v: Optional[int]) -> Optional[int]:
@@ -98,6 +122,18 @@ class BookUpdate(BaseModel):
         }
 
 
+class BookBulkUpdate(BookUpdate):
+    """
+    Pydantic schema for one entry of a bulk update.
+    
+    Attributes:
+        id (int): ID of the book to update
+        title, author, year: Same as BookUpdate; only sent fields change
+    """
+    
+    id: int = Field(..., ge=1, le=MAX_BOOK_ID)
+
+
 class BookResponse(BaseModel):
     """
     Pydantic schema for book responses.
@@ -115,4 +151,137 @@ class BookResponse(BaseModel):
     year: Optional[int] = None
     
     class Config:
-        from_attributes: bool = True  # Enables ORM mode for SQLAlchemy models
\ No newline at end of file
+        from_attributes: bool = True  # Enables ORM mode for SQLAlchemy models
+
+
+class BulkRowError(BaseModel):
+    """
+    Pydantic schema for a rejected row of a bulk upload.
+    
+    Attributes:
+        row (int): Zero-based position of the row in the upload
+        errors (List[Dict[str, Any]]): Validation errors for the row
+    """
+    
+    row: int
+    errors: List[Dict[str, Any]]
+
+
+class BulkCreateResponse(BaseModel):
+    """
+    Pydantic schema for the result of a bulk upload.
+    
+    Attributes:
+        inserted (int): Number of books inserted
+        failed (int): Number of rows rejected
+        errors (List[BulkRowError]): Details of rejected rows (capped)
+    """
+    
+    inserted: int
+    failed: int
+    errors: List[BulkRowError]
+
+
+class BulkUpdateResponse(BaseModel):
+    """
+    Pydantic schema for the result of a bulk update.
+    
+    Attributes:
+        updated (List[BookResponse]): Books after the update
+        not_found (List[int]): Requested IDs that do not exist
+    """
+    
+    updated: List[BookResponse]
+    not_found: List[int]
+
+
+class BulkDeleteResponse(BaseModel):
+    """
+    Pydantic schema for the result of a bulk delete.
+    
+    Attributes:
+        deleted (List[int]): IDs that were deleted
+        not_found (List[int]): Requested IDs that do not exist
+    """
+    
+    deleted: List[int]
+    not_found: List[int]
+
+
+class AuthorCount(BaseModel):
+    """
+    Pydantic schema for one bar of the books-per-author facet.
+    
+    Attributes:
+        author (str): Author name
+        count (int): Number of matching books
+    """
+    
+    author: str
+    count: int
+
+
+class YearCount(BaseModel):
+    """
+    Pydantic schema for one bucket of the books-per-year histogram.
+    
+    Attributes:
+        year (Optional[int]): First year of the bucket; None for books without a year
+        count (int): Number of matching books
+    """
+    
+    year: Optional[int] = None
+    count: int
+
+
+class BookStatsResponse(BaseModel):
+    """
+    Pydantic schema for catalog aggregates.
+    
+    Attributes:
+        total (int): Number of matching books
+        with_year (int): Matching books that have a year
+        min_year (Optional[int]): Earliest year among matching books
+        max_year (Optional[int]): Latest year among matching books
+        authors (List[AuthorCount]): Most frequent authors, largest first
+        years (List[YearCount]): Year histogram in year order
+    """
+    
+    total: int
+    with_year: int
+    min_year: Optional[int] = None
+    max_year: Optional[int] = None
+    authors: List[AuthorCount]
+    years: List[YearCount]
+
+
+class BookChangeResponse(BaseModel):
+    """
+    Pydantic schema for one change-log entry.
+    
+    Attributes:
+        seq (int): Position in the change log; pass the last one seen as ``since``
+        op (str): "create", "update" or "delete"
+        book_id (int): ID of the changed book
+        changed_at (datetime): UTC time of the change
+        book (Optional[BookResponse]): Current state of the book, None once deleted
+    """
+    
+    seq: int
+    op: str
+    book_id: int
+    changed_at: datetime
+    book: Optional[BookResponse] = None
+
+
+class BookChangesResponse(BaseModel):
+    """
+    Pydantic schema for a page of the change feed.
+    
+    Attributes:
+        changes (List[BookChangeResponse]): Entries after ``since``, oldest first
+        last_seq (int): ``since`` for the next request (unchanged if there were no entries)
+    """
+    
+    changes: List[BookChangeResponse]
+    last_seq: int
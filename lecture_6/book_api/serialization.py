@@ -0,0 +1,48 @@
+from starlette.responses import Response
+from typing import Any, Iterable
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; pydantic-core ships a Rust encoder too
+    orjson = None
+    from pydantic_core import to_json
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize JSON-compatible data to bytes with the fastest available encoder.
+    
+    Args:
+        obj (Any): Data made of dicts, lists, str, int, float, bool and None
+        
+    Returns:
+        bytes: UTF-8 JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return to_json(obj)
+
+
+def render_books(rows: Iterable[Any]) -> bytes:
+    """
+    Render (id, title, author, year) rows as a JSON array of BookResponse objects.
+    
+    Rows come straight from the database, where every value was validated
+    on write, so they are not passed through BookResponse again.
+    
+    Args:
+        rows (Iterable[Any]): Rows with id, title, author and year attributes
+        
+    Returns:
+        bytes: JSON array
+    """
+    return dumps([
+        {"id": row.id, "title": row.title, "author": row.author, "year": row.year}
+        for row in rows
+    ])
+
+
+class FastJSONResponse(Response):
+    """Response whose body is already-encoded JSON bytes."""
+    
+    media_type: str = "application/json"
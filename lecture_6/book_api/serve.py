@@ -0,0 +1,119 @@
+"""
+Production launcher for the Book API.
+
+Creates the schema and applies migrations once in the parent process,
+then starts N worker processes that skip that step. Each worker opens its
+own write pool and read-only pool against the (WAL) database.
+
+Usage:
+    python serve.py                      # workers = BOOK_API_WORKERS or CPU count
+    python serve.py --workers 4 --port 8080
+"""
+
+import argparse
+import logging
+import os
+from typing import List
+
+import config
+from config import env_int
+
+logger = logging.getLogger("book_api.serve")
+
+
+def default_workers() -> int:
+    """
+    Get the worker count: BOOK_API_WORKERS, or one per available CPU.
+
+    Returns:
+        int: Number of worker processes
+    """
+    try:
+        cpus: int = len(os.sched_getaffinity(0))  # respects container CPU pinning
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    return env_int("BOOK_API_WORKERS", cpus)
+
+
+def per_worker_state(workers: int) -> List[str]:
+    """
+    Find configured backends that keep their state in each worker process.
+
+    With several workers, a memory cache only hears about the writes of its
+    own worker, so the others keep serving the old book and stats until
+    CACHE_TTL, and memory rate-limit buckets enforce the full limit once
+    per worker. The cache only counts when BOOK_API_CACHE_BACKEND=memory
+    was asked for; the default is replaced by use_shared_cache_default.
+
+    Args:
+        workers (int): Number of worker processes
+
+    Returns:
+        List[str]: One explanation per offending setting (empty if none)
+    """
+    if workers <= 1:
+        return []
+    problems: List[str] = []
+    if config.CACHE_BACKEND == "memory" and os.getenv("BOOK_API_CACHE_BACKEND"):
+        problems.append(
+            "BOOK_API_CACHE_BACKEND=memory would serve other workers' writes stale for up to "
+            "BOOK_API_CACHE_TTL; use redis or none"
+        )
+    if config.RATE_LIMIT_ENABLED and config.RATE_LIMIT_BACKEND == "memory":
+        problems.append(
+            f"BOOK_API_RATE_LIMIT_BACKEND=memory would allow {workers}x the configured limit; use redis"
+        )
+    return problems
+
+
+def use_shared_cache_default(workers: int) -> None:
+    """
+    Turn the default memory cache off for several workers.
+
+    Workers inherit the environment, so each one starts without a cache
+    instead of serving other workers' writes stale. An explicitly chosen
+    backend is left alone (and refused by per_worker_state if it is memory).
+
+    Args:
+        workers (int): Number of worker processes
+    """
+    if workers <= 1 or os.getenv("BOOK_API_CACHE_BACKEND"):
+        return
+    logger.warning(
+        "%d workers: the default per-process memory cache is turned off; "
+        "set BOOK_API_CACHE_BACKEND=redis to cache across workers", workers,
+    )
+    os.environ["BOOK_API_CACHE_BACKEND"] = "none"
+
+
+def setup_schema() -> None:
+    """Create tables and run migrations once, before any worker starts."""
+    from database import engine
+    from migrations import init_db
+
+    init_db(engine)
+    engine.dispose()  # no connections may be inherited by forked workers
+
+
+def main() -> None:
+    """Parse arguments, prepare the database and hand over to the server."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.getenv("BOOK_API_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=env_int("BOOK_API_PORT", 8000))
+    parser.add_argument("--workers", type=int, default=default_workers())
+    args = parser.parse_args()
+
+    problems: List[str] = per_worker_state(args.workers)
+    if problems:
+        parser.error(f"--workers {args.workers}: " + "; ".join(problems) + " (or run one worker)")
+    use_shared_cache_default(args.workers)
+
+    setup_schema()
+    os.environ["BOOK_API_SKIP_SCHEMA_SETUP"] = "1"  # inherited by every worker
+
+    import uvicorn
+    uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
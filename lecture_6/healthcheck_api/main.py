@@ -1,7 +1,282 @@
-from fastapi import FastAPI
+import asyncio
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 
-app = FastAPI()
+from fastapi import FastAPI, Response, status
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, URL, make_url
+from starlette.concurrency import run_in_threadpool
+
+# Book database to probe, the same file/volume or server book_api uses. There is no default:
+# a guessed SQLite path would silently probe (and create) an empty database. While unset,
+# /healthz/ready reports the check as not configured; liveness is unaffected.
+DATABASE_URL: str = os.getenv("HEALTHCHECK_DATABASE_URL", "")
+
+# Base URL of the book_api instance whose /healthz/ready is relayed, e.g. http://server:8000;
+# unset is reported like DATABASE_URL
+BOOK_API_URL: str = os.getenv("HEALTHCHECK_BOOK_API_URL", "").rstrip("/")
+
+# Probe results are reused for this long, so frequent probing costs one check per interval
+CACHE_TTL: float = float(os.getenv("HEALTHCHECK_CACHE_TTL", "2"))
+
+# A database probe slower than this (seconds) counts as failed; also the SQLite busy timeout
+DB_TIMEOUT: float = float(os.getenv("HEALTHCHECK_DB_TIMEOUT", "1"))
+
+# A book_api readiness answer slower than this (seconds) counts as failed
+API_TIMEOUT: float = float(os.getenv("HEALTHCHECK_API_TIMEOUT", "1"))
+
+# Probe pool; it only needs a connection or two
+POOL_SIZE: int = 2
+POOL_MAX_OVERFLOW: int = 2
+
+# Driver used when a URL names none ("postgresql://..."), as in book_api
+DRIVERS: Dict[str, str] = {"postgresql": "psycopg"}
+
+
+def create_probe_engine(url: str) -> Engine:
+    """
+    Create a small, short-timeout engine used only for probing.
+
+    SQLite files are opened read-write but never created, so a wrong path
+    fails the probe instead of leaving an empty database behind. A
+    PostgreSQL URL without a driver gets psycopg, like book_api's.
+
+    Args:
+        url (str): Database URL
+
+    Returns:
+        Engine: Engine whose connections fail fast instead of waiting on locks
+
+    Raises:
+        ValueError: If the URL names an in-memory SQLite database
+    """
+    parsed: URL = make_url(url)
+    backend: str = parsed.get_backend_name()
+    if "+" not in parsed.drivername and backend in DRIVERS:
+        parsed = parsed.set(drivername=f"{backend}+{DRIVERS[backend]}")
+    options: Dict[str, Any] = {
+        "pool_size": POOL_SIZE, "max_overflow": POOL_MAX_OVERFLOW, "pool_timeout": DB_TIMEOUT, "pool_pre_ping": True,
+    }
+    if backend == "sqlite":
+        if parsed.database in (None, "", ":memory:"):
+            raise ValueError("HEALTHCHECK_DATABASE_URL must name book_api's SQLite file, not an in-memory database")
+        if not parsed.database.startswith("file:"):
+            parsed = parsed.set(database=f"file:{parsed.database}?mode=rw", query={**parsed.query, "uri": "true"})
+        # sqlite3 waits up to ``timeout`` seconds for a lock before raising "database is locked"
+        options["connect_args"] = {"check_same_thread": False, "timeout": DB_TIMEOUT}
+    return create_engine(parsed, **options)
+
+
+engine: Optional[Engine] = create_probe_engine(DATABASE_URL) if DATABASE_URL else None
+
+
+def not_configured(variable: str) -> Dict[str, Any]:
+    """
+    Failed check result for a probe whose target is not set.
+
+    Args:
+        variable (str): Environment variable that names the target
+
+    Returns:
+        Dict[str, Any]: ``ok`` flag and the error
+    """
+    return {"ok": False, "error": f"not configured: set {variable}"}
+
+
+def check_database(db_engine: Optional[Engine]) -> Dict[str, Any]:
+    """
+    Connect and run ``SELECT 1``; on SQLite also take and release the write lock.
+
+    ``SELECT 1`` never touches a table, so on SQLite it succeeds even while
+    another connection holds the database locked. ``BEGIN IMMEDIATE`` asks for
+    the same lock book_api's writes need and rolls back without writing, so a
+    database stuck behind a long writer is reported as not ready.
+
+    Args:
+        db_engine (Optional[Engine]): Engine to probe, None if HEALTHCHECK_DATABASE_URL is unset
+
+    Returns:
+        Dict[str, Any]: ``ok`` flag, probe latency and the error, if any
+    """
+    if db_engine is None:
+        return not_configured("HEALTHCHECK_DATABASE_URL")
+    start: float = time.perf_counter()
+    try:
+        with db_engine.connect() as connection:
+            connection.execute(text("SELECT 1")).scalar_one()
+            if db_engine.dialect.name == "sqlite":
+                connection.exec_driver_sql("BEGIN IMMEDIATE")
+                connection.exec_driver_sql("ROLLBACK")
+    except Exception as exc:
+        return {"ok": False, "latency_ms": _elapsed_ms(start), "error": str(exc).splitlines()[0]}
+    return {"ok": True, "latency_ms": _elapsed_ms(start)}
+
+
+def check_book_api(base_url: str) -> Dict[str, Any]:
+    """
+    Ask book_api for its own readiness: pool saturation and event-loop lag.
+
+    Both are only visible inside the book_api process, so they are relayed
+    rather than measured here. With several workers, the worker that
+    happens to take the request answers.
+
+    Args:
+        base_url (str): book_api base URL, empty if HEALTHCHECK_BOOK_API_URL is unset
+
+    Returns:
+        Dict[str, Any]: ``ok`` flag, request latency and book_api's checks or the error
+    """
+    if not base_url:
+        return not_configured("HEALTHCHECK_BOOK_API_URL")
+    start: float = time.perf_counter()
+    try:
+        with urllib.request.urlopen(f"{base_url}/healthz/ready", timeout=API_TIMEOUT) as answer:
+            body: Dict[str, Any] = json.load(answer)
+    except urllib.error.HTTPError as exc:  # 503 carries the failing checks
+        try:
+            body = json.load(exc)
+        except ValueError:
+            return {"ok": False, "latency_ms": _elapsed_ms(start), "error": f"HTTP {exc.code}"}
+        return {"ok": False, "latency_ms": _elapsed_ms(start), "checks": body.get("checks", {})}
+    except (OSError, ValueError) as exc:
+        return {"ok": False, "latency_ms": _elapsed_ms(start), "error": str(exc).splitlines()[0]}
+    return {"ok": body.get("status") == "ok", "latency_ms": _elapsed_ms(start), "checks": body.get("checks", {})}
+
+
+class ReadinessProbe:
+    """
+    Run the readiness checks at most once per ``ttl`` seconds.
+
+    Requests arriving while a check is running wait for that check instead
+    of starting their own, so the database and book_api see at most one
+    probe per interval however often the orchestrator polls.
+
+    Attributes:
+        ttl (float): Seconds a result is reused
+        runs (int): Checks actually executed
+    """
+
+    def __init__(self, db_engine: Optional[Engine], book_api_url: str, ttl: float = CACHE_TTL) -> None:
+        self.engine: Optional[Engine] = db_engine
+        self.book_api_url: str = book_api_url
+        self.ttl: float = ttl
+        self.runs: int = 0
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at: float = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def result(self) -> Dict[str, Any]:
+        """
+        Get a readiness result, fresh or cached.
+
+        Returns:
+            Dict[str, Any]: Overall status, per-check details and the result's age
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+                self._result = await self._run_checks()
+                self._checked_at = time.monotonic()
+                self.runs += 1
+        return {**self._result, "age_ms": _elapsed_ms(self._checked_at, time.monotonic)}
+
+    async def _run_checks(self) -> Dict[str, Any]:
+        """
+        Run every check once.
+
+        Returns:
+            Dict[str, Any]: Overall status and per-check details
+        """
+        database, book_api = await asyncio.gather(
+            _within(DB_TIMEOUT * 2, check_database, self.engine),
+            _within(API_TIMEOUT * 2, check_book_api, self.book_api_url),
+        )
+        checks: Dict[str, Dict[str, Any]] = {"database": database, "book_api": book_api}
+        ready: bool = all(check["ok"] for check in checks.values())
+        return {"status": "ok" if ready else "unavailable", "checks": checks}
+
+
+async def _within(timeout: float, check: Callable[[Any], Dict[str, Any]], target: Any) -> Dict[str, Any]:
+    """
+    Run a blocking check in the threadpool, failing it if it takes too long.
+
+    Args:
+        timeout (float): Seconds to wait for the check
+        check (Callable[[Any], Dict[str, Any]]): check_database or check_book_api
+        target (Any): What the check probes
+
+    Returns:
+        Dict[str, Any]: The check's result, or a failed one after ``timeout``
+    """
+    try:
+        return await asyncio.wait_for(run_in_threadpool(check, target), timeout=timeout)
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": f"no answer within {timeout:.1f}s"}
+
+
+def _elapsed_ms(start: float, clock: Callable[[], float] = time.perf_counter) -> float:
+    """
+    Milliseconds elapsed since ``start``, rounded for responses.
+
+    Args:
+        start (float): Earlier reading of ``clock``
+        clock (Callable[[], float]): Clock ``start`` was read from
+
+    Returns:
+        float: Elapsed milliseconds
+    """
+    return round((clock() - start) * 1000, 2)
+
+
+readiness: ReadinessProbe = ReadinessProbe(engine, BOOK_API_URL)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Close the probe pool on exit.
+
+    Args:
+        app (FastAPI): Application being served
+    """
+    yield
+    if engine is not None:
+        engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/healthcheck")
 async def healthcheck() -> dict:
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@app.get("/healthz/live")
+async def live() -> dict:
+    """
+    Liveness: the process is up and its event loop answers.
+
+    Checks no dependencies, so a slow database never gets the process restarted.
+    """
+    return {"status": "ok"}
+
+
+@app.get("/healthz/ready")
+async def ready(response: Response) -> dict:
+    """
+    Readiness: the book database answers and book_api reports pool room and a responsive loop.
+
+    Returns 503 while any check fails or is not configured, so the
+    orchestrator stops routing traffic here. Results are cached for ``HEALTHCHECK_CACHE_TTL`` seconds.
+    """
+    result: Dict[str, Any] = await readiness.result()
+    if result["status"] != "ok":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    response.headers["Cache-Control"] = "no-store"
+    return result